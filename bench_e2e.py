@@ -0,0 +1,207 @@
+import argparse
+import csv
+import glob
+import importlib
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import mock_board
+from run_all import SITES
+
+try:
+    import psutil
+except ImportError:  # only needed for the Chrome memory column
+    psutil = None
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+REPORT_DIR = os.path.join(REPO_DIR, "log")
+RSS_SAMPLE_INTERVAL = 0.5  # seconds between samples of the browser process tree's memory
+
+
+def count_rows(path):
+    try:
+        with open(path, newline="", encoding="utf-8") as f:
+            return max(sum(1 for _ in csv.reader(f)) - 1, 0)
+    except OSError:
+        return None
+
+
+# --- Child: one scraper against its mock board ---
+# Each site runs in its own interpreter and scratch directory, so peak RSS is
+# that scraper's alone and its data/, log/ and caches never touch the real
+# ones. The module constants that name the live site are repointed at the
+# mock before the entry point runs.
+def repoint(site, module, base_url, polite, jobs):
+    if site == "hso":
+        module.HSO_URL = f"{base_url}/careers/vacancies/"
+        if not polite:
+            module.PACER_RATE = 1000.0
+    elif site == "rsm":
+        module.SITE_URL = f"{base_url}/en-US/RSMCareers"
+        module.API_URL = f"{base_url}{mock_board.WorkdayBoard.PREFIX}"
+        module.USE_PAGE_CACHE = False
+        if not polite:
+            module.API_MIN_INTERVAL = 0
+    elif site == "faeya":
+        module.BASE_URL = f"{base_url}/hcmUI/CandidateExperience/en/sites/CX_1/jobs"
+        module.API_URL = f"{base_url}{mock_board.OracleBoard.PREFIX}"
+        module.USE_PAGE_CACHE = False
+        if not polite:
+            module.API_MIN_INTERVAL = 0
+    elif site == "nigelfrank":
+        module.BASE_URL = base_url
+        pages = mock_board.page_count(jobs, mock_board.NextJsBoard.PAGE_SIZE)
+        module.start_urls[:] = [f"{base_url}/microsoft-jobs?page={i}" for i in range(1, pages + 1)]
+        entry = module.main
+        return lambda: entry(use_cache=False, **({} if polite else {"min_interval": 0}))
+    elif site == "conspicuous":
+        module.START_URL = f"{base_url}/jobs/"
+    return None
+
+
+def sample_tree_rss(stop, peak, interval=RSS_SAMPLE_INTERVAL):
+    # Chrome is a tree of processes under chromedriver; add up the resident
+    # memory of every live descendant and keep the highest total seen
+    me = psutil.Process()
+    while not stop.wait(interval):
+        total = 0
+        for child in me.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                continue
+        peak[0] = max(peak[0], total)
+
+
+def run_child(site, base_url, polite, jobs):
+    _, _, module_name, entry_point, outputs = next(s for s in SITES if s[0] == site)
+    module = importlib.import_module(module_name)
+    entry = repoint(site, module, base_url, polite, jobs) or getattr(module, entry_point)
+
+    stop = threading.Event()
+    peak_tree_rss = [0]
+    if psutil:
+        threading.Thread(target=sample_tree_rss, args=(stop, peak_tree_rss), name="rss-sampler", daemon=True).start()
+
+    error = None
+    started = time.perf_counter()
+    try:
+        entry()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        stop.set()
+    elapsed = time.perf_counter() - started
+
+    rows = sum(count_rows(path) or 0 for path in glob.glob(outputs))
+    # ru_maxrss is KiB on Linux; the browser tree is only measured with psutil
+    print(
+        json.dumps(
+            {
+                "rows": rows,
+                "elapsed": elapsed,
+                "error": error,
+                "rss_kib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+                "children_rss_kib": peak_tree_rss[0] // 1024 if psutil else None,
+            }
+        )
+    )
+
+
+# --- Parent: serve the boards, run each site, report ---
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def page_timings(requests):
+    # Time per page as the board sees it: from a request's arrival to the end
+    # of its response, which stays per page however many workers overlap
+    served = [seconds for _, seconds, _, _ in requests]
+    return percentile(served, 50), percentile(served, 99)
+
+
+def bench_site(site, mock, args):
+    mock.reset()
+    with tempfile.TemporaryDirectory(prefix=f"bench_{site}_") as workdir:
+        command = [sys.executable, os.path.abspath(__file__), "--child", site, "--base-url", mock.base_url, "--jobs", str(args.jobs)]
+        if args.polite:
+            command.append("--polite")
+        completed = subprocess.run(command, cwd=workdir, capture_output=True, text=True, timeout=args.timeout)
+
+    lines = [line for line in completed.stdout.splitlines() if line.startswith("{")]
+    if completed.returncode or not lines:
+        tail = (completed.stderr or completed.stdout).strip().splitlines()[-1:] or [f"exit code {completed.returncode}"]
+        return {"site": site, "status": "failed", "error": tail[0], "requests": len(mock.page_requests())}
+
+    child = json.loads(lines[-1])
+    requests = mock.page_requests()
+    p50, p99 = page_timings(requests)
+    return {
+        "site": site,
+        "status": "failed" if child["error"] else "ok",
+        "error": child["error"],
+        "rows": child["rows"],
+        "seconds": round(child["elapsed"], 3),
+        "jobs_per_second": round(child["rows"] / child["elapsed"], 2) if child["elapsed"] else None,
+        "requests": len(requests),
+        "page_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+        "page_p99_ms": round(p99 * 1000, 1) if p99 is not None else None,
+        "peak_rss_mib": round(child["rss_kib"] / 1024, 1),
+        "peak_child_rss_mib": round(child["children_rss_kib"] / 1024, 1) if child["children_rss_kib"] is not None else None,
+    }
+
+
+def run_bench(args):
+    sites = mock_board.start_sites(args.sites, jobs=args.jobs, latency=args.latency, jitter=args.jitter)
+    print(f"\n⏱️ Benchmarking {len(sites)} site(s) against mock boards ({args.jobs} jobs, {args.latency * 1000:.0f}±{args.jitter * 1000:.0f} ms)")
+    try:
+        results = [bench_site(site, mock, args) for site, mock in sites.items()]
+    finally:
+        for mock in sites.values():
+            mock.stop()
+
+    print(f"\n  {'site':<12} {'status':<7} {'rows':>5} {'seconds':>8} {'jobs/s':>8} {'reqs':>5} {'p50 ms':>7} {'p99 ms':>7} {'RSS MiB':>8} {'Chrome':>7}")
+    for r in results:
+        if r["status"] == "failed" and "rows" not in r:
+            print(f"  {r['site']:<12} {r['status']:<7} {r['error']}")
+            continue
+        print(
+            f"  {r['site']:<12} {r['status']:<7} {r['rows']:>5} {r['seconds']:>8.2f} {r['jobs_per_second'] or 0:>8.2f} "
+            f"{r['requests']:>5} {r['page_p50_ms'] or 0:>7.1f} {r['page_p99_ms'] or 0:>7.1f} "
+            f"{r['peak_rss_mib']:>8.1f} {r['peak_child_rss_mib'] if r['peak_child_rss_mib'] is not None else '-':>7}" + (f"  {r['error']}" if r["error"] else "")
+        )
+
+    os.makedirs(REPORT_DIR, exist_ok=True)
+    report_file = os.path.join(REPORT_DIR, f"bench_e2e_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump({"jobs": args.jobs, "latency": args.latency, "jitter": args.jitter, "polite": args.polite, "sites": results}, f, indent=2)
+    print(f"📁 Report saved to {report_file}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run each scraper end to end against local mock job boards")
+    parser.add_argument("--sites", nargs="*", choices=list(mock_board.BOARDS), help="sites to benchmark (default: all)")
+    parser.add_argument("--jobs", type=int, default=mock_board.DEFAULT_JOBS, help="jobs on every mock board")
+    parser.add_argument("--latency", type=float, default=mock_board.DEFAULT_LATENCY, help="seconds added to every mock response")
+    parser.add_argument("--jitter", type=float, default=mock_board.DEFAULT_JITTER, help="random +/- seconds on top of the latency")
+    parser.add_argument("--polite", action="store_true", help="keep the scrapers' rate limits instead of running flat out")
+    parser.add_argument("--timeout", type=float, default=900, help="seconds before a site's run is abandoned")
+    parser.add_argument("--child", choices=list(mock_board.BOARDS), help=argparse.SUPPRESS)
+    parser.add_argument("--base-url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.base_url, args.polite, args.jobs)
+    else:
+        run_bench(args)
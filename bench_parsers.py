@@ -0,0 +1,78 @@
+import argparse
+import time
+
+import parsers
+from mock_board import HsoBoard, JobManagerBoard, NextJsBoard, make_jobs
+from parsers import (
+    parse_conspicuous_description,
+    parse_conspicuous_listing,
+    parse_faeya_results,
+    parse_hso_cards,
+    parse_nigelfrank_page,
+    parse_rsm_posting,
+    parse_rsm_result_count,
+)
+
+# --- Fixtures ---
+# Pages captured from the live sites; each parser must still find records in them
+FIXTURES = [
+    ("faeya results", "jobslist.html", parse_faeya_results),
+    ("rsm posting", "jobpage.html", lambda page: [parse_rsm_posting(page)]),
+    ("rsm search bar", "search.html", lambda page: [parse_rsm_posting(page), parse_rsm_result_count(page)]),
+]
+
+# Sites without a captured page are benchmarked on the mock boards' markup
+# (see mock_board.py), which copies the selectors the scrapers rely on
+MOCK_JOBS = make_jobs(60)
+MOCK_FIXTURES = [
+    ("hso cards", lambda: HsoBoard(MOCK_JOBS).handle("GET", "/careers/vacancies/", {}, None)[2], parse_hso_cards),
+    ("conspicuous list", lambda: JobManagerBoard(MOCK_JOBS).handle("GET", "/jobs/", {}, None)[2], parse_conspicuous_listing),
+    (
+        "conspicuous job",
+        lambda: JobManagerBoard(MOCK_JOBS).handle("GET", f"/job/{MOCK_JOBS[0]['slug']}/", {}, None)[2],
+        lambda page: [parse_conspicuous_description(page)],
+    ),
+    ("nigelfrank page", lambda: NextJsBoard(MOCK_JOBS).handle("GET", "/microsoft-jobs", {}, None)[2], parse_nigelfrank_page),
+]
+
+
+def read_fixture(path):
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def bench(name, page, parse, iterations, source):
+    records = parse(page)
+    if not records or not any(records):
+        raise SystemExit(f"{name}: parser found nothing in {source}")
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(page)
+    elapsed = time.perf_counter() - start
+
+    total = len(records) * iterations
+    print(
+        f"  {name:<16} {len(page) / 1024:>6.1f} KiB  {elapsed / iterations * 1e6:>8.1f} µs/page  "
+        f"{iterations / elapsed:>8.0f} pages/s  {total / elapsed:>9.0f} records/s"
+    )
+    return records
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the offline HTML parsers against the saved fixtures")
+    parser.add_argument("--iterations", type=int, default=5000, help="parses per fixture")
+    parser.add_argument("--show", action="store_true", help="print the records parsed from each fixture")
+    args = parser.parse_args()
+
+    if parsers.html is None:
+        raise SystemExit("lxml is not installed; pip install lxml to run the parser benchmark")
+
+    print(f"\n⏱️ Parsing each fixture {args.iterations} times")
+    fixtures = [(name, read_fixture(path), parse, path) for name, path, parse in FIXTURES]
+    fixtures += [(name, render(), parse, "mock board") for name, render, parse in MOCK_FIXTURES]
+    for name, page, parse, source in fixtures:
+        records = bench(name, page, parse, args.iterations, source)
+        if args.show:
+            for record in records:
+                print(f"    {record}")
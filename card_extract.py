@@ -0,0 +1,66 @@
+import json
+
+# --- Declarative card extraction ---
+# Every find_element / .text / get_attribute is its own WebDriver round trip.
+# A field spec describes a card once, and extract_cards() turns it into a
+# single execute_script call that returns every card on the page as JSON.
+#
+# Spec format, one entry per output field:
+#   "field": {"selector": "css"}                  -> trimmed innerText of first match
+#   "field": {"selector": "css", "attr": "href"}  -> attribute / property instead of text
+#   "field": {"selector": "css", "all": True}                -> list of values for every match
+#   "field": {"selector": "css", "all": True, "join": ", "}  -> those values joined
+#   "field": {"selector": "css", "all": True, "index": 1}    -> the nth match only
+# A missing selector means the card element itself. When nothing inside the
+# card matches, the nearest ancestor matching the selector is used, which
+# covers cards wrapped in their own <a>. Missing values come back as None.
+
+EXTRACT_CARDS_JS = """
+const root = arguments[0] || document;
+const cardSelector = arguments[1];
+const spec = JSON.parse(arguments[2]);
+
+function valueOf(el, attr) {
+    if (!el) return null;
+    let value;
+    if (!attr || attr === "text") {
+        value = el.innerText !== undefined ? el.innerText : el.textContent;
+    } else {
+        value = el[attr] !== undefined && typeof el[attr] !== "object" ? el[attr] : el.getAttribute(attr);
+    }
+    return value === null || value === undefined ? null : String(value).trim();
+}
+
+function fieldOf(card, field) {
+    if (!field.selector) return valueOf(card, field.attr);
+    if (!field.all) {
+        return valueOf(card.querySelector(field.selector) || card.closest(field.selector), field.attr);
+    }
+    let values = Array.from(card.querySelectorAll(field.selector)).map(el => valueOf(el, field.attr));
+    if (field.index !== undefined) {
+        return field.index < values.length ? values[field.index] : null;
+    }
+    values = values.filter(v => v);
+    return field.join !== undefined ? values.join(field.join) : values;
+}
+
+return Array.from(root.querySelectorAll(cardSelector)).map(card => {
+    const record = {};
+    for (const [name, field] of Object.entries(spec)) {
+        record[name] = fieldOf(card, field);
+    }
+    return record;
+});
+"""
+
+
+def extract_cards(driver, card_selector, spec, root=None):
+    return driver.execute_script(EXTRACT_CARDS_JS, root, card_selector, json.dumps(spec)) or []
+
+
+# Playwright's page.evaluate passes a single argument, so the same script is
+# wrapped in a function that receives it as its `arguments`. `root` may be an
+# ElementHandle from page.query_selector().
+async def extract_cards_async(page, card_selector, spec, root=None):
+    script = f"(args) => (function () {{{EXTRACT_CARDS_JS}}}).apply(null, args)"
+    return await page.evaluate(script, [root, card_selector, json.dumps(spec)]) or []
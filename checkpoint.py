@@ -0,0 +1,92 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+# --- Checkpoint Journal ---
+# Records which pages have been committed to an append-only CSV, how many
+# rows each wrote, and the CSV byte offset after the commit. A page's rows
+# are written with a single write + fsync before its journal line, so on
+# resume the CSV is truncated back to the last journalled offset and any
+# half-written page disappears instead of turning into duplicate rows. A
+# CSV shorter than the journal has lost committed pages, so the journal is
+# discarded and every page is scraped again.
+class CheckpointJournal:
+    def __init__(self, csv_path, journal_path=None):
+        self.csv_path = csv_path
+        self.journal_path = journal_path or f"{csv_path}.journal"
+        self.completed = {}
+        self._committed_offset = None
+        self._lock = threading.Lock()
+
+    def _csv_size(self):
+        return os.path.getsize(self.csv_path) if os.path.exists(self.csv_path) else 0
+
+    def _append_journal(self, entry):
+        with open(self.journal_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _read_journal(self):
+        with open(self.journal_path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line means that commit never finished
+                    break
+                if "start_offset" in entry:
+                    self._committed_offset = entry["start_offset"]
+                else:
+                    self.completed[entry["page"]] = entry["rows"]
+                    self._committed_offset = entry["offset"]
+
+    def start(self, resume=False):
+        if resume and os.path.exists(self.journal_path):
+            self._read_journal()
+            if self._committed_offset is not None and self._csv_size() < self._committed_offset:
+                # The CSV was deleted or cut short after those commits, so the
+                # journalled pages are no longer in it and must be scraped again
+                logger.warning(
+                    f"{self.csv_path} is {self._csv_size()} bytes but its journal expects {self._committed_offset}; "
+                    "discarding the journal"
+                )
+                self.completed = {}
+                self._committed_offset = None
+
+        if self._committed_offset is None:
+            self._committed_offset = self._csv_size()
+            with open(self.journal_path, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"start_offset": self._committed_offset}) + "\n")
+            return self
+
+        if self._csv_size() > self._committed_offset:
+            logger.warning(
+                f"Dropping {self._csv_size() - self._committed_offset} uncommitted bytes from {self.csv_path}"
+            )
+            with open(self.csv_path, "r+b") as f:
+                f.truncate(self._committed_offset)
+        logger.info(f"Resuming: {len(self.completed)} page(s) already committed")
+        return self
+
+    def is_done(self, page):
+        return page in self.completed
+
+    def commit_page(self, page, text, rows):
+        data = text.encode("utf-8")
+        with self._lock:
+            with open(self.csv_path, "ab") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                offset = f.tell()
+            self._append_journal({"page": page, "rows": rows, "offset": offset})
+            self.completed[page] = rows
+            self._committed_offset = offset
+
+    def total_rows(self):
+        return sum(self.completed.values())
@@ -0,0 +1,140 @@
+import asyncio
+import atexit
+import logging
+import threading
+from contextlib import asynccontextmanager
+from fnmatch import fnmatch
+
+from resource_block import BLOCK_PROFILES, profile_for
+
+try:
+    from playwright.async_api import async_playwright
+except ImportError:  # only needed for the "contexts" detail engine
+    async_playwright = None
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+CONTEXTS = 8  # isolated browser contexts open at once in the shared Chromium
+HEADLESS = True
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.188 Safari/537.36"
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+# --- Browser-context pool ---
+# One headless Chromium process hosting many browser contexts. A context has
+# its own cookies, storage and cache, like a separate browser profile, but
+# shares the browser's processes and memory, so a page job costs a context
+# (a few MB) instead of a whole Chrome (hundreds of MB).
+#
+# The pool is async: page() is an async context manager that opens a fresh
+# context with the site's resource-block profile applied as request routes.
+# The scrapers' pipeline workers are threads, so the pool also runs its own
+# event loop on a background thread and run() submits a coroutine to it and
+# blocks the calling worker until it finishes. Any number of workers, from
+# any number of sites, can share the same pool.
+class ContextPool:
+    def __init__(self, size=CONTEXTS, headless=HEADLESS, user_agent=USER_AGENT):
+        if async_playwright is None:
+            raise RuntimeError("playwright is required for browser contexts (pip install playwright)")
+        self.size = size
+        self.headless = headless
+        self.user_agent = user_agent
+        self.opened = 0
+        self.active = 0
+        self.peak = 0
+        self.blocked = 0
+        self._loop = None
+        self._thread = None
+        self._playwright = None
+        self._browser = None
+        self._slots = None
+
+    # --- sync bridge ---
+    def start(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="context-pool", daemon=True)
+        self._thread.start()
+        self.run(self._start())
+        return self
+
+    def run(self, coroutine, timeout=None):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result(timeout)
+
+    def close(self):
+        if not self._loop or not self._loop.is_running():
+            return
+        try:
+            self.run(self._close(), timeout=30)
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # --- async API ---
+    async def _start(self):
+        self._slots = asyncio.Semaphore(self.size)
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(
+            headless=self.headless, args=["--disable-blink-features=AutomationControlled"]
+        )
+        logger.info(f"Started shared Chromium for up to {self.size} browser contexts")
+
+    async def _close(self):
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    async def _apply_block_profile(self, context, url):
+        profile = BLOCK_PROFILES[profile_for(url)] if url else BLOCK_PROFILES["none"]
+        resource_types = {resource_type.lower() for resource_type in profile["resource_types"]}
+        url_patterns = profile["url_patterns"]
+        if not resource_types and not url_patterns:
+            return
+
+        # Unlike Network.setBlockedURLs, routes see the real resource type
+        async def route(request_route):
+            request = request_route.request
+            if request.resource_type in resource_types or any(fnmatch(request.url, p) for p in url_patterns):
+                self.blocked += 1
+                await request_route.abort()
+            else:
+                await request_route.continue_()
+
+        await context.route("**/*", route)
+
+    @asynccontextmanager
+    async def page(self, url=None):
+        async with self._slots:
+            context = await self._browser.new_context(user_agent=self.user_agent, locale="en-US")
+            self.opened += 1
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            try:
+                await self._apply_block_profile(context, url)
+                yield await context.new_page()
+            finally:
+                self.active -= 1
+                await context.close()
+
+    def summary(self):
+        return f"{self.opened} context(s) in one browser, peak {self.peak} at once, {self.blocked} request(s) blocked"
+
+
+def shared_context_pool():
+    # One pool per process, so every scraper running under run_all shares the
+    # same Chromium; closed at exit
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = ContextPool().start()
+            atexit.register(_shared.close)
+        return _shared
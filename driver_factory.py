@@ -0,0 +1,247 @@
+import argparse
+import logging
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+import urllib.request
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.service import Service
+
+try:
+    import undetected_chromedriver as uc
+except ImportError:  # only needed for undetected=True; nigelfrank runs plain Selenium
+    uc = None
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+DRIVER_CACHE_DIR = os.path.join("cache", "chromedriver")  # patched chromedriver, reused across runs
+PROFILE_DIR = "profiles"  # persistent Chrome profiles, one per concurrent browser of a site
+PERSISTENT_PROFILE = True
+CHROME_VERSION_MAIN = None  # pin the chromedriver major version; None follows the installed Chrome
+# host:port of an already running Chrome started with --remote-debugging-port
+# (see `python driver_factory.py --serve`); browsers attach to it instead of launching
+DEBUGGER_ADDRESS = os.environ.get("CHROME_DEBUGGER_ADDRESS")
+SERVE_PORT = 9222
+
+_patch_lock = threading.Lock()
+_profiles_in_use = set()
+_profiles_lock = threading.Lock()
+
+
+# --- Patched chromedriver cache ---
+# uc.Chrome downloads and patches a fresh chromedriver on every start unless
+# it is handed one that is already patched. The first start patches once and
+# keeps the binary; later starts (this run or the next) only check it.
+def patched_driver_path():
+    if uc is None:
+        raise RuntimeError("undetected-chromedriver is required for the patched driver")
+    name = f"chromedriver-{CHROME_VERSION_MAIN}" if CHROME_VERSION_MAIN else "chromedriver"
+    path = os.path.abspath(os.path.join(DRIVER_CACHE_DIR, name + (".exe" if os.name == "nt" else "")))
+    with _patch_lock:
+        if os.path.exists(path):
+            return path
+        patcher = uc.Patcher(version_main=CHROME_VERSION_MAIN or 0)
+        patcher.auto()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        shutil.copy2(patcher.executable_path, path)
+        logger.info(f"Cached patched chromedriver at {path}")
+        return path
+
+
+def _forget_driver(path):
+    # A Chrome update leaves the cached driver on the wrong major version
+    with _patch_lock:
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# --- Persistent profiles ---
+# Chrome locks its user-data-dir, so every concurrent browser of a site
+# claims its own numbered slot; the slot is released on quit and the next
+# browser reuses it with its disk cache and cookies intact. A slot whose
+# SingletonLock points at a live Chrome is held by another process and is
+# skipped; a lock left behind by a Chrome that crashed or was killed is
+# cleared so the slot (and its warm profile) is reused.
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def _profile_locked(profile):
+    lock = os.path.join(profile, "SingletonLock")
+    if not os.path.lexists(lock):
+        return False
+    try:
+        # The lock is a symlink to "<hostname>-<pid>"
+        host, _, pid = os.readlink(lock).rpartition("-")
+    except OSError:
+        return True
+    if host != socket.gethostname() or not pid.isdigit() or _pid_alive(int(pid)):
+        return True
+    logger.info(f"Clearing stale Chrome lock in {profile} (pid {pid} is gone)")
+    for name in ("SingletonLock", "SingletonSocket", "SingletonCookie"):
+        try:
+            os.remove(os.path.join(profile, name))
+        except OSError:
+            pass
+    return False
+
+
+def _claim_profile(site):
+    with _profiles_lock:
+        slot = 0
+        while (site, slot) in _profiles_in_use or _profile_locked(os.path.join(PROFILE_DIR, f"{site}-{slot}")):
+            slot += 1
+        _profiles_in_use.add((site, slot))
+    return (site, slot), os.path.abspath(os.path.join(PROFILE_DIR, f"{site}-{slot}"))
+
+
+def _release_profile(claim):
+    with _profiles_lock:
+        _profiles_in_use.discard(claim)
+
+
+def _on_quit(driver, cleanup):
+    quit_driver = driver.quit
+
+    def quit():
+        try:
+            quit_driver()
+        finally:
+            cleanup()
+
+    driver.quit = quit
+
+
+# --- Attaching to a running Chrome ---
+def debugger_alive(address, timeout=0.5):
+    try:
+        with urllib.request.urlopen(f"http://{address}/json/version", timeout=timeout) as response:
+            return response.status == 200
+    except OSError:
+        return False
+
+
+def _option_value(options, name):
+    prefix = f"--{name}="
+    return next((arg[len(prefix):] for arg in options.arguments if arg.startswith(prefix)), None)
+
+
+def _attach(address, options, undetected=True):
+    # Launch flags cannot change a browser that is already running; the user
+    # agent is applied per tab over CDP and the log prefs are carried over.
+    # Each session works in its own tab and quit() closes only that tab.
+    attach_options = webdriver.ChromeOptions()
+    attach_options.debugger_address = address
+    logging_prefs = options.to_capabilities().get("goog:loggingPrefs")
+    if logging_prefs:
+        attach_options.set_capability("goog:loggingPrefs", logging_prefs)
+    service = Service(executable_path=patched_driver_path()) if undetected else Service()
+    driver = webdriver.Chrome(service=service, options=attach_options)
+    driver.switch_to.new_window("tab")
+    tab = driver.current_window_handle
+    user_agent = _option_value(options, "user-agent")
+    if user_agent:
+        driver.execute_cdp_cmd("Network.setUserAgentOverride", {"userAgent": user_agent})
+
+    def close_tab():
+        try:
+            driver.switch_to.window(tab)
+            driver.close()
+        finally:
+            driver.service.stop()
+
+    driver.quit = close_tab
+    return driver
+
+
+# --- Driver factory ---
+# Shared by every scraper: attaches to DEBUGGER_ADDRESS when a warm Chrome is
+# listening there, otherwise launches one with the cached patched driver and
+# the site's persistent profile. undetected=False starts plain Selenium Chrome
+# with the same profile handling (for sites that do not need the stealth patch).
+def create_chrome(options, site=None, undetected=True, persistent_profile=PERSISTENT_PROFILE):
+    if DEBUGGER_ADDRESS and debugger_alive(DEBUGGER_ADDRESS):
+        return _attach(DEBUGGER_ADDRESS, options, undetected)
+
+    claim = None
+    if site and persistent_profile and not _option_value(options, "user-data-dir"):
+        claim, profile = _claim_profile(site)
+        options.add_argument(f"--user-data-dir={profile}")
+
+    try:
+        if not undetected:
+            driver = webdriver.Chrome(options=options)
+        else:
+            path = patched_driver_path()
+            try:
+                driver = uc.Chrome(options=options, driver_executable_path=path)
+            except SessionNotCreatedException:
+                logger.info("Cached chromedriver does not match this Chrome, patching a new one")
+                _forget_driver(path)
+                driver = uc.Chrome(options=options, driver_executable_path=patched_driver_path())
+    except BaseException:
+        if claim:
+            _release_profile(claim)
+        raise
+
+    if claim:
+        _on_quit(driver, lambda: _release_profile(claim))
+    return driver
+
+
+def serve(port=SERVE_PORT, headless=True):
+    # Starts a long-lived Chrome for scrapers to attach to; export
+    # CHROME_DEBUGGER_ADDRESS=127.0.0.1:<port> in their environment
+    profile = os.path.abspath(os.path.join(PROFILE_DIR, "shared"))
+    chrome = uc.find_chrome_executable() if uc else shutil.which("google-chrome") or shutil.which("chromium")
+    if not chrome:
+        raise RuntimeError("Chrome executable not found")
+    args = [
+        chrome,
+        f"--remote-debugging-port={port}",
+        f"--user-data-dir={profile}",
+        "--no-first-run",
+        "--no-default-browser-check",
+        "--disable-blink-features=AutomationControlled",
+    ]
+    if headless:
+        args.append("--headless=new")
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    address = f"127.0.0.1:{port}"
+    deadline = time.monotonic() + 15
+    while not debugger_alive(address):
+        if process.poll() is not None or time.monotonic() > deadline:
+            raise RuntimeError(f"Chrome did not open its debugging port on {address}")
+        time.sleep(0.1)
+    return process, address
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cache the patched chromedriver, and optionally serve a warm Chrome")
+    parser.add_argument("--serve", action="store_true", help="run a warm headless Chrome for scrapers to attach to")
+    parser.add_argument("--port", type=int, default=SERVE_PORT, help="remote debugging port for --serve")
+    parser.add_argument("--headful", action="store_true", help="show the served browser window")
+    args = parser.parse_args()
+
+    print(f"chromedriver: {patched_driver_path()}")
+    if args.serve:
+        process, address = serve(args.port, headless=not args.headful)
+        print(f"Chrome listening on {address}; export CHROME_DEBUGGER_ADDRESS={address}. Ctrl+C to stop")
+        try:
+            process.wait()
+        except KeyboardInterrupt:
+            process.terminate()
@@ -0,0 +1,146 @@
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000]  # histogram upper bounds
+BASELINE_FILE = os.path.join("log", "driver_baseline.json")
+REGRESSION_FACTOR = 2.0  # warn when commands per job grow by this much over the last run
+
+# Sites run concurrently under run_all and share the baseline file
+_baseline_lock = threading.Lock()
+
+
+# --- WebDriver command metrics ---
+# Every WebDriver call, including WebElement ones like .text, .click() and
+# get_attribute(), ends up in driver.execute(command, params) as one HTTP
+# round trip to chromedriver. instrument() wraps that method on the driver
+# instance, so each round trip is counted by command name and timed into a
+# latency histogram. One DriverMetrics can be shared by every browser a
+# scraper starts.
+class DriverMetrics:
+    def __init__(self, site):
+        self.site = site
+        self.counts = {}
+        self.seconds = {}
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def instrument(self, driver):
+        if driver is None or getattr(driver, "_metrics", None) is self:
+            return driver
+        execute = driver.execute
+
+        def timed_execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(driver_command, params)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+                raise
+            finally:
+                self.record(driver_command, time.perf_counter() - start)
+
+        driver.execute = timed_execute
+        driver._metrics = self
+        return driver
+
+    def record(self, command, seconds):
+        with self._lock:
+            self.counts[command] = self.counts.get(command, 0) + 1
+            self.seconds[command] = self.seconds.get(command, 0.0) + seconds
+            self.buckets[bisect.bisect_left(BUCKETS_MS, seconds * 1000)] += 1
+
+    @property
+    def commands(self):
+        with self._lock:
+            return sum(self.counts.values())
+
+    @property
+    def driver_seconds(self):
+        with self._lock:
+            return sum(self.seconds.values())
+
+    def percentile(self, q):
+        # Upper bound of the bucket holding the q-th percentile, in ms
+        with self._lock:
+            total = sum(self.buckets)
+            if not total:
+                return None
+            rank = q / 100 * total
+            seen = 0
+            for bound, count in zip(BUCKETS_MS + [float("inf")], self.buckets):
+                seen += count
+                if seen >= rank:
+                    return bound
+        return None
+
+    def top_commands(self, limit=5):
+        with self._lock:
+            return sorted(self.counts.items(), key=lambda item: -item[1])[:limit]
+
+    def summary(self, jobs=0):
+        commands = self.commands
+        if not commands:
+            return "no WebDriver commands"
+        per_job = f", {commands / jobs:.1f}/job" if jobs else ""
+        top = ", ".join(f"{command} {count}" for command, count in self.top_commands())
+        return (
+            f"{commands} commands{per_job}, {self.driver_seconds:.2f}s in driver, "
+            f"p50 <={self.percentile(50)}ms, p99 <={self.percentile(99)}ms, {self.errors} err; top: {top}"
+        )
+
+    def histogram(self):
+        with self._lock:
+            buckets = list(self.buckets)
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        peak = max(buckets) or 1
+        return "\n".join(
+            f"  {label:>9} {count:>7} {'#' * max(round(count / peak * 40), 1 if count else 0)}"
+            for label, count in zip(labels, buckets)
+            if count
+        )
+
+    def check_baseline(self, jobs, path=BASELINE_FILE):
+        # Compares commands per job with the previous run of this site. A run
+        # within the limit becomes the new baseline; a regressed run leaves the
+        # old one in place, so it keeps warning until the regression is fixed.
+        # Returns a warning or None.
+        if not jobs or not self.commands:
+            return None
+        per_job = self.commands / jobs
+        with _baseline_lock:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    baselines = json.load(f)
+            except (OSError, ValueError):
+                baselines = {}
+
+            previous = baselines.get(self.site)
+            if previous and per_job > REGRESSION_FACTOR * previous["commands_per_job"]:
+                warning = (
+                    f"{self.site} issued {per_job:.1f} WebDriver commands per job, "
+                    f"up from {previous['commands_per_job']:.1f} on {previous['recorded_at']}"
+                )
+                logger.warning(warning)
+                return warning
+
+            baselines[self.site] = {
+                "commands_per_job": round(per_job, 2),
+                "commands": self.commands,
+                "jobs": jobs,
+                "recorded_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(baselines, f, indent=2)
+            os.replace(tmp_path, path)
+        return None
@@ -0,0 +1,207 @@
+import logging
+import threading
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# --- Global browser cap ---
+# When a limit is set (the cross-site scheduler does this), every browser
+# started through start_browser() holds a slot until its driver.quit().
+_browser_slots = None
+
+
+def set_browser_limit(limit):
+    global _browser_slots
+    _browser_slots = threading.BoundedSemaphore(limit) if limit else None
+
+
+def start_browser(factory, blocking=True):
+    slots = _browser_slots
+    if slots is None:
+        return factory()
+    if not slots.acquire(blocking=blocking):
+        return None
+    try:
+        driver = factory()
+    except BaseException:
+        slots.release()
+        raise
+
+    quit_driver = driver.quit
+    release_lock = threading.Lock()
+    released = []
+
+    def quit():
+        try:
+            quit_driver()
+        finally:
+            with release_lock:
+                if not released:
+                    released.append(True)
+                    slots.release()
+
+    driver.quit = quit
+    return driver
+
+
+# --- Driver Pool ---
+# Keeps up to `size` warm browser sessions and leases them out to page jobs.
+# A session is only thrown away when it fails its health check, never just
+# because a page finished. Under a global browser cap only the first session
+# waits for a slot; the pool stops growing instead of blocking on more, so
+# pools on different sites can never deadlock each other.
+class DriverPool:
+    def __init__(self, factory, size=1):
+        self.factory = factory
+        self.size = size
+        self._idle = []
+        self._created = 0
+        self._capped = False
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def started(self):
+        # Sessions currently alive, leased or idle
+        with self._cond:
+            return self._created
+
+    def warm(self):
+        while True:
+            with self._cond:
+                if self._capped or self._created >= self.size:
+                    return self
+                first = self._created == 0
+                self._created += 1
+            try:
+                driver = self._new_driver(blocking=first)
+            except Exception as e:
+                # A failed launch is not the cap; leases will try again
+                logger.error(f"Could not start browser session: {e}")
+                driver = None
+                failed = True
+            else:
+                failed = False
+            with self._cond:
+                if driver is None:
+                    self._created -= 1
+                    if not failed and self._created > 0:
+                        self._capped = True
+                    self._cond.notify()
+                    return self
+                self._idle.append(driver)
+                self._cond.notify()
+
+    def _new_driver(self, blocking=True):
+        # None means the global browser cap is full; launch errors propagate
+        driver = start_browser(self.factory, blocking=blocking)
+        if driver is None:
+            logger.info(f"Browser limit reached, pool stays at {self._created - 1} session(s)")
+            return None
+        logger.info("Started new browser session for pool")
+        return driver
+
+    def is_healthy(self, driver):
+        try:
+            driver.execute_script("return 1;")
+            return True
+        except Exception:
+            return False
+
+    def _acquire(self):
+        # Returns (driver, fresh); fresh sessions were just launched for this lease
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+                    if self._idle:
+                        return self._idle.pop(), False
+                    if self._created < self.size and not self._capped:
+                        first = self._created == 0
+                        self._created += 1
+                        break
+                    self._cond.wait()
+
+            try:
+                driver = self._new_driver(blocking=first)
+            except Exception:
+                with self._cond:
+                    self._created -= 1
+                    self._cond.notify_all()
+                raise
+            if driver is not None:
+                return driver, True
+            with self._cond:
+                self._created -= 1
+                self._cond.notify_all()
+                if self._created == 0:
+                    raise RuntimeError("Driver pool could not start a browser session")
+                # Other sessions exist; wait for one of them instead of growing
+                self._capped = True
+
+    def _release(self, driver):
+        with self._cond:
+            if self._closed:
+                self._quit(driver)
+                self._created -= 1
+            else:
+                self._idle.append(driver)
+            self._cond.notify()
+
+    def _discard(self, driver):
+        self._quit(driver)
+        with self._cond:
+            self._created -= 1
+            # Quitting freed a global slot, so waiters may grow the pool again;
+            # with no session left the next one starts with a blocking wait
+            self._capped = False
+            self._cond.notify_all()
+        logger.warning("Recycled unhealthy browser session")
+
+    def _quit(self, driver):
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @contextmanager
+    def lease(self):
+        # Idle sessions can all have gone stale together (e.g. after Chrome
+        # crashed), so keep recycling them; once none are left a fresh session
+        # is started, and only a fresh one that fails ends the lease
+        while True:
+            driver, fresh = self._acquire()
+            if self.is_healthy(driver):
+                break
+            self._discard(driver)
+            if fresh:
+                raise RuntimeError("Newly started browser session failed its health check")
+
+        try:
+            yield driver
+        except BaseException:
+            # Only recycle when the session itself is broken; a page timeout
+            # on a healthy browser goes straight back to the pool.
+            if self.is_healthy(driver):
+                self._release(driver)
+            else:
+                self._discard(driver)
+            raise
+        else:
+            self._release(driver)
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._created -= len(idle)
+            self._cond.notify_all()
+        for driver in idle:
+            self._quit(driver)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,30 +1,42 @@
 import os
 import time
-import logging
 import csv
 import undetected_chromedriver as uc
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from card_extract import extract_cards
+from driver_factory import create_chrome
+from driver_metrics import DriverMetrics
+from driver_pool import start_browser
+from fingerprint_store import FingerprintStore
+from job_sink import ParquetSink
+from resource_block import ResourceBlocker
+from scrape_log import setup_site_logging
+from tracing import Tracer
 
 # Setup logging
-os.makedirs("log", exist_ok=True)
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.INFO)
-file_handler = logging.FileHandler("log/scrap.log", mode="a", encoding="utf-8")
-file_handler.setFormatter(
-    logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-)
-console_handler = logging.StreamHandler()
-console_handler.setFormatter(logging.Formatter("%(levelname)s - %(message)s"))
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+# JSON lines in log/conspicuous.jsonl, written by a background thread (see scrape_log.py)
+logger = setup_site_logging("conspicuous")
 
 # Setup output folder
 os.makedirs("data", exist_ok=True)
 OUTPUT_CSV = "data/job_results.csv"
 
+# Listing fields, extracted in one execute_script call per page (see card_extract.py)
+LISTING_SPEC = {
+    "title": {"selector": "h3"},
+    "location": {"selector": ".job-location"},
+    "date_posted": {"selector": ".job-date"},
+    "url": {"selector": "a", "attr": "href"},
+}
+DETAIL_TABS = 4  # job pages loaded in parallel tabs
+START_URL = "https://conspicuous.com/jobs/"
+resource_blocker = ResourceBlocker.for_site(START_URL)
+tracer = Tracer("conspicuous")
+driver_metrics = DriverMetrics("conspicuous")
+
 def setup_driver(headless=True):
     options = uc.ChromeOptions()
     options.headless = headless
@@ -37,7 +49,9 @@ def setup_driver(headless=True):
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
     )
-    driver = uc.Chrome(options=options)
+    resource_blocker.configure(options)
+    with tracer.span("uc.Chrome", "browser start"):
+        driver = driver_metrics.instrument(resource_blocker.attach(start_browser(lambda: create_chrome(options, "conspicuous"))))
     if not headless:
         driver.maximize_window()
     return driver
@@ -45,11 +59,13 @@ def setup_driver(headless=True):
 
 def load_page(driver, url, wait_timeout=20):
     try:
-        driver.get(url)
+        with tracer.span("driver.get", "navigate"):
+            driver.get(url)
         logger.info(f"Navigated to {url}")
-        WebDriverWait(driver, wait_timeout).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "job-item"))
-        )
+        with tracer.span("job listings", "wait"):
+            WebDriverWait(driver, wait_timeout).until(
+                EC.presence_of_element_located((By.CLASS_NAME, "job-item"))
+            )
         logger.info("Job listings loaded")
         return True
     except Exception as e:
@@ -61,8 +77,15 @@ def go_to_next_page(driver):
     try:
         nav = driver.find_element(By.CLASS_NAME, "job-manager-pagination")
         next_button = nav.find_element(By.XPATH, './/a[text()="→"]')
-        next_button.click()
-        logger.info("Clicked forward arrow to go to next page")
+        # Stylesheets are blocked on this site (the "text" profile), so the
+        # arrow is followed by its href rather than clicked by coordinates
+        next_url = next_button.get_attribute("href")
+        with tracer.span("next page", "navigate"):
+            if next_url:
+                driver.get(next_url)
+            else:
+                driver.execute_script("arguments[0].click();", next_button)
+        logger.info("Followed forward arrow to the next page")
         return True
     except NoSuchElementException:
         logger.info("No forward arrow found; last page reached")
@@ -91,86 +114,134 @@ def extract_details_from_job(driver, job_url):
         return "N/A"
 
 
-def extract_listings_from_page(driver):
-    listings = driver.find_elements(By.CLASS_NAME, "job-item")
-    job_data = []
-
-    for i in range(len(listings)):
-        try:
-            # Refetch listings to avoid stale references
-            listings = driver.find_elements(By.CLASS_NAME, "job-item")
-            listing = listings[i]
+def extract_details_from_jobs(driver, job_urls, max_tabs=DETAIL_TABS):
+    # Open up to max_tabs job pages at once so they load in parallel, then
+    # read each one and close it. Descriptions come back in job_urls order.
+    list_handle = driver.current_window_handle
+    descriptions = []
 
-            title = listing.find_element(By.TAG_NAME, "h3").text.strip()
-            location = listing.find_element(By.CLASS_NAME, "job-location").text.strip()
-            date_posted = listing.find_element(By.CLASS_NAME, "job-date").text.strip()
+    for start in range(0, len(job_urls), max_tabs):
+        batch = job_urls[start:start + max_tabs]
+        handles = []
+        for job_url in batch:
+            known = set(driver.window_handles)
+            driver.execute_script("window.open('about:blank');")
+            new_handles = [h for h in driver.window_handles if h not in known]
+            if not new_handles:
+                handles.append(None)
+                continue
+            # Blocked URLs are per tab, so apply them before the job page starts loading
+            driver.switch_to.window(new_handles[0])
+            resource_blocker.attach(driver)
+            with tracer.span("open tab", "navigate"):
+                driver.execute_script("window.location.href = arguments[0];", job_url)
+            handles.append(new_handles[0])
+        driver.switch_to.window(list_handle)
 
-            # Click into the job listing
-            listing.click()
-            time.sleep(1)  # small wait to allow transition
+        for job_url, handle in zip(batch, handles):
+            if handle is None:
+                logger.warning(f"Could not open a tab for {job_url}")
+                descriptions.append("N/A")
+                continue
+            try:
+                driver.switch_to.window(handle)
+                with tracer.span("job description", "wait"):
+                    WebDriverWait(driver, 10).until(
+                        EC.presence_of_element_located((By.CLASS_NAME, "job-description"))
+                    )
+                with tracer.span("read description", "extract"):
+                    descriptions.append(
+                        driver.find_element(By.CLASS_NAME, "job-description").text.strip()
+                    )
+            except Exception as e:
+                logger.warning(f"Could not extract job details from {job_url}: {e}")
+                descriptions.append("N/A")
+            finally:
+                try:
+                    driver.close()
+                except Exception:
+                    pass
 
-            # Wait and extract full job description
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "job-description"))
-            )
-            job_desc = driver.find_element(
-                By.CLASS_NAME, "job-description"
-            ).text.strip()
-
-            job_data.append(
-                {
-                    "title": title,
-                    "location": location,
-                    "date_posted": date_posted,
-                    "description": job_desc,
-                }
-            )
+        driver.switch_to.window(list_handle)
 
-            logger.info(f"Scraped: {title}")
+    return descriptions
 
-            # Return to job listing page
-            driver.back()
-            WebDriverWait(driver, 10).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "job-item"))
-            )
-            time.sleep(1)
 
-        except Exception as e:
-            logger.error(f"Error scraping job at index {i}: {e}")
+def extract_listings_from_page(driver, store=None):
+    # One pass over the listing page: summary fields and job URLs for every
+    # listing come back from a single script call, no click/back per job
+    with tracer.span("extract_cards", "extract"):
+        summaries = extract_cards(driver, ".job-item", LISTING_SPEC)
+    listings = []
+    for i, summary in enumerate(summaries):
+        if summary["title"] is None or summary["url"] is None:
+            logger.error(f"Error scraping job at index {i}: listing is missing its title or link")
             continue
+        listings.append(summary)
+
+    # Listings unchanged since the last run reuse their stored description
+    descriptions = [None] * len(listings)
+    if store:
+        for i, listing in enumerate(listings):
+            cached = store.cached_detail("conspicuous", listing["url"], listing)
+            if cached:
+                descriptions[i] = cached["description"]
+    to_fetch = [i for i, desc in enumerate(descriptions) if desc is None]
+    fetched = extract_details_from_jobs(driver, [listings[i]["url"] for i in to_fetch])
+    for i, job_desc in zip(to_fetch, fetched):
+        descriptions[i] = job_desc
+        if store and job_desc != "N/A":
+            store.record("conspicuous", listings[i]["url"], listings[i], {"description": job_desc})
+
+    job_data = []
+    for listing, job_desc in zip(listings, descriptions):
+        job_data.append(
+            {
+                "title": listing["title"],
+                "location": listing["location"],
+                "date_posted": listing["date_posted"],
+                "url": listing["url"],
+                "description": job_desc,
+            }
+        )
+        logger.info(f"Scraped: {listing['title']}")
 
     return job_data
 
 
-def paginate_through_all_pages(driver, start_url, wait_timeout=20, delay=3):
+def paginate_through_all_pages(driver, start_url, wait_timeout=20, delay=3, store=None):
     if not load_page(driver, start_url, wait_timeout):
-        return []
+        raise RuntimeError(f"Job listings did not load at {start_url}")
 
     all_jobs = []
     current_page = 1
     while True:
-        logger.info(f"Scraping page {current_page}")
-        page_jobs = extract_listings_from_page(driver)
-        all_jobs.extend(page_jobs)
-
-        if not go_to_next_page(driver):
-            break
-        time.sleep(delay)
-        try:
-            WebDriverWait(driver, wait_timeout).until(
-                EC.presence_of_element_located((By.CLASS_NAME, "job-item"))
-            )
-        except TimeoutException:
-            logger.warning("Timeout waiting for jobs to load on new page")
-            break
-        current_page += 1
+        with tracer.span(f"page {current_page}", "page"):
+            logger.info(f"Scraping page {current_page}")
+            resource_blocker.page_report(driver, f"listing page {current_page}")
+            page_jobs = extract_listings_from_page(driver, store)
+            all_jobs.extend(page_jobs)
+
+            if not go_to_next_page(driver):
+                break
+            with tracer.span("page delay", "sleep"):
+                time.sleep(delay)
+            try:
+                with tracer.span("job listings", "wait"):
+                    WebDriverWait(driver, wait_timeout).until(
+                        EC.presence_of_element_located((By.CLASS_NAME, "job-item"))
+                    )
+            except TimeoutException:
+                logger.warning("Timeout waiting for jobs to load on new page")
+                break
+            current_page += 1
 
     logger.info("Pagination complete")
     return all_jobs
 
 
 def save_to_csv(jobs, filename=OUTPUT_CSV):
-    keys = ["title", "location", "posted", "url", "description"]
+    keys = ["title", "location", "date_posted", "url", "description"]
     with open(filename, "w", newline="", encoding="utf-8") as f:
         writer = csv.DictWriter(f, fieldnames=keys)
         writer.writeheader()
@@ -178,9 +249,26 @@ def save_to_csv(jobs, filename=OUTPUT_CSV):
     logger.info(f"Saved {len(jobs)} jobs to {filename}")
 
 
-if __name__ == "__main__":
-    url = "https://conspicuous.com/jobs/"
+def main():
     driver = setup_driver(headless=True)
-    jobs = paginate_through_all_pages(driver, url)
-    save_to_csv(jobs)
-    driver.quit()
+    jobs = []
+    try:
+        store = FingerprintStore()
+        with tracer.span("conspicuous run", "run"):
+            jobs = paginate_through_all_pages(driver, START_URL, store=store)
+        with tracer.span("save results", "write"):
+            save_to_csv(jobs)
+            ParquetSink().write("conspicuous", jobs)
+        store.save()
+    finally:
+        logger.info(f"Resources: {resource_blocker.summary()}")
+        logger.info(f"Phases: {tracer.summary()}")
+        logger.info(f"Trace saved to {tracer.export()}")
+        logger.info(f"WebDriver: {driver_metrics.summary(len(jobs))}")
+        driver_metrics.check_baseline(len(jobs))
+        driver.quit()
+    return len(jobs)
+
+
+if __name__ == "__main__":
+    main()
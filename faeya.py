@@ -2,13 +2,13 @@ import traceback
 import sys
 import gc
 import os
-import time
-import json
-import hashlib
-import logging
-import random
+import re
+import itertools
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -16,32 +16,301 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
-import undetected_chromedriver as uc
+from card_extract import extract_cards, extract_cards_async
+from context_pool import shared_context_pool
+from driver_factory import create_chrome
+from driver_metrics import DriverMetrics
+from driver_pool import DriverPool
+from fingerprint_store import FingerprintStore
+from frontier import JobFrontier, canonical_job_url
+from http_client import create_session
+from job_sink import ParquetSink
+from page_cache import PageCache, cached_get
+from pacing import AdaptivePacer, DomainRateLimiter
+from pipeline import QUEUE_SIZE, BatchWriter, run_pipeline
+from resource_block import ResourceBlocker
+from scrape_log import setup_site_logging
+from tracing import Tracer
 
 # --- Configuration ---
 RUN_HEADLESS = True
 BASE_URL = "https://fa-eyau-saasfaprod1.fa.ocs.oraclecloud.com/hcmUI/CandidateExperience/en/sites/CX_1/jobs"
 SEARCH_KEYWORDS = ["Microsoft Dynamics", "Power Platform"]
+ENGINE = "api"  # "api" uses the Oracle HCM REST API, "selenium" drives the careers UI
+SITE_NUMBER = BASE_URL.rstrip("/").split("/")[-2]
+API_URL = f"{urlsplit(BASE_URL).scheme}://{urlsplit(BASE_URL).netloc}/hcmRestApi/resources/latest"
+API_PAGE_SIZE = 25
+API_WORKERS = 8
+API_MIN_INTERVAL = 0.2  # seconds between API calls to oraclecloud.com
+DETAIL_WORKERS = 3  # browsers used for the Selenium detail-page phase
+DETAIL_ENGINE = "selenium"  # "contexts" loads detail pages in browser contexts of one shared Chromium (needs playwright)
+CONTEXT_WORKERS = 8  # detail workers when DETAIL_ENGINE = "contexts"
+PACER_RATE = 1.0  # Selenium page loads per second across all browsers, before any backoff
+USE_PAGE_CACHE = True  # serve recently fetched job details from the on-disk cache
+FAEYA_CSV_COLUMNS = ["job_title", "job_url", "job_id", "location", "role_type", "salary", "description", "keyword", "level"]
+JOB_LOG_SAMPLE = 1.0  # share of jobs whose log lines are kept; 0.1 keeps one job in ten
 
 # --- Logging Setup ---
-os.makedirs("log", exist_ok=True)
-log_file = os.path.join("log", "rsm_scrape.log")
+# JSON lines in log/faeya.jsonl, written by a background thread (see scrape_log.py)
+logger = setup_site_logging("faeya", job_sample=JOB_LOG_SAMPLE)
+
+# --- Resource blocking ---
+# Shared by every browser this module starts, so the byte report covers the run
+resource_blocker = ResourceBlocker.for_site(BASE_URL)
+
+
+# --- Tracing ---
+# One timeline per process, so an API run that falls back to Selenium shows
+# both engines; saved under log/ when each engine finishes
+tracer = Tracer("faeya")
+
+
+# --- WebDriver metrics ---
+# Every browser this module starts reports its command round trips here
+driver_metrics = DriverMetrics("faeya")
+
+# --- Card Specs ---
+# Extracted in one execute_script call per list, see card_extract.py
+FAEYA_RESULT_SPEC = {
+    "url": {"selector": "a.job-list-item__link", "attr": "href"},
+    "title": {"selector": "span.job-tile__title"},
+}
+FAEYA_META_LIST = "ul.job-meta__list"
+FAEYA_LIST_SPEC = {"items": {"selector": "li", "all": True}}
+FAEYA_META_SPEC = {
+    "title": {"selector": "span.job-meta__title"},
+    "value": {"selector": "span.job-meta__subitem"},
+    "locations": {"selector": "span.job-meta__subitem .job-meta__pin-item", "all": True},
+    "workplace_type": {"selector": "span.job-meta__subitem .job-meta__workplace-type"},
+}
+
+def log_and_print(message, job=None):
+    # job=<job url> marks a per-job line; JOB_LOG_SAMPLE keeps or drops all of a job's lines together
+    logger.info(message, extra={"per_job": True, "job_key": canonical_job_url(job)} if job else None)
+
+def save_results(all_data):
+    if all_data:
+        os.makedirs("data", exist_ok=True)
+        filename = f"data/faeya_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        pd.DataFrame(all_data).to_csv(filename, index=False)
+        log_and_print(f"\n📁 Data saved to {filename}")
+        ParquetSink().write("faeya", all_data)
+    else:
+        log_and_print("⚠️ No job data to save.")
+
+
+def faeya_job_url(job_id, keyword):
+    return f"{BASE_URL.rstrip('/').rsplit('/', 1)[0]}/job/{job_id}/?{urlencode({'keyword': keyword, 'mode': 'location'})}"
+
+
+# --- Fingerprint Store ---
+# Both engines key jobs on the requisition number in the job URL and hash the
+# listing title; unchanged jobs reuse the detail record from the last run.
+def listing_fingerprint(job_title, job_url):
+    match = re.search(r"/job/([^/?]+)", job_url)
+    job_key = match.group(1) if match else job_url.split("?")[0]
+    return job_key, {"title": job_title, "job_key": job_key}
+
+
+def fetch_unless_unchanged(store, job_title, job_url, keyword, fetch_detail):
+    job_key, listing = listing_fingerprint(job_title, job_url)
+    cached = store.cached_detail("faeya", job_key, listing)
+    if cached:
+        log_and_print(f"♻️ Unchanged job, reusing stored detail: {job_title}", job=job_url)
+        return {**cached, "job_url": job_url, "keyword": keyword}
+
+    job = fetch_detail()
+    if job:
+        store.record("faeya", job_key, listing, job)
+    return job
+
+
+# --- Oracle HCM REST Engine ---
+# The Candidate Experience site is a client for two REST resources:
+# recruitingCEJobRequisitions (search) and recruitingCEJobRequisitionDetails
+# (one requisition). Both return the fields shown in ul.job-meta__list.
+def search_faeya_requisitions(session, keyword, limiter):
+    requisitions = []
+    offset = 0
+    total = None
+    while True:
+        finder = f'findReqs;siteNumber={SITE_NUMBER},keyword="{keyword}",limit={API_PAGE_SIZE},offset={offset},sortBy=RELEVANCY'
+        limiter.wait(API_URL)
+        with tracer.span(f"search offset {offset}", "http", keyword=keyword):
+            response = session.get(
+                f"{API_URL}/recruitingCEJobRequisitions",
+                params={"onlyData": "true", "expand": "requisitionList.secondaryLocations", "finder": finder},
+                timeout=30,
+            )
+        response.raise_for_status()
+        items = response.json().get("items") or [{}]
+        page_requisitions = items[0].get("requisitionList") or []
+        requisitions.extend(page_requisitions)
+        log_and_print(f"📌 Offset {offset}: {len(page_requisitions)} job(s) for keyword '{keyword}'")
+
+        # Only the first page's TotalJobsCount is reliable; stop on a short page too
+        if total is None:
+            total = items[0].get("TotalJobsCount") or 0
+        offset += API_PAGE_SIZE
+        if len(page_requisitions) < API_PAGE_SIZE or (total and offset >= total):
+            break
+    return requisitions
+
+
+def _flex_field(detail, prompt):
+    for field in detail.get("requisitionFlexFields") or []:
+        if (field.get("Prompt") or "").strip() == prompt:
+            return field.get("Value")
+    return None
+
+
+def _meta_value(value):
+    value = str(value).strip() if value is not None else ""
+    return value if value and value != "." else None
+
+
+def fetch_faeya_detail(session, requisition, keyword, limiter, cache=None):
+    job_id = str(requisition.get("Id"))
+    job_title = (requisition.get("Title") or "").strip()
+    job_url = faeya_job_url(job_id, keyword)
+
+    with tracer.span("requisition detail", "http"):
+        response = cached_get(
+            cache,
+            session,
+            f"{API_URL}/recruitingCEJobRequisitionDetails",
+            limiter=limiter,
+            params={"expand": "all", "onlyData": "true", "finder": f'ById;Id="{job_id}",siteNumber={SITE_NUMBER}'},
+            timeout=30,
+        )
+    response.raise_for_status()
+    items = response.json().get("items") or []
+    if not items:
+        log_and_print(f"❌ No requisition detail returned for {job_title}")
+        return None
+    detail = items[0]
+
+    # --- Description: bullet points of the first list, as the UI scraper did ---
+    description = "N/A"
+    for field in ("ExternalDescriptionStr", "ExternalResponsibilitiesStr", "ExternalQualificationsStr"):
+        soup = BeautifulSoup(detail.get(field) or "", "lxml")
+        first_list = soup.find("ul")
+        if first_list:
+            li_texts = [li.get_text(" ", strip=True) for li in first_list.find_all("li")]
+            li_texts = [text for text in li_texts if text]
+            if li_texts:
+                description = " | ".join(li_texts)
+                break
+
+    # --- Job Metadata ---
+    job_id = _meta_value(detail.get("Id")) or job_id
+    role_type = _meta_value(detail.get("Category") or detail.get("JobFamily") or _flex_field(detail, "Job Category")) or "N/A"
+
+    location_list = [detail.get("PrimaryLocation")]
+    location_list += [loc.get("Name") for loc in detail.get("secondaryLocations") or []]
+    location_list = [loc.strip() for loc in location_list if loc and loc.strip()]
+    location = "N/A"
+    if location_list:
+        location = ", ".join(location_list)
+        workplace_type = (detail.get("WorkplaceType") or "").strip()
+        if workplace_type:
+            location += f" {workplace_type}" if workplace_type.startswith("(") else f" ({workplace_type})"
+
+    min_salary = _meta_value(_flex_field(detail, "Minimum Salary"))
+    max_salary = _meta_value(_flex_field(detail, "Maximum Salary"))
+    salary = "N/A"
+    if min_salary and max_salary:
+        salary = f"{min_salary} - {max_salary}"
+    elif min_salary:
+        salary = min_salary
+    elif max_salary:
+        salary = max_salary
+
+    log_and_print(f"📌 Job ID: {job_id} | 📍 {location} | 🧩 {role_type} | 💰 {salary}", job=job_url)
+    return {
+        "job_title": job_title,
+        "job_url": job_url,
+        "job_id": job_id,
+        "location": location,
+        "role_type": role_type,
+        "salary": salary,
+        "description": description,
+        "keyword": keyword,
+        "level": "N/A"
+    }
+
+
+def scrape_faeya_jobs_api():
+    start_time = datetime.now()
+    log_and_print(f"\n🚀 Scraping (API engine) started at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    session = create_session(pool_size=API_WORKERS)
+    session.headers.update({"Accept": "application/json"})
+    limiter = DomainRateLimiter(API_MIN_INTERVAL, tracer=tracer)
+    store = FingerprintStore()
+    cache = PageCache() if USE_PAGE_CACHE else None
+    rows = None
+    try:
+        with tracer.span("faeya api run", "run"):
+            # Searches are cheap, so every keyword is searched first and each
+            # requisition is fetched once, tagged with all the keywords that found it
+            frontier = JobFrontier()
+            unique_requisitions = []
+            for keyword in SEARCH_KEYWORDS:
+                log_and_print(f"🔎 Starting search for keyword: '{keyword}'")
+                for requisition in search_faeya_requisitions(session, keyword, limiter):
+                    if frontier.admit(canonical_job_url(faeya_job_url(requisition.get("Id"), keyword)), keyword):
+                        unique_requisitions.append((requisition, keyword))
+            log_and_print(f"🔁 Keyword frontier: {frontier.stats()}")
+            if not unique_requisitions:
+                # Most likely a changed endpoint rather than an empty board; let Selenium try
+                raise RuntimeError("no requisitions found for any keyword")
+
+            def fetch(item):
+                requisition, keyword = item
+                try:
+                    return fetch_unless_unchanged(
+                        store,
+                        (requisition.get("Title") or "").strip(),
+                        faeya_job_url(requisition.get("Id"), keyword),
+                        keyword,
+                        lambda: fetch_faeya_detail(session, requisition, keyword, limiter, cache),
+                    )
+                except Exception as e:
+                    log_and_print(f"⚠️ Error fetching detail for {requisition.get('Title')}: {e}")
+                    return None
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+            with ThreadPoolExecutor(max_workers=API_WORKERS) as executor:
+                all_data = [
+                    frontier.tag(job, canonical_job_url(job["job_url"]))
+                    for job in executor.map(fetch, unique_requisitions)
+                    if job
+                ]
 
-def log_and_print(message):
-    print(message)
-    logging.info(message)
+            with tracer.span("save results", "write"):
+                save_results(all_data)
+            store.save()
+            rows = len(all_data)
 
-# --- Scraper Logic ---
-def scrape_faeya_jobs():
-    start_time = datetime.now()
-    log_and_print(f"\n🚀 Scraping started at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    except Exception as e:
+        log_and_print(f"❌ API engine failed: {e}")
+        log_and_print(traceback.format_exc())
+
+    finally:
+        session.close()
+        if cache:
+            log_and_print(f"🗄️ Page cache: {cache.stats()}")
+            cache.close()
+        log_and_print(f"🧭 Phases: {tracer.summary()}")
+        log_and_print(f"🗺️ Trace saved to {tracer.export()}")
+        end_time = datetime.now()
+        duration = (end_time - start_time).total_seconds()
+        log_and_print(f"\n✅ Scraping finished at {end_time.strftime('%Y-%m-%d %H:%M:%S')} (Duration: {duration:.2f} seconds)")
+    return rows
 
+
+# --- Selenium Engine ---
+def create_driver():
     options = webdriver.ChromeOptions()
     if RUN_HEADLESS:
         options.add_argument("--headless=new")
@@ -53,200 +322,328 @@ def scrape_faeya_jobs():
     options.add_argument(
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.188 Safari/537.36"
     )
-
-    driver = None
-    try:
-        driver = uc.Chrome(options=options)
-        wait = WebDriverWait(driver, 15)
-        all_links = []
-        all_data = []
-
-        driver.get(BASE_URL)
-        time.sleep(random.uniform(2, 4))
-
-        for keyword in SEARCH_KEYWORDS:
-            driver.get(BASE_URL)
-            wait.until(EC.presence_of_element_located((By.XPATH, '//*[@id="keyword"]')))
-            log_and_print("🌐 Input field found.")
-            time.sleep(random.uniform(2, 4))
-
+    resource_blocker.configure(options)
+    with tracer.span("uc.Chrome", "browser start"):
+        driver = create_chrome(options, "faeya")
+    return driver_metrics.instrument(resource_blocker.attach(driver))
+
+
+def scrape_faeya_detail(driver, i, job_info, pacer):
+    job_title = job_info["title"]
+    job_url = job_info["url"]
+
+    log_and_print(f"\n🌐 Visiting job {i}: {job_title} — {job_url}", job=job_url)
+    with tracer.span(job_title, "job"):
+        try:
+            with pacer.track(job_url):
+                with tracer.span("driver.get", "navigate"):
+                    driver.get(job_url)
+                # The metadata list renders with the rest of the posting, description included
+                with tracer.span("job meta", "wait"):
+                    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, FAEYA_META_LIST)))
+            resource_blocker.page_report(driver, job_url)
+
+            # --- Extract Description ---
+            ul_elements = []
             try:
-                log_and_print(f"🔎 Starting search for keyword: '{keyword}'")
-                search_input = wait.until(EC.element_to_be_clickable((By.XPATH, '//*[@id="keyword"]')))
-                ActionChains(driver).move_to_element(search_input).click().perform()
-                time.sleep(random.uniform(0.5, 1.5))
-
-                search_input.send_keys(Keys.CONTROL + "a")
-                search_input.send_keys(Keys.BACKSPACE)
-                time.sleep(random.uniform(1, 2))
-                search_input.send_keys(keyword)
-                time.sleep(random.uniform(0.5, 1.5))
-                search_input.send_keys(Keys.RETURN)
-
-                log_and_print("🔘 Search submitted.")
-                time.sleep(random.uniform(3, 5))
-
-                wait.until(EC.presence_of_element_located((By.XPATH, '//*[@id="main"]/div/div/div/div/div/div[3]/div/div/div/div[2]/div/div/ul')))
-                ul_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "ul.jobs-list__list")))
-                job_items = ul_element.find_elements(By.CSS_SELECTOR, "li[data-qa='searchResultItem']")
-
-                log_and_print(f"📌 Found {len(job_items)} job(s) on the page.")
-
-                for idx, job in enumerate(job_items, 1):
-                    try:
-                        job_link = job.find_element(By.CSS_SELECTOR, "a.job-list-item__link")
-                        job_url = job_link.get_attribute("href").strip()
-                        job_title = job.find_element(By.CSS_SELECTOR, "span.job-tile__title").text.strip()
-
-                        all_links.append({
-                            "url": job_url,
-                            "title": job_title,
-                            "keyword": keyword
-                        })
-                        log_and_print(f"🔗 Job {idx}: {job_title} — {job_url}")
-                    except Exception as e:
-                        log_and_print(f"⚠️ Error parsing job item {idx}: {e}")
-            except TimeoutException:
-                log_and_print(f"❌ Failed to load results for keyword: {keyword}")
-                continue
-
-        # --- Visit Detail Pages ---
-        log_and_print(f"\n🔍 Visiting {len(all_links)} job detail page(s)...")
-
-        for i, job_info in enumerate(all_links, 1):
-            job_title = job_info["title"]
-            job_url = job_info["url"]
-            keyword = job_info["keyword"]
+                with tracer.span("extract_cards", "extract"):
+                    ul_elements = extract_cards(driver, "ul", FAEYA_LIST_SPEC)
+            except Exception as e:
+                log_and_print(f"⚠️ Failed to extract description UL: {e}")
 
-            log_and_print(f"\n🌐 Visiting job {i}: {job_title} — {job_url}")
+            # --- Extract Job Metadata ---
             try:
-                driver.get(job_url)
-                time.sleep(random.uniform(2, 4))
-
-                # --- Extract Description ---
-                description = "N/A"
-                try:
-                    ul_elements = driver.find_elements(By.TAG_NAME, "ul")
-                    if len(ul_elements) >= 4:
-                        li_elements = ul_elements[3].find_elements(By.TAG_NAME, "li")
-                        li_texts = [li.text.strip() for li in li_elements if li.text.strip()]
-                        if li_texts:
-                            description = " | ".join(li_texts)
-                    log_and_print(f"📝 Description: {description}")
-                except Exception as e:
-                    log_and_print(f"⚠️ Failed to extract description UL: {e}")
+                meta_section = WebDriverWait(driver, 10).until(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, FAEYA_META_LIST))
+                )
+                with tracer.span("extract_cards", "extract"):
+                    items = extract_cards(driver, "li.job-meta__item", FAEYA_META_SPEC, root=meta_section)
+                return faeya_detail_record(job_info, ul_elements, items)
 
-                # --- Extract Job Metadata ---
-                job_id = "N/A"
-                role_type = "N/A"
-                location = "N/A"
-                salary = "N/A"
-                level = "N/A"
-
-                min_salary = None
-                max_salary = None
+            except TimeoutException:
+                log_and_print("❌ Failed to locate job metadata section.")
+        except Exception as e:
+            log_and_print(f"⚠️ Error visiting detail page for {job_title}: {e}")
+    return None
+
+
+# Shared by both detail engines: builds the record from the page's <ul> lists
+# (the fourth holds the description) and the job-meta items
+def faeya_detail_record(job_info, ul_elements, items):
+    description = "N/A"
+    if len(ul_elements) >= 4:
+        li_texts = ul_elements[3]["items"]
+        if li_texts:
+            description = " | ".join(li_texts)
+    log_and_print(f"📝 Description: {description}", job=job_info["url"])
+
+    job_id = "N/A"
+    role_type = "N/A"
+    location = "N/A"
+    salary = "N/A"
+    level = "N/A"
+
+    min_salary = None
+    max_salary = None
+
+    for item in items:
+        try:
+            if item["title"] is None or item["value"] is None:
+                raise ValueError("meta item is missing its title or value")
+            title = item["title"]
+            value = item["value"]
+
+            if title == "Job Identification":
+                if value:
+                    job_id = value
+
+            elif title == "Job Category":
+                if value:
+                    role_type = value
+
+            elif title == "Locations":
+                location_list = item["locations"]
+                workplace_type = item["workplace_type"] or ""
+                if location_list:
+                    location = ", ".join(location_list)
+                    if workplace_type:
+                        location += f" {workplace_type}"
+
+            elif title == "Minimum Salary":
+                if value and value != ".":
+                    min_salary = value
+
+            elif title == "Maximum Salary":
+                if value and value != ".":
+                    max_salary = value
+
+        except Exception as e:
+            log_and_print(f"⚠️ Error parsing job meta item: {e}")
+
+    if min_salary and max_salary:
+        salary = f"{min_salary} - {max_salary}"
+    elif min_salary:
+        salary = min_salary
+    elif max_salary:
+        salary = max_salary
+
+    job_data = {
+        "job_title": job_info["title"],
+        "job_url": job_info["url"],
+        "job_id": job_id,
+        "location": location,
+        "role_type": role_type,
+        "salary": salary,
+        "description": description,
+        "keyword": job_info["keyword"],
+        "level": level
+    }
+
+    # Log each job summary
+    log_and_print(f"📌 Job ID: {job_id}", job=job_info["url"])
+    log_and_print(f"📍 Location(s): {location}", job=job_info["url"])
+    log_and_print(f"🧩 Role Type: {role_type}", job=job_info["url"])
+    log_and_print(f"💰 Salary: {salary}", job=job_info["url"])
+    return job_data
+
+
+# --- Browser-context detail engine ---
+# Same page, loaded in a throwaway browser context of the shared Chromium
+# (see context_pool.py) instead of on a leased WebDriver. The coroutine runs
+# on the pool's event loop; pacing and spans stay on the calling worker thread.
+async def load_faeya_detail(contexts, job_url):
+    async with contexts.page(job_url) as page:
+        await page.goto(job_url, wait_until="domcontentloaded")
+        meta_section = await page.wait_for_selector(FAEYA_META_LIST, timeout=10000)
+        ul_elements = await extract_cards_async(page, "ul", FAEYA_LIST_SPEC)
+        items = await extract_cards_async(page, "li.job-meta__item", FAEYA_META_SPEC, root=meta_section)
+        return ul_elements, items
+
+
+def scrape_faeya_detail_in_context(contexts, i, job_info, pacer):
+    job_title = job_info["title"]
+    job_url = job_info["url"]
+
+    log_and_print(f"\n🌐 Visiting job {i} in a browser context: {job_title} — {job_url}", job=job_url)
+    with tracer.span(job_title, "job"):
+        try:
+            with pacer.track(job_url):
+                with tracer.span("context page", "navigate"):
+                    ul_elements, items = contexts.run(load_faeya_detail(contexts, job_url))
+            return faeya_detail_record(job_info, ul_elements, items)
+        except Exception as e:
+            log_and_print(f"⚠️ Error visiting detail page for {job_title}: {e}")
+    return None
+
+
+# --- Listing stage ---
+# Runs every keyword search on a browser leased from the pool and yields each
+# result as soon as it is read. When the generator finishes, the search
+# browser goes back to the pool for detail pages. Jobs already admitted by
+# an earlier keyword are not queued again.
+def harvest_faeya_listings(pool, pacer, frontier):
+    with pool.lease() as driver:
+        wait = WebDriverWait(driver, 15)
 
+        for keyword in SEARCH_KEYWORDS:
+            with tracer.span(keyword, "keyword"):
                 try:
-                    meta_section = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "ul.job-meta__list"))
-                    )
-                    items = meta_section.find_elements(By.CSS_SELECTOR, "li.job-meta__item")
+                    with pacer.track(BASE_URL):
+                        with tracer.span("driver.get", "navigate"):
+                            driver.get(BASE_URL)
+                        with tracer.span("search form", "wait"):
+                            wait.until(EC.presence_of_element_located((By.XPATH, '//*[@id="keyword"]')))
+                except TimeoutException:
+                    log_and_print(f"❌ Search page did not load for keyword: {keyword}")
+                    continue
+                log_and_print("🌐 Input field found.")
 
-                    for item in items:
+                try:
+                    log_and_print(f"🔎 Starting search for keyword: '{keyword}'")
+                    search_input = wait.until(EC.element_to_be_clickable((By.XPATH, '//*[@id="keyword"]')))
+                    ActionChains(driver).move_to_element(search_input).click().perform()
+                    pacer.pause()
+
+                    search_input.send_keys(Keys.CONTROL + "a")
+                    search_input.send_keys(Keys.BACKSPACE)
+                    pacer.pause()
+                    search_input.send_keys(keyword)
+                    pacer.pause()
+
+                    # Submitting is a page load: paced, timed, and finished as soon as results appear
+                    with pacer.track(BASE_URL):
+                        with tracer.span("submit search", "navigate"):
+                            search_input.send_keys(Keys.RETURN)
+                        log_and_print("🔘 Search submitted.")
+                        with tracer.span("search results", "wait"):
+                            wait.until(EC.presence_of_element_located((By.XPATH, '//*[@id="main"]/div/div/div/div/div/div[3]/div/div/div/div[2]/div/div/ul')))
+                    ul_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "ul.jobs-list__list")))
+                    with tracer.span("extract_cards", "extract"):
+                        job_items = extract_cards(driver, "li[data-qa='searchResultItem']", FAEYA_RESULT_SPEC, root=ul_element)
+
+                    log_and_print(f"📌 Found {len(job_items)} job(s) on the page.")
+                    resource_blocker.page_report(driver, f"search '{keyword}'")
+
+                    for idx, job in enumerate(job_items, 1):
                         try:
-                            title_span = item.find_element(By.CSS_SELECTOR, "span.job-meta__title")
-                            value_span = item.find_element(By.CSS_SELECTOR, "span.job-meta__subitem")
-                            title = title_span.text.strip()
-
-                            if title == "Job Identification":
-                                value = value_span.text.strip()
-                                if value:
-                                    job_id = value
-
-                            elif title == "Job Category":
-                                value = value_span.text.strip()
-                                if value:
-                                    role_type = value
-
-                            elif title == "Locations":
-                                locations = value_span.find_elements(By.CSS_SELECTOR, ".job-meta__pin-item")
-                                location_list = [loc.text.strip() for loc in locations if loc.text.strip()]
-                                workplace_type = ""
-                                try:
-                                    workplace_type_span = value_span.find_element(By.CSS_SELECTOR, ".job-meta__workplace-type")
-                                    workplace_type = workplace_type_span.text.strip()
-                                except:
-                                    pass
-                                if location_list:
-                                    location = ", ".join(location_list)
-                                    if workplace_type:
-                                        location += f" {workplace_type}"
-
-                            elif title == "Minimum Salary":
-                                value = value_span.text.strip()
-                                if value and value != ".":
-                                    min_salary = value
-
-                            elif title == "Maximum Salary":
-                                value = value_span.text.strip()
-                                if value and value != ".":
-                                    max_salary = value
-
+                            if not job["url"] or not job["title"]:
+                                raise ValueError("result is missing its title or link")
+                            job_url = job["url"]
+                            job_title = job["title"]
+                            if not frontier.admit(canonical_job_url(job_url), keyword):
+                                log_and_print(f"🔁 Job {idx} already queued under another keyword: {job_title}", job=job_url)
+                                continue
+
+                            yield {
+                                "url": job_url,
+                                "title": job_title,
+                                "keyword": keyword
+                            }
+                            log_and_print(f"🔗 Job {idx}: {job_title} — {job_url}", job=job_url)
                         except Exception as e:
-                            log_and_print(f"⚠️ Error parsing job meta item: {e}")
-
-                    if min_salary and max_salary:
-                        salary = f"{min_salary} - {max_salary}"
-                    elif min_salary:
-                        salary = min_salary
-                    elif max_salary:
-                        salary = max_salary
-
-                    # Append job to final data
-                    all_data.append({
-                        "job_title": job_title,
-                        "job_url": job_url,
-                        "job_id": job_id,
-                        "location": location,
-                        "role_type": role_type,
-                        "salary": salary,
-                        "description": description,
-                        "keyword": keyword,
-                        "level": level
-                    })
-
-                    # Log each job summary
-                    log_and_print(f"📌 Job ID: {job_id}")
-                    log_and_print(f"📍 Location(s): {location}")
-                    log_and_print(f"🧩 Role Type: {role_type}")
-                    log_and_print(f"💰 Salary: {salary}")
-
+                            log_and_print(f"⚠️ Error parsing job item {idx}: {e}")
                 except TimeoutException:
-                    log_and_print("❌ Failed to locate job metadata section.")
-            except Exception as e:
-                log_and_print(f"⚠️ Error visiting detail page for {job_title}: {e}")
+                    log_and_print(f"❌ Failed to load results for keyword: {keyword}")
+                    continue
 
-        # --- Save Final Results ---
-        if all_data:
-            os.makedirs("data", exist_ok=True)
-            filename = f"data/faeya_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            pd.DataFrame(all_data).to_csv(filename, index=False)
-            log_and_print(f"\n📁 Data saved to {filename}")
-        else:
-            log_and_print("⚠️ No job data to save.")
+
+# --- Scraper Logic ---
+def scrape_faeya_jobs():
+    start_time = datetime.now()
+    log_and_print(f"\n🚀 Scraping started at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    # Browser contexts are cheap, so that engine runs more detail workers and
+    # the WebDriver pool keeps only the search browser
+    contexts = shared_context_pool() if DETAIL_ENGINE == "contexts" else None
+    workers = CONTEXT_WORKERS if contexts else DETAIL_WORKERS
+    pacer = AdaptivePacer(rate=PACER_RATE, burst=workers, tracer=tracer)
+    rows = 0
+    try:
+        with tracer.span("faeya selenium run", "run"):
+            # --- Visit Detail Pages ---
+            # Search results stream into a bounded pool of detail browsers while
+            # the other keywords are still being searched; finished records are
+            # flushed to disk in batches.
+            store = FingerprintStore()
+            frontier = JobFrontier()
+            numbers = itertools.count(1)
+            with DriverPool(create_driver, size=1 if contexts else DETAIL_WORKERS + 1) as pool:
+                pool.warm()
+                # With a single browser the listing stage must finish before any
+                # detail page can load, so it cannot be allowed to block on a full queue
+                queue_size = QUEUE_SIZE if contexts or pool.started > 1 else 0
+                if contexts:
+                    log_and_print(f"\n🔍 Streaming job detail pages with {workers} browser context(s)...")
+                else:
+                    log_and_print(f"\n🔍 Streaming job detail pages with {max(pool.started - 1, 1)} browser(s)...")
+
+                def visit(job_info):
+                    i = next(numbers)
+
+                    def fetch_detail():
+                        if contexts:
+                            return scrape_faeya_detail_in_context(contexts, i, job_info, pacer)
+                        with pool.lease() as detail_driver:
+                            return scrape_faeya_detail(detail_driver, i, job_info, pacer)
+
+                    return fetch_unless_unchanged(store, job_info["title"], job_info["url"], job_info["keyword"], fetch_detail)
+
+                # Rows stream out tagged with the keywords seen so far; close() rewrites them with every keyword that matched
+                def tag_keywords(job):
+                    return frontier.tag(job, canonical_job_url(job["job_url"]))
+
+                filename = f"data/faeya_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                writer = BatchWriter(
+                    "faeya", filename, FAEYA_CSV_COLUMNS,
+                    prepare=tag_keywords,
+                    finalize=tag_keywords,
+                    tracer=tracer,
+                )
+                rows = run_pipeline(
+                    lambda: harvest_faeya_listings(pool, pacer, frontier), visit, writer, workers=workers, queue_size=queue_size
+                )
+
+            # --- Save Final Results ---
+            if rows:
+                log_and_print(f"\n📁 Data saved to {filename}")
+            else:
+                log_and_print("⚠️ No job data to save.")
+            log_and_print(f"🔁 Keyword frontier: {frontier.stats()}")
+            store.save()
 
     except Exception as e:
         log_and_print(f"❌ Fatal error during scraping: {e}")
         log_and_print(traceback.format_exc())
+        raise
 
     finally:
-        if driver:
-            driver.quit()
-            gc.collect()
+        gc.collect()
+        log_and_print(f"⏱️ Pacing: {pacer.summary()}")
+        log_and_print(f"🧱 Resources: {resource_blocker.summary()}")
+        if contexts:
+            log_and_print(f"🪟 Browser contexts: {contexts.summary()}")
+        log_and_print(f"🧭 Phases: {tracer.summary()}")
+        log_and_print(f"🛰️ WebDriver: {driver_metrics.summary(rows)}")
+        if driver_metrics.commands:
+            log_and_print(f"🛰️ Command latency:\n{driver_metrics.histogram()}")
+        regression = driver_metrics.check_baseline(rows)
+        if regression:
+            log_and_print(f"⚠️ {regression}")
+        log_and_print(f"🗺️ Trace saved to {tracer.export()}")
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         log_and_print(f"\n✅ Scraping finished at {end_time.strftime('%Y-%m-%d %H:%M:%S')} (Duration: {duration:.2f} seconds)")
+    return rows
 
 # --- Main Execution ---
+def main():
+    # Selenium stays as the fallback if the API engine cannot complete
+    if ENGINE == "api":
+        rows = scrape_faeya_jobs_api()
+        if rows is not None:
+            return rows
+    return scrape_faeya_jobs()
+
+
 if __name__ == "__main__":
-    scrape_faeya_jobs()
+    main()
@@ -0,0 +1,70 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+
+logger = logging.getLogger(__name__)
+
+FINGERPRINT_FILE = os.path.join("data", "job_fingerprints.json")
+
+
+def hash_job(job):
+    return hashlib.md5(json.dumps(job, sort_keys=True).encode()).hexdigest()
+
+
+# --- Fingerprint Store ---
+# Remembers, per site and job, the hash of the listing-level fields seen on
+# the previous run together with the detail fields fetched for it. When the
+# listing hash is unchanged the stored detail is reused and the detail page
+# is not visited again.
+class FingerprintStore:
+    def __init__(self, path=FINGERPRINT_FILE, max_age_days=30):
+        self.path = path
+        self.max_age_days = max_age_days
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read fingerprint store {path}, starting fresh: {e}")
+
+    @staticmethod
+    def key(site, job_key):
+        return f"{site}|{job_key}"
+
+    def cached_detail(self, site, job_key, listing):
+        # Returns the stored detail fields when the listing is unchanged, else None
+        entry_key = self.key(site, job_key)
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry and entry["hash"] == hash_job(listing):
+                entry["last_seen"] = datetime.now().isoformat(timespec="seconds")
+                self.hits += 1
+                return dict(entry["detail"])
+            self.misses += 1
+            return None
+
+    def record(self, site, job_key, listing, detail):
+        with self._lock:
+            self._entries[self.key(site, job_key)] = {
+                "hash": hash_job(listing),
+                "detail": detail,
+                "last_seen": datetime.now().isoformat(timespec="seconds"),
+            }
+
+    def save(self):
+        cutoff = (datetime.now() - timedelta(days=self.max_age_days)).isoformat(timespec="seconds")
+        with self._lock:
+            self._entries = {k: v for k, v in self._entries.items() if v["last_seen"] >= cutoff}
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        logger.info(f"Fingerprint store saved ({self.hits} unchanged, {self.misses} new or changed)")
@@ -0,0 +1,45 @@
+import threading
+from urllib.parse import urlsplit, urlunsplit
+
+KEYWORD_SEPARATOR = "; "
+
+
+def canonical_job_url(url):
+    # The same posting is linked with a different ?q= / ?keyword= per search
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), "", ""))
+
+
+# --- Job Frontier ---
+# Deduplicates jobs across keyword searches. The first search to see a job
+# admits it for a detail visit; later searches only add their keyword. When a
+# record is written, tag() fills its keyword column with every keyword that
+# has matched the job so far; the writer tags it again once the run is over.
+class JobFrontier:
+    def __init__(self):
+        self._keywords = {}
+        self._lock = threading.Lock()
+        self.sightings = 0
+
+    def admit(self, job_key, keyword):
+        with self._lock:
+            self.sightings += 1
+            keywords = self._keywords.get(job_key)
+            if keywords is None:
+                self._keywords[job_key] = [keyword]
+                return True
+            if keyword not in keywords:
+                keywords.append(keyword)
+            return False
+
+    def keywords(self, job_key):
+        with self._lock:
+            return KEYWORD_SEPARATOR.join(self._keywords.get(job_key, []))
+
+    def tag(self, record, job_key):
+        keywords = self.keywords(job_key)
+        return {**record, "keyword": keywords} if keywords else record
+
+    def stats(self):
+        with self._lock:
+            return f"{len(self._keywords)} unique job(s) from {self.sightings} search hit(s)"
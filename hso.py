@@ -1,14 +1,7 @@
 import traceback
 import sys
 import gc
-import os
 import re
-import time
-import json
-import hashlib
-import logging
-import random
-import pandas as pd
 from datetime import datetime
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -17,34 +10,45 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
-import undetected_chromedriver as uc
+from card_extract import extract_cards
+from driver_factory import create_chrome
+from driver_metrics import DriverMetrics
+from driver_pool import start_browser
+from frontier import JobFrontier, canonical_job_url
+from pacing import AdaptivePacer
+from pipeline import BatchWriter, run_pipeline
+from resource_block import ResourceBlocker
+from scrape_log import setup_site_logging
+from tracing import Tracer
 
 
 # --- Configuration ---
 RUN_HEADLESS = True
 SEARCH_KEYWORDS = ["Microsoft Dynamics", "Power Platform"]
+HSO_URL = "https://www.hso.com/careers/vacancies/"
+PACER_RATE = 0.5  # page loads per second before any backoff
+HSO_CSV_COLUMNS = ["title", "location", "job_id", "level", "job_url", "keyword", "description"]
+JOB_LOG_SAMPLE = 1.0  # share of jobs whose log lines are kept; 0.1 keeps one job in ten
 
 
 # --- Setup logging ---
-if not os.path.exists("log"):
-    os.makedirs("log")
-log_file = os.path.join("log", "rsm_scrape.log")
+# JSON lines in log/hso.jsonl, written by a background thread (see scrape_log.py)
+logger = setup_site_logging("hso", job_sample=JOB_LOG_SAMPLE)
 
 
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+# --- Card Spec ---
+# Extracted in one execute_script call per page, see card_extract.py
+HSO_CARD_SPEC = {
+    "title": {"selector": "h3.h4"},
+    "job_url": {"selector": "a.btn.btn--line.btn--full", "attr": "href"},
+    "location": {"selector": "div.text-tags__row--cyan span", "all": True, "join": ", "},
+    "description": {"selector": "p.line-clamp-5"},
+}
 
 
-def log_and_print(message):
-    print(message)
-    logging.info(message)
-
-
-def hash_job(job):
-    return hashlib.md5(json.dumps(job, sort_keys=True).encode()).hexdigest()
+def log_and_print(message, job=None):
+    # job=<job url> marks a per-job line; JOB_LOG_SAMPLE keeps or drops all of a job's lines together
+    logger.info(message, extra={"per_job": True, "job_key": canonical_job_url(job)} if job else None)
 
 
 # --- Scraper Logic ---
@@ -67,241 +71,222 @@ def scrape_hso_jobs():
     )
 
 
+    blocker = ResourceBlocker.for_site(HSO_URL)
+    blocker.configure(options)
+
     driver = None
+    tracer = Tracer("hso")
+    pacer = AdaptivePacer(rate=PACER_RATE, tracer=tracer)
+    metrics = DriverMetrics("hso")
+    rows = 0
     try:
-        driver = uc.Chrome(options=options)
+        with tracer.span("uc.Chrome", "browser start"):
+            driver = start_browser(lambda: create_chrome(options, "hso"))
+        blocker.attach(driver)
+        metrics.instrument(driver)
         wait = WebDriverWait(driver, 15)
 
 
-        all_data = []
-
-        driver.get("https://www.hso.com/careers/vacancies/")
-        time.sleep(random.uniform(2, 4))
-
-        for keyword in SEARCH_KEYWORDS:
-            driver.get("https://www.hso.com/careers/vacancies/")
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='searchTerm']")))
-            time.sleep(random.uniform(2, 4))
-
-
-            try:
-                log_and_print(f"🔎 Starting search for keyword: '{keyword}'")
-
-                # Locate and click into the search input
-                search_input = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[name='searchTerm']")))
-                log_and_print("✅ Search input located.")
-
-                # Simulate human-like interaction
-                ActionChains(driver).move_to_element(search_input).click().perform()
-                time.sleep(random.uniform(0.5, 1.5))
-
-                search_input.send_keys(Keys.CONTROL + "a")
-                search_input.send_keys(Keys.BACKSPACE)
-                time.sleep(random.uniform(1, 2))
-
-                search_input.send_keys(keyword)
-                time.sleep(random.uniform(0.5, 1.5))
-                search_input.send_keys(Keys.RETURN)
+        # Listing producer: yields one record per card as each page is read;
+        # hso has no detail stage, so records go straight to the sink. Jobs
+        # matched by several keywords are written once, tagged with all of them.
+        frontier = JobFrontier()
 
-                log_and_print("🔘 Search input submitted.")
-                time.sleep(random.uniform(3, 5))
-
-                # Confirm search results loaded
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "article[class='card card--text']")))
-                log_and_print("🔍 Search results loaded.")
-
-            except TimeoutException:
-                log_and_print(f"❌ Failed to load results for keyword: {keyword}")
-                continue
-
-
-            page = 1
-
-            while True:
-                log_and_print(f"📄 Processing page {page} for keyword '{keyword}'")
+        def produce():
+            for keyword in SEARCH_KEYWORDS:
+                with tracer.span(keyword, "keyword"):
+                    try:
+                        with pacer.track(HSO_URL):
+                            with tracer.span("driver.get", "navigate"):
+                                driver.get(HSO_URL)
+                            with tracer.span("search form", "wait"):
+                                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='searchTerm']")))
+                    except TimeoutException:
+                        log_and_print(f"❌ Search page did not load for keyword: {keyword}")
+                        continue
 
-                try:
-                    wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.card--text__content')))
-                    job_cards = driver.find_elements(By.CSS_SELECTOR, 'article.card.card--text')
-                    log_and_print(f"🔢 Found {len(job_cards)} job cards on page {page}")
-                except TimeoutException:
-                    log_and_print("⚠️ No job cards found.")
-                    break
 
-                # Get details for each job card on the job list page
-                for card in job_cards:
                     try:
-                        title = card.find_element(By.CSS_SELECTOR, "h3.h4").text.strip()
-                        url_el = card.find_element(By.CSS_SELECTOR, "a.btn.btn--line.btn--full")
-                        job_url = url_el.get_attribute("href").strip()
-
-            #           # --- Locationn ---
-                        # ✅ Correct
-                        location_tags = card.find_elements(By.CSS_SELECTOR, "div.text-tags__row--cyan span")
-                        location = ", ".join([tag.text.strip() for tag in location_tags])
-           
-
-
-            #           # --- description ---  
-                        description = card.find_element(By.CSS_SELECTOR, "p.line-clamp-5").text.strip()
-                        
-                        job_id = "N/A"
-                        level = "N/A"
-
-                            
-
-                        job_data = {
-                            "title": title,
-                            "location": location,
-                            "job_id": job_id,
-                            "level": level,
-                            "job_url": job_url,
-                            "keyword": keyword,
-                            "description": description
-                        }
-                        all_data.append(job_data)
-                        log_and_print(f"✅ Scraped job: {title} | {location} | {job_id} | {level} | {job_url} | {keyword}")
-
-
-            #             # Click job to go to detail page
-            #             log_and_print(f"🖱️ Clicking job link: {title}")
-            #             driver.execute_script("arguments[0].scrollIntoView(true);", url_el)
-            #             url_el.click()
-
-            #             # Wait for job detail content to load (adjust selector as needed)
-            #             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[aria-label='Job Posting Description'][tabindex='0']")))
-
-            #             # Confirm we are on the right job page by logging header or job ID
-            #             try:
-            #                 job_header_el = driver.find_element(By.CSS_SELECTOR, "h2[data-automation-id='jobPostingHeader']")
-            #                 job_header = job_header_el.text.strip()
-            #                 log_and_print(f"📄 Opened job detail page for: {job_header}")
-
-            #             except Exception as e:
-            #                 log_and_print(f"⚠️ Could not confirm job detail page: {e}")
-
-            #             # Location extraction
-            #             try:
-            #                 # Narrow the scope to ONLY inside the main job posting container
-            #                 job_detail_section = driver.find_element(By.XPATH, '//*[@id="mainContent"]/div/div[2]/div/div/section/div/div[2]/div/div/div/div[1]/div/div[1]/div')
-            #                 location_elements = job_detail_section.find_elements(By.CSS_SELECTOR, "div[data-automation-id='locations'] dd")
-
-            #                 # Strip and clean only non-empty values
-            #                 location_list = [el.text.strip() for el in location_elements if el.text.strip()]
-                            
-            #                 if location_list:
-            #                     location = ", ".join(location_list)
-            #                     log_and_print(f"📍 Location(s) found: {location}")
-            #                 else:
-            #                     location = "Unknown"
-            #                     log_and_print("⚠️ No location text found.")
-            #             except Exception as e:
-            #                 location = "Unknown"
-            #                 log_and_print(f"⚠️ Error getting locations: {e}")
-
-
-            #             # Description extraction
-            #             try:
-            #                 description_el = driver.find_element(By.XPATH, '//*[@id="mainContent"]/div/div[2]/div/div/section/div/div[2]/div/div/div/div[2]/div/div/p[1]')
-            #                 description = description_el.text.strip()
-            #                 log_and_print(f"📝 Description found: {description[:100]}...")  # Only show first 100 chars
-            #             except Exception as e:
-            #                 description = "Not found"
-            #                 log_and_print(f"⚠️ Could not extract job description: {e}")
-
-
-            #             job_data["location"] = location
-            #             job_data["description"] = description
-
-            #             all_data.append(job_data)
-            #             # log_and_print(f"✅ Scraped full job data: {job_data}")
-
-
-
-
-            #             # Go back to job list
-            #             driver.back()
-            #             wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "section[data-automation-id='jobResults'] ul[role='list'] > li.css-1q2dra3")))
-            #             time.sleep(2) 
-
-                    except Exception as e:
-                        log_and_print(f"⚠️ Error extracting job card: {e}")
+                        log_and_print(f"🔎 Starting search for keyword: '{keyword}'")
+
+                        # Locate and click into the search input
+                        search_input = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[name='searchTerm']")))
+                        log_and_print("✅ Search input located.")
+
+                        # Simulate human-like interaction
+                        ActionChains(driver).move_to_element(search_input).click().perform()
+                        pacer.pause()
+
+                        search_input.send_keys(Keys.CONTROL + "a")
+                        search_input.send_keys(Keys.BACKSPACE)
+                        pacer.pause()
+
+                        search_input.send_keys(keyword)
+                        pacer.pause()
+
+                        # Submitting is a page load: paced, timed, and finished as soon as results appear
+                        with pacer.track(HSO_URL):
+                            with tracer.span("submit search", "navigate"):
+                                search_input.send_keys(Keys.RETURN)
+                            log_and_print("🔘 Search input submitted.")
+                            with tracer.span("search results", "wait"):
+                                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "article[class='card card--text']")))
+                        log_and_print("🔍 Search results loaded.")
+
+                    except TimeoutException:
+                        log_and_print(f"❌ Failed to load results for keyword: {keyword}")
                         continue
 
-                first_card = job_cards[0]
 
+                    page = 1
 
-                try:
-                    # Find the NEXT (right) arrow button — the last circle-arrow (non-rotated)
-                    next_button = driver.find_elements(By.CSS_SELECTOR, "button.btn--icon")[::-1]
-                    next_arrow = None
+                    while True:
+                        with tracer.span(f"page {page}", "page", keyword=keyword):
+                            log_and_print(f"📄 Processing page {page} for keyword '{keyword}'")
 
-                    for btn in next_button:
-                        try:
-                            use = btn.find_element(By.CSS_SELECTOR, "svg > use")
-                            if use.get_attribute("href") == "/dist/icons.svg#circle-arrow":
-                                next_arrow = btn
+                            try:
+                                with tracer.span("job cards", "wait"):
+                                    wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'div.card--text__content')))
+                                job_cards = driver.find_elements(By.CSS_SELECTOR, 'article.card.card--text')
+                                log_and_print(f"🔢 Found {len(job_cards)} job cards on page {page}")
+                                blocker.page_report(driver, f"{keyword} page {page}")
+                            except TimeoutException:
+                                log_and_print("⚠️ No job cards found.")
                                 break
-                        except:
-                            continue
 
-                    if not next_arrow:
-                        log_and_print("⛔ Next arrow not found.")
-                        break
+                            # Get details for each job card on the job list page
+                            with tracer.span("extract_cards", "extract"):
+                                cards = extract_cards(driver, "article.card.card--text", HSO_CARD_SPEC)
+                            for card in cards:
+                                # Per-card work only; the span closes before the card is handed downstream
+                                with tracer.span(card["title"] or "untitled card", "job"):
+                                    try:
+                                        if not card["title"] or not card["job_url"]:
+                                            raise ValueError("card is missing its title or link")
+                                        title = card["title"]
+                                        job_url = card["job_url"]
+                                        if not frontier.admit(canonical_job_url(job_url), keyword):
+                                            log_and_print(f"🔁 Already collected under another keyword: {title}", job=job_url)
+                                            continue
+                                        location = card["location"]
+                                        description = card["description"] or ""
+
+                                        job_id = "N/A"
+                                        level = "N/A"
+
+                                        job_data = {
+                                            "title": title,
+                                            "location": location,
+                                            "job_id": job_id,
+                                            "level": level,
+                                            "job_url": job_url,
+                                            "keyword": keyword,
+                                            "description": description
+                                        }
+                                    except Exception as e:
+                                        log_and_print(f"⚠️ Error extracting job card: {e}")
+                                        continue
+
+                                yield job_data
+                                log_and_print(f"✅ Scraped job: {title} | {location} | {job_id} | {level} | {job_url} | {keyword}", job=job_url)
+
+                            first_card = job_cards[0]
+
+
+                            try:
+                                # Find the NEXT (right) arrow button — the last circle-arrow (non-rotated)
+                                next_button = driver.find_elements(By.CSS_SELECTOR, "button.btn--icon")[::-1]
+                                next_arrow = None
+
+                                for btn in next_button:
+                                    try:
+                                        use = btn.find_element(By.CSS_SELECTOR, "svg > use")
+                                        if use.get_attribute("href") == "/dist/icons.svg#circle-arrow":
+                                            next_arrow = btn
+                                            break
+                                    except:
+                                        continue
+
+                                if not next_arrow:
+                                    log_and_print("⛔ Next arrow not found.")
+                                    break
+
+                                # Scroll into view
+                                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_arrow)
+
+                                # Check if disabled
+                                if next_arrow.get_attribute("disabled") is not None:
+                                    log_and_print("⛔ Next button is disabled. Last page reached.")
+                                    break
+
+                                # Past the last page the cards never go stale; that timeout is not a site error
+                                with pacer.track(HSO_URL, expected=(TimeoutException,)):
+                                    # Try clicking
+                                    with tracer.span("next page", "navigate"):
+                                        try:
+                                            next_arrow.click()
+                                        except Exception as e:
+                                            log_and_print(f"⚠️ Standard click failed: {e}. Trying JS click.")
+                                            driver.execute_script("arguments[0].click();", next_arrow)
+
+                                    # Wait for page to change
+                                    with tracer.span("page change", "wait"):
+                                        wait.until(EC.staleness_of(first_card))
+                                page += 1
+
+                            except NoSuchElementException:
+                                log_and_print("ℹ️ No pagination button found.")
+                                break
+                            except TimeoutException:
+                                log_and_print("⚠️ Page did not change — possibly last page.")
+                                break
 
-                    # Scroll into view
-                    driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", next_arrow)
-                    time.sleep(1)
 
-                    # Check if disabled
-                    if next_arrow.get_attribute("disabled") is not None:
-                        log_and_print("⛔ Next button is disabled. Last page reached.")
-                        break
 
-                    # Try clicking
-                    try:
-                        next_arrow.click()
-                    except Exception as e:
-                        log_and_print(f"⚠️ Standard click failed: {e}. Trying JS click.")
-                        driver.execute_script("arguments[0].click();", next_arrow)
-
-                    # Wait for page to change
-                    wait.until(EC.staleness_of(first_card))
-                    page += 1
-                    time.sleep(2)
-
-                except NoSuchElementException:
-                    log_and_print("ℹ️ No pagination button found.")
-                    break
-                except TimeoutException:
-                    log_and_print("⚠️ Page did not change — possibly last page.")
-                    break
-
-
-
-        # ==========================
-        # # Save to CSV
-        if all_data:
-            os.makedirs("data", exist_ok=True)
-            filename = f"data/hso_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            pd.DataFrame(all_data).to_csv(filename, index=False)
+        # Rows stream out tagged with the keywords seen so far; close() rewrites them with every keyword that matched
+        def tag_keywords(job_data):
+            return frontier.tag(job_data, canonical_job_url(job_data["job_url"]))
+
+        filename = f"data/hso_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        writer = BatchWriter(
+            "hso", filename, HSO_CSV_COLUMNS,
+            prepare=tag_keywords,
+            finalize=tag_keywords,
+            tracer=tracer,
+        )
+        with tracer.span("hso run", "run"):
+            rows = run_pipeline(produce, lambda job_data: job_data, writer)
+        if rows:
             log_and_print(f"📁 Data saved to {filename}")
         else:
             log_and_print("⚠️ No data scraped.")
+        log_and_print(f"🔁 Keyword frontier: {frontier.stats()}")
 
 
     except Exception as e:
         log_and_print(f"❌ Fatal error during scraping: {e}")
         log_and_print(traceback.format_exc())
+        raise
 
 
     finally:
         if driver:
             driver.quit()
             gc.collect()  # Helps clean up remaining references
+        log_and_print(f"⏱️ Pacing: {pacer.summary()}")
+        log_and_print(f"🧱 Resources: {blocker.summary()}")
+        log_and_print(f"🧭 Phases: {tracer.summary()}")
+        log_and_print(f"🛰️ WebDriver: {metrics.summary(rows)}")
+        if metrics.commands:
+            log_and_print(f"🛰️ Command latency:\n{metrics.histogram()}")
+        regression = metrics.check_baseline(rows)
+        if regression:
+            log_and_print(f"⚠️ {regression}")
+        log_and_print(f"🗺️ Trace saved to {tracer.export()}")
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         log_and_print(f"✅ Scraping finished at {end_time.strftime('%Y-%m-%d %H:%M:%S')} (Duration: {duration:.2f} seconds)")
+    return rows
 
 
 # --- Main Execution Block ---
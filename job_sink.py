@@ -0,0 +1,142 @@
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime, timezone
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet output is optional; the CSV outputs do not need it
+    pa = None
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+PARQUET_DIR = os.path.join("data", "parquet")
+COMPACT_MIN_FILES = 8  # compact a partition once it has this many part files
+
+# One schema for every site. `site` and `run_date` are hive partition keys
+# (data/parquet/site=rsm/run_date=2024-05-01/...), so they live in the path.
+CANONICAL_COLUMNS = [
+    "title",
+    "job_id",
+    "job_url",
+    "location",
+    "salary",
+    "role_type",
+    "level",
+    "keyword",
+    "date_posted",
+    "description",
+    "scraped_at",
+]
+
+# Site-specific field names mapped onto the canonical ones
+FIELD_ALIASES = {
+    "job_title": "title",
+    "url": "job_url",
+    "posted": "date_posted",
+}
+
+
+def job_schema():
+    return pa.schema(
+        [(name, pa.timestamp("s", tz="UTC") if name == "scraped_at" else pa.string()) for name in CANONICAL_COLUMNS]
+    )
+
+
+def normalize_record(record, scraped_at):
+    row = dict.fromkeys(CANONICAL_COLUMNS)
+    for key, value in record.items():
+        key = FIELD_ALIASES.get(key, key)
+        if key in row and value is not None:
+            row[key] = str(value)
+    row["scraped_at"] = scraped_at
+    return row
+
+
+# --- Parquet Sink ---
+# Every write() appends a new part file to its site/run_date partition, so a
+# crash never rewrites earlier output. Partitions that collect many small
+# parts (NigelFrank writes one per page) are merged by compact(), which also
+# drops rows repeated for the same job_url, keeping the latest; a job matched
+# by several keywords is one row tagged with all of them (see frontier.py).
+class ParquetSink:
+    def __init__(self, root=PARQUET_DIR, compact_min_files=COMPACT_MIN_FILES):
+        self.root = root
+        self.compact_min_files = compact_min_files
+        self._lock = threading.Lock()
+        if pa is None:
+            logger.warning("pyarrow is not installed; Parquet output is disabled")
+
+    @property
+    def enabled(self):
+        return pa is not None
+
+    def partition_dir(self, site, run_date):
+        return os.path.join(self.root, f"site={site}", f"run_date={run_date}")
+
+    def _write_table(self, table, directory, prefix):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{prefix}-{datetime.now().strftime('%H%M%S')}-{uuid.uuid4().hex[:8]}.parquet")
+        tmp_path = f"{path}.tmp"
+        pq.write_table(table, tmp_path, compression="zstd")
+        os.replace(tmp_path, path)
+        return path
+
+    def write(self, site, records, scraped_at=None):
+        if not self.enabled or not records:
+            return None
+        scraped_at = scraped_at or datetime.now(timezone.utc).replace(microsecond=0)
+        rows = [normalize_record(record, scraped_at) for record in records]
+        table = pa.Table.from_pylist(rows, schema=job_schema())
+        with self._lock:
+            path = self._write_table(table, self.partition_dir(site, scraped_at.date().isoformat()), "part")
+        logger.info(f"Appended {len(rows)} row(s) to {path}")
+        return path
+
+    def compact(self, site=None, min_files=None):
+        if not self.enabled or not os.path.isdir(self.root):
+            return 0
+        min_files = min_files or self.compact_min_files
+        compacted = 0
+        with self._lock:
+            for site_dir in sorted(os.listdir(self.root)):
+                if site and site_dir != f"site={site}":
+                    continue
+                for date_dir in sorted(os.listdir(os.path.join(self.root, site_dir))):
+                    directory = os.path.join(self.root, site_dir, date_dir)
+                    parts = sorted(
+                        os.path.join(directory, name) for name in os.listdir(directory) if name.endswith(".parquet")
+                    )
+                    if len(parts) < min_files:
+                        continue
+
+                    latest = {}
+                    for part in parts:
+                        for row in pq.read_table(part).to_pylist():
+                            key = row["job_url"] or tuple(row.values())
+                            latest[key] = row
+                    table = pa.Table.from_pylist(list(latest.values()), schema=job_schema())
+                    merged = self._write_table(table, directory, "compacted")
+                    for part in parts:
+                        os.remove(part)
+                    compacted += 1
+                    logger.info(f"Compacted {len(parts)} file(s) into {merged} ({table.num_rows} row(s))")
+        return compacted
+
+
+def read_jobs(columns=None, sites=None, since=None, root=PARQUET_DIR):
+    # Only the requested columns and partitions are read from disk
+    if pa is None:
+        raise RuntimeError("pyarrow is required to read the Parquet output")
+    dataset = ds.dataset(root, format="parquet", partitioning="hive")
+    condition = None
+    if sites:
+        condition = ds.field("site").isin(list(sites))
+    if since:
+        after = ds.field("run_date") >= str(since)
+        condition = after if condition is None else condition & after
+    return dataset.to_table(columns=columns, filter=condition)
@@ -0,0 +1,392 @@
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# --- Configuration ---
+DEFAULT_JOBS = 120
+DEFAULT_LATENCY = 0.05  # seconds added to every response
+DEFAULT_JITTER = 0.02  # +/- seconds of random spread on top of the latency
+
+KINDS = ["Microsoft Dynamics", "Power Platform", "Dynamics 365 Finance"]
+LOCATIONS = ["London", "Manchester", "Amsterdam", "Hyderabad", "Chicago", "Remote"]
+LEVELS = ["Associate", "Consultant", "Senior Consultant", "Manager"]
+WORDS = (
+    "design build deliver client solution platform finance supply chain data integration "
+    "power apps automate dataverse azure team lead stakeholder requirement workshop"
+).split()
+
+
+# --- Synthetic jobs ---
+# Deterministic for a given count, so every benchmark run sees the same boards.
+# Keyword matches overlap the way the live searches do: most jobs match one
+# of the two search keywords, about a third match both.
+def make_jobs(count, seed=7):
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(1, count + 1):
+        kind = KINDS[i % len(KINDS)]
+        locations = rng.sample(LOCATIONS, rng.choice([1, 1, 2]))
+        jobs.append(
+            {
+                "id": 1000 + i,
+                "title": f"{kind} {LEVELS[i % len(LEVELS)]} {i}",
+                "slug": f"{kind.lower().replace(' ', '-')}-{i}",
+                "level": LEVELS[i % len(LEVELS)],
+                "locations": locations,
+                "salary": f"£{40 + i % 50},000 - £{60 + i % 50},000",
+                "role_type": "Permanent" if i % 4 else "Contract",
+                "posted": f"2025-06-{1 + i % 28:02d}",
+                "bullets": [" ".join(rng.choices(WORDS, k=12)).capitalize() + "." for _ in range(4)],
+                "description": " ".join(rng.choices(WORDS, k=90)).capitalize() + ".",
+                "keywords": {"Microsoft Dynamics"} if i % 3 == 1 else {"Power Platform"} if i % 3 == 2 else set(KINDS),
+            }
+        )
+    return jobs
+
+
+def search(jobs, keyword):
+    if not keyword:
+        return jobs
+    return [job for job in jobs if keyword in job["keywords"]]
+
+
+def page_count(items, size):
+    return max(math.ceil(items / size), 1)
+
+
+def page_of(items, page, size):
+    return items[(page - 1) * size:page * size], page_count(len(items), size)
+
+
+def html_page(body, title="Jobs"):
+    return f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{escape(title)}</title></head><body>{body}</body></html>"
+
+
+# --- Boards ---
+# One board per site shape. handle() returns (status, content type, body);
+# unknown paths are a 404 like on the live sites.
+class Board:
+    name = "board"
+
+    def __init__(self, jobs):
+        self.jobs = jobs
+        self.by_id = {str(job["id"]): job for job in jobs}
+
+    def handle(self, method, path, query, body):
+        return 404, "text/plain", "not found"
+
+
+class HsoBoard(Board):
+    # Server-rendered vacancies list: a GET form for the search and a second
+    # form whose circle-arrow buttons submit the previous / next page
+    name = "hso"
+    PAGE_SIZE = 12
+
+    def card(self, job):
+        locations = "".join(f"<span>{escape(loc)}</span>" for loc in job["locations"])
+        return (
+            '<article class="card card--text"><div class="card--text__content">'
+            f'<h3 class="h4">{escape(job["title"])}</h3>'
+            f'<div class="text-tags__row--cyan">{locations}</div>'
+            f'<p class="line-clamp-5">{escape(job["description"])}</p>'
+            f'<a class="btn btn--line btn--full" href="/careers/vacancies/{job["slug"]}/">Read more</a>'
+            "</div></article>"
+        )
+
+    def handle(self, method, path, query, body):
+        if not path.startswith("/careers/vacancies"):
+            return super().handle(method, path, query, body)
+        keyword = query.get("searchTerm", [""])[0]
+        page = int(query.get("page", ["1"])[0])
+        jobs, pages = page_of(search(self.jobs, keyword), page, self.PAGE_SIZE)
+        arrow = '<svg><use href="/dist/icons.svg#circle-arrow"></use></svg>'
+        prev_disabled = " disabled" if page <= 1 else ""
+        next_disabled = " disabled" if page >= pages else ""
+        return 200, "text/html", html_page(
+            '<form method="get" action="/careers/vacancies/">'
+            f'<input type="text" name="searchTerm" value="{escape(keyword)}"></form>'
+            f'<section class="vacancies">{"".join(self.card(job) for job in jobs)}</section>'
+            '<form method="get" action="/careers/vacancies/" class="pagination">'
+            f'<input type="hidden" name="searchTerm" value="{escape(keyword)}">'
+            f'<button class="btn btn--icon btn--rotated" type="submit" name="page" value="{page - 1}"{prev_disabled}>{arrow}</button>'
+            f'<button class="btn btn--icon" type="submit" name="page" value="{page + 1}"{next_disabled}>{arrow}</button>'
+            "</form>",
+            "Vacancies",
+        )
+
+
+class WorkdayBoard(Board):
+    # The cxs JSON API behind a Workday careers site
+    name = "rsm"
+    PREFIX = "/wday/cxs/rsm/RSMCareers"
+
+    def external_path(self, job):
+        return f"/job/{job['locations'][0]}/{job['slug']}_JR{job['id']}"
+
+    def handle(self, method, path, query, body):
+        if method == "POST" and path == f"{self.PREFIX}/jobs":
+            request = json.loads(body or "{}")
+            matches = search(self.jobs, request.get("searchText", ""))
+            offset, limit = int(request.get("offset", 0)), int(request.get("limit", 20))
+            postings = [
+                {
+                    "title": job["title"],
+                    "externalPath": self.external_path(job),
+                    "locationsText": job["locations"][0] if len(job["locations"]) == 1 else f"{len(job['locations'])} Locations",
+                    "bulletFields": [f"JR{job['id']}", job["level"]],
+                }
+                for job in matches[offset:offset + limit]
+            ]
+            # Like the real endpoint, only the first page carries the total
+            total = len(matches) if offset == 0 else 0
+            return 200, "application/json", json.dumps({"total": total, "jobPostings": postings})
+
+        match = re.fullmatch(rf"{self.PREFIX}/job/[^/]+/[^/]+_JR(\d+)", path)
+        if method == "GET" and match and match.group(1) in self.by_id:
+            job = self.by_id[match.group(1)]
+            description = f"<p>{escape(job['description'])}</p><ul>{''.join(f'<li>{escape(b)}</li>' for b in job['bullets'])}</ul>"
+            return 200, "application/json", json.dumps(
+                {
+                    "jobPostingInfo": {
+                        "title": job["title"],
+                        "location": job["locations"][0],
+                        "additionalLocations": job["locations"][1:],
+                        "jobReqId": f"JR{job['id']}",
+                        "jobDescription": description,
+                    }
+                }
+            )
+        return super().handle(method, path, query, body)
+
+
+class OracleBoard(Board):
+    # Oracle HCM Candidate Experience REST resources
+    name = "faeya"
+    PREFIX = "/hcmRestApi/resources/latest"
+
+    def handle(self, method, path, query, body):
+        finder = query.get("finder", [""])[0]
+        if path == f"{self.PREFIX}/recruitingCEJobRequisitions":
+            keyword = re.search(r'keyword="([^"]*)"', finder)
+            limit = re.search(r"limit=(\d+)", finder)
+            offset = re.search(r"offset=(\d+)", finder)
+            matches = search(self.jobs, keyword.group(1) if keyword else "")
+            offset = int(offset.group(1)) if offset else 0
+            limit = int(limit.group(1)) if limit else 25
+            requisitions = [
+                {"Id": str(job["id"]), "Title": job["title"], "PrimaryLocation": job["locations"][0]}
+                for job in matches[offset:offset + limit]
+            ]
+            return 200, "application/json", json.dumps(
+                {"items": [{"TotalJobsCount": len(matches), "requisitionList": requisitions}]}
+            )
+
+        if path == f"{self.PREFIX}/recruitingCEJobRequisitionDetails":
+            job_id = re.search(r'Id="([^"]*)"', finder)
+            job = self.by_id.get(job_id.group(1) if job_id else "")
+            if not job:
+                return 200, "application/json", json.dumps({"items": []})
+            low, high = job["salary"].split(" - ")
+            return 200, "application/json", json.dumps(
+                {
+                    "items": [
+                        {
+                            "Id": str(job["id"]),
+                            "Title": job["title"],
+                            "Category": job["role_type"],
+                            "PrimaryLocation": job["locations"][0],
+                            "secondaryLocations": [{"Name": loc} for loc in job["locations"][1:]],
+                            "WorkplaceType": "Hybrid",
+                            "ExternalDescriptionStr": f"<p>{escape(job['description'])}</p>"
+                            f"<ul>{''.join(f'<li>{escape(b)}</li>' for b in job['bullets'])}</ul>",
+                            "requisitionFlexFields": [
+                                {"Prompt": "Minimum Salary", "Value": low},
+                                {"Prompt": "Maximum Salary", "Value": high},
+                            ],
+                        }
+                    ]
+                }
+            )
+        return super().handle(method, path, query, body)
+
+
+class NextJsBoard(Board):
+    # NigelFrank-style Next.js listing: __NEXT_DATA__ in the HTML plus the
+    # /_next/data/<buildId>/ JSON route for client-side navigation
+    name = "nigelfrank"
+    PAGE_SIZE = 20
+    BUILD_ID = "mock-build"
+
+    def page_props(self, query):
+        page = int(query.get("page", ["1"])[0] or 1)
+        jobs, pages = page_of(self.jobs, page, self.PAGE_SIZE)
+        results = [
+            {
+                "id": job["id"],
+                "title": job["title"],
+                "slug": job["slug"],
+                "location": ", ".join(job["locations"]),
+                "salary": job["salary"],
+                "jobType": job["role_type"],
+                "product": job["level"],
+                "description": f"<p>{escape(job['description'])}</p>",
+            }
+            for job in jobs
+        ]
+        return {"jobs": {"results": results, "page": page, "totalPages": pages}}
+
+    def handle(self, method, path, query, body):
+        if path == "/microsoft-jobs":
+            next_data = {"buildId": self.BUILD_ID, "props": {"pageProps": self.page_props(query)}}
+            return 200, "text/html", html_page(
+                '<div id="__next"><div><div></div><div><div><div></div><div>Jobs</div></div></div></div></div>'
+                f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script>',
+                "Microsoft jobs",
+            )
+        if path == f"/_next/data/{self.BUILD_ID}/microsoft-jobs.json":
+            return 200, "application/json", json.dumps({"pageProps": self.page_props(query)})
+        return super().handle(method, path, query, body)
+
+
+class JobManagerBoard(Board):
+    # WordPress WP Job Manager: /jobs/page/<n>/ listings and one page per job
+    name = "conspicuous"
+    PAGE_SIZE = 10
+
+    def handle(self, method, path, query, body):
+        match = re.fullmatch(r"/jobs/(?:page/(\d+)/)?", path)
+        if match:
+            page = int(match.group(1) or 1)
+            jobs, pages = page_of(self.jobs, page, self.PAGE_SIZE)
+            items = "".join(
+                f'<li class="job-item"><a href="/job/{job["slug"]}/"><h3>{escape(job["title"])}</h3>'
+                f'<div class="job-location">{escape(", ".join(job["locations"]))}</div>'
+                f'<div class="job-date">{job["posted"]}</div></a></li>'
+                for job in jobs
+            )
+            pagination = (
+                f'<nav class="job-manager-pagination"><ul><li><a href="/jobs/page/{page + 1}/">→</a></li></ul></nav>'
+                if page < pages
+                else ""
+            )
+            return 200, "text/html", html_page(f'<ul class="job_listings">{items}</ul>{pagination}', "Jobs")
+
+        match = re.fullmatch(r"/job/([^/]+)/", path)
+        job = next((job for job in self.jobs if match and job["slug"] == match.group(1)), None)
+        if job:
+            return 200, "text/html", html_page(
+                f'<h1>{escape(job["title"])}</h1><div class="job-description">{escape(job["description"])}</div>',
+                job["title"],
+            )
+        return super().handle(method, path, query, body)
+
+
+BOARDS = {board.name: board for board in (HsoBoard, WorkdayBoard, OracleBoard, NextJsBoard, JobManagerBoard)}
+
+
+# --- Server ---
+# One ThreadingHTTPServer per board, each on its own port, so every site is
+# served from "/" exactly like the real one. Each response waits the
+# configured latency first, and every request is recorded for the benchmark.
+class MockSite:
+    def __init__(self, board, latency=DEFAULT_LATENCY, jitter=DEFAULT_JITTER, host="127.0.0.1", port=0):
+        self.board = board
+        self.latency = latency
+        self.jitter = jitter
+        self.requests = []
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer((host, port), self._handler_class())
+        self.server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _serve(self, method):
+                arrived = time.perf_counter()
+                parts = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length).decode("utf-8") if length else ""
+                delay = site.latency + random.uniform(-site.jitter, site.jitter)
+                if delay > 0:
+                    time.sleep(delay)
+                status, content_type, text = site.board.handle(method, parts.path, parse_qs(parts.query), body)
+                data = text.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+                with site._lock:
+                    site.requests.append((arrived, time.perf_counter() - arrived, status, parts.path))
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name=f"mock-{self.board.name}", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def reset(self):
+        with self._lock:
+            self.requests = []
+
+    def page_requests(self):
+        # Static assets are not pages; everything the boards answer is
+        with self._lock:
+            return [r for r in self.requests if not r[3].startswith(("/dist/", "/favicon"))]
+
+
+def start_sites(names=None, jobs=DEFAULT_JOBS, latency=DEFAULT_LATENCY, jitter=DEFAULT_JITTER):
+    job_list = make_jobs(jobs)
+    return {
+        name: MockSite(board(job_list), latency=latency, jitter=jitter).start()
+        for name, board in BOARDS.items()
+        if not names or name in names
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve synthetic job boards shaped like the scraped sites")
+    parser.add_argument("--sites", nargs="*", choices=list(BOARDS), help="boards to serve (default: all)")
+    parser.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="jobs on every board")
+    parser.add_argument("--latency", type=float, default=DEFAULT_LATENCY, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=DEFAULT_JITTER, help="random +/- seconds on top of the latency")
+    args = parser.parse_args()
+
+    sites = start_sites(args.sites, args.jobs, args.latency, args.jitter)
+    for name, site in sites.items():
+        print(f"  {name:<12} {site.base_url}")
+    print("Serving, Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        for site in sites.values():
+            site.stop()
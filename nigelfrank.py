@@ -1,4 +1,5 @@
-import logging
+import argparse
+import threading
 import pandas as pd
 import time
 from bs4 import BeautifulSoup
@@ -9,96 +10,184 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, WebDriverException
 from tqdm import tqdm
 import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+from checkpoint import CheckpointJournal
+from job_sink import ParquetSink
+from driver_factory import create_chrome
+from driver_pool import DriverPool
+from http_client import create_session
+from page_cache import PageCache
+from pacing import DomainRateLimiter
+from parsers import find_job_list, job_record_from_json, parse_next_data
+from scrape_log import setup_site_logging
+from tracing import Tracer, span
 
 # --- Set up logging ---
-logging.basicConfig(
-    filename='nigelfrank_scraper.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
-
-console = logging.StreamHandler()
-console.setLevel(logging.INFO)
-formatter = logging.Formatter('%(levelname)s - %(message)s')
-console.setFormatter(formatter)
-logging.getLogger('').addHandler(console)
+# JSON lines in log/nigelfrank.jsonl, written by a background thread (see scrape_log.py)
+logger = setup_site_logging("nigelfrank")
+
+# --- Configuration ---
+DRIVER_POOL_SIZE = 1
+WORKERS = 1
+MIN_REQUEST_INTERVAL = 1.0  # seconds between requests to nigelfrank.com
+ENGINE = "http"  # "http" reads the Next.js data payload, "selenium" drives Chrome
+BASE_URL = "https://www.nigelfrank.com"
+USE_PAGE_CACHE = True  # serve recently fetched pages from the on-disk cache
+
+# --- Driver setup ---
+def create_driver(tracer=None):
+    options = webdriver.ChromeOptions()
+    options.add_argument('--ignore-certificate-errors')
+    options.add_argument('--ignore-ssl-errors')
+    options.add_argument("--headless=new")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    with span(tracer, "webdriver.Chrome", "browser start"):
+        return create_chrome(options, "nigelfrank", undetected=False)
 
 # --- Scraper function ---
-def nigelfrank_scraper(url, max_retries=3):
+def nigelfrank_scraper(url, pool, max_retries=3, limiter=None, cache=None, tracer=None):
+    def load_page():
+        with pool.lease() as driver:
+            if limiter:
+                limiter.wait(url)
+            with span(tracer, "driver.get", "navigate"):
+                driver.get(url)
+
+            with span(tracer, "job list", "wait"):
+                WebDriverWait(driver, 15).until(
+                    EC.visibility_of_element_located((By.XPATH, '//*[@id="__next"]/div/div[1]/div[2]/div/div[2]'))
+                )
+            return driver.page_source
+
     retries = 0
     while retries < max_retries:
         try:
-            options = webdriver.ChromeOptions()
-            options.add_argument('--ignore-certificate-errors')
-            options.add_argument('--ignore-ssl-errors')
-            options.add_argument("--headless=new")
-            options.add_argument("--disable-blink-features=AutomationControlled")
-
-            driver = webdriver.Chrome(options=options)
-            driver.get(url)
-
-            WebDriverWait(driver, 15).until(
-                EC.visibility_of_element_located((By.XPATH, '//*[@id="__next"]/div/div[1]/div[2]/div/div[2]'))
-            )
-
-            soup = BeautifulSoup(driver.page_source, 'lxml')
-            driver.quit()
-
-            job_list = soup.find_all('div', class_="sc-AykKG sc-fzXfQW BqA-ds")
-            logging.info(f"[{url}] Jobs found: {len(job_list)}")
-
-            job_data = []
-            for job in job_list:
-                link_em = job.find('a', class_="sc-AykKE fwNdOp")
-                job_url = "https://www.nigelfrank.com" + link_em['href'] if link_em and link_em.get('href') else None
-                job_id = job_url.split("/")[-2] if job_url else None
-
-                title = job.find('h3', class_="sc-AykKD fECRJb jobTitle")
-                location = job.find('p', class_="location")
-
-                info_list_em = job.find('ul', class_="particulars")
-                salary = role_type = level = None
-                if info_list_em:
-                    info_em = info_list_em.find_all('li')
-                    if len(info_em) > 0: salary = info_em[0].get_text(strip=True)
-                    if len(info_em) > 1: role_type = info_em[1].get_text(strip=True)
-                    if len(info_em) > 2: level = info_em[2].get_text(strip=True).split(":")[-1].strip()
-
-                job_desc_em = job.find("div", class_="jobDescription")
-                description = job_desc_em.get_text(strip=True) if job_desc_em else ""
-
-                data = {
-                    "title": title.get_text(strip=True) if title else None,
-                    "job_id": job_id,
-                    "job_url": job_url,
-                    "location": location.get_text(strip=True) if location else None,
-                    "salary": salary,
-                    "role_type": role_type,
-                    "level": level,
-                    "description": description
-                }
-
-                job_data.append(data)
-            return job_data
+            page_source = cache.read_through(url, load_page, variant="selenium") if cache else load_page()
+            return extract_jobs(url, page_source, tracer)
 
         except (TimeoutException, WebDriverException) as e:
             retries += 1
-            logging.warning(f"Retry {retries}/{max_retries} for {url} due to error: {e}")
-            time.sleep(2)  # Wait a bit before retrying
-            try:
-                driver.quit()
-            except:
-                pass
+            logger.warning(f"Retry {retries}/{max_retries} for {url} due to error: {e}")
+            with span(tracer, "retry delay", "sleep"):
+                time.sleep(2)  # Wait a bit before retrying
         except Exception as e:
-            logging.error(f"Failed scraping {url}: {e}")
-            try:
-                driver.quit()
-            except:
-                pass
-            return []
+            logger.error(f"Failed scraping {url}: {e}")
+            return None
+
+    # None (not []) so the page is not checkpointed as done and --resume retries it
+    logger.error(f"Max retries exceeded for {url}")
+    return None
+
+
+def extract_jobs(url, page_source, tracer=None):
+    with span(tracer, "parse page", "extract"):
+        soup = BeautifulSoup(page_source, 'lxml')
+
+        job_list = soup.find_all('div', class_="sc-AykKG sc-fzXfQW BqA-ds")
+        logger.info(f"[{url}] Jobs found: {len(job_list)}")
+
+        job_data = []
+        for job in job_list:
+            link_em = job.find('a', class_="sc-AykKE fwNdOp")
+            job_url = "https://www.nigelfrank.com" + link_em['href'] if link_em and link_em.get('href') else None
+            job_id = job_url.split("/")[-2] if job_url else None
+
+            title = job.find('h3', class_="sc-AykKD fECRJb jobTitle")
+            location = job.find('p', class_="location")
+
+            info_list_em = job.find('ul', class_="particulars")
+            salary = role_type = level = None
+            if info_list_em:
+                info_em = info_list_em.find_all('li')
+                if len(info_em) > 0: salary = info_em[0].get_text(strip=True)
+                if len(info_em) > 1: role_type = info_em[1].get_text(strip=True)
+                if len(info_em) > 2: level = info_em[2].get_text(strip=True).split(":")[-1].strip()
+
+            job_desc_em = job.find("div", class_="jobDescription")
+            description = job_desc_em.get_text(strip=True) if job_desc_em else ""
+
+            data = {
+                "title": title.get_text(strip=True) if title else None,
+                "job_id": job_id,
+                "job_url": job_url,
+                "location": location.get_text(strip=True) if location else None,
+                "salary": salary,
+                "role_type": role_type,
+                "level": level,
+                "description": description
+            }
+
+            job_data.append(data)
+        return job_data
+
+# --- HTTP engine (Next.js data payload) ---
+# NigelFrank renders its listings from the JSON Next.js embeds in the page as
+# __NEXT_DATA__. Once the build id is known, later pages are fetched straight
+# from the matching /_next/data/<buildId>/... JSON route, so no HTML at all.
+# The payload-to-record mapping lives in parsers.py, shared with the offline
+# parser benchmark.
+class NextDataClient:
+    def __init__(self, session=None, base_url=None, cache=None, limiter=None):
+        self.session = session or create_session()
+        self.base_url = base_url or BASE_URL
+        self.cache = cache
+        self.limiter = limiter
+        self.build_id = None
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout=15):
+        if self.cache:
+            return self.cache.fetch(self.session, url, variant="http", limiter=self.limiter, timeout=timeout)
+        if self.limiter:
+            self.limiter.wait(url)
+        return self.session.get(url, timeout=timeout)
+
+    def data_url(self, url):
+        parts = urlsplit(url)
+        path = parts.path.rstrip("/") or "/index"
+        data_url = f"{self.base_url}/_next/data/{self.build_id}{path}.json"
+        return f"{data_url}?{parts.query}" if parts.query else data_url
 
-    logging.error(f"Max retries exceeded for {url}")
-    return []
+    def page_props(self, url, timeout=15):
+        if self.build_id:
+            response = self.get(self.data_url(url), timeout=timeout)
+            if response.ok:
+                return response.json().get("pageProps", {})
+            # A 404 here usually means the site was redeployed with a new build id
+            logger.info(f"_next/data miss ({response.status_code}) for {url}, refetching HTML")
+
+        response = self.get(url, timeout=timeout)
+        response.raise_for_status()
+        next_data = parse_next_data(response.text)
+        if next_data is None:
+            return None
+        with self._lock:
+            self.build_id = next_data.get("buildId") or self.build_id
+        return next_data.get("props", {}).get("pageProps", {})
+
+
+def nigelfrank_http_scraper(url, client, tracer=None):
+    # Returns None when the page has no usable data payload so the caller can
+    # fall back to the Selenium engine.
+    try:
+        with span(tracer, "page props", "http"):
+            page_props = client.page_props(url)
+    except Exception as e:
+        logger.warning(f"HTTP engine failed for {url}: {e}")
+        return None
+    if page_props is None:
+        logger.warning(f"No __NEXT_DATA__ payload found for {url}")
+        return None
+
+    job_list = find_job_list(page_props)
+    if job_list is None:
+        logger.warning(f"No job list found in Next.js data for {url}")
+        return None
+
+    logger.info(f"[{url}] Jobs found: {len(job_list)}")
+    with span(tracer, "job records", "extract"):
+        return [job_record_from_json(job, BASE_URL) for job in job_list]
 
 # --- Paginated URLs ---
 start_urls = [
@@ -108,23 +197,85 @@ start_urls = [
 
 # --- CSV Setup ---
 csv_file = "nigelfrank.csv"
-file_exists = os.path.exists(csv_file)
-
-# Write header only once
-if not file_exists:
-    pd.DataFrame(columns=[
-        "title", "job_id", "job_url", "location", "salary", "role_type", "level", "description"
-    ]).to_csv(csv_file, index=False)
-
-# --- Main Loop with tqdm ---
-total_scraped = 0
-for url in tqdm(start_urls, desc="Scraping NigelFrank pages"):
-    result = nigelfrank_scraper(url)
-    if result:
-        df = pd.DataFrame(result)
-        df.to_csv(csv_file, mode='a', header=False, index=False)
-        total_scraped += len(result)
-    time.sleep(1)
-
-logging.info(f"✅ Done scraping. Total jobs scraped: {total_scraped}")
-print(f"\n✅ Finished! Total jobs scraped: {total_scraped}. Saved to {csv_file}")
+CSV_COLUMNS = [
+    "title", "job_id", "job_url", "location", "salary", "role_type", "level", "description"
+]
+
+def main(workers=WORKERS, min_interval=MIN_REQUEST_INTERVAL, engine=ENGINE, use_cache=USE_PAGE_CACHE, resume=False):
+    # One timeline per run, saved under log/ when the run finishes
+    tracer = Tracer("nigelfrank")
+
+    # Write header only once
+    if not os.path.exists(csv_file):
+        pd.DataFrame(columns=CSV_COLUMNS).to_csv(csv_file, index=False)
+
+    # --- Checkpointing ---
+    # Pages already committed by an interrupted run are skipped with --resume
+    journal = CheckpointJournal(csv_file).start(resume=resume)
+    pages = [(page, url) for page, url in enumerate(start_urls, 1) if not journal.is_done(page)]
+    if resume:
+        logger.info(f"{len(pages)} of {len(start_urls)} page(s) left to scrape")
+
+    limiter = DomainRateLimiter(min_interval, tracer=tracer)
+    sink = ParquetSink()
+    pool_size = max(DRIVER_POOL_SIZE, workers)
+
+    cache = PageCache() if use_cache else None
+    client = NextDataClient(create_session(pool_size=workers), cache=cache, limiter=limiter) if engine == "http" else None
+
+    def scrape_page(page, url):
+        with tracer.span(f"page {page}", "page"):
+            if client:
+                result = nigelfrank_http_scraper(url, client, tracer)
+                if result is not None:
+                    return result
+                logger.info(f"Falling back to Selenium for {url}")
+            return nigelfrank_scraper(url, pool, limiter=limiter, cache=cache, tracer=tracer)
+
+    # --- Main Loop with tqdm ---
+    # Each worker leases its own browser; executor.map yields results in page
+    # order, so the CSV is appended deterministically even when pages finish
+    # out of order. With the HTTP engine the pool stays cold and only starts
+    # Chrome if a page needs the Selenium fallback.
+    total_scraped = 0
+    pool = DriverPool(lambda: create_driver(tracer), size=pool_size)
+    if engine != "http" and pages:
+        pool.warm()
+    with tracer.span("nigelfrank run", "run"), pool:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(lambda page: scrape_page(*page), pages)
+            for (page, url), result in tqdm(zip(pages, results), total=len(pages), desc="Scraping NigelFrank pages"):
+                if result is None:
+                    continue
+                # Each page lands in the CSV as one write, then gets journalled
+                with tracer.span(f"commit page {page}", "write", rows=len(result)):
+                    df = pd.DataFrame(result, columns=CSV_COLUMNS)
+                    journal.commit_page(page, df.to_csv(header=False, index=False) if result else "", len(result))
+                    sink.write("nigelfrank", result)
+                total_scraped += len(result)
+
+        # One part file per page is cheap to append but slow to read back
+        with tracer.span("compact parquet", "write"):
+            sink.compact("nigelfrank")
+    if cache:
+        logger.info(f"Page cache: {cache.stats()}")
+        cache.close()
+    failed = len(start_urls) - len(journal.completed)
+    if failed:
+        logger.warning(f"{failed} page(s) failed; rerun with --resume to retry only those")
+    logger.info(f"🧭 Phases: {tracer.summary()}")
+    logger.info(f"🗺️ Trace saved to {tracer.export()}")
+    logger.info(f"✅ Done scraping. Total jobs scraped: {total_scraped}")
+    print(f"\n✅ Finished! Total jobs scraped: {total_scraped}. Saved to {csv_file}")
+    return total_scraped
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scrape NigelFrank Microsoft job listings")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="number of concurrent workers")
+    parser.add_argument("--min-interval", type=float, default=MIN_REQUEST_INTERVAL, help="minimum seconds between requests to the site")
+    parser.add_argument("--engine", choices=["http", "selenium"], default=ENGINE, help="page fetch engine; http falls back to selenium per page")
+    parser.add_argument("--no-cache", action="store_true", help="always fetch pages from the site instead of the local page cache")
+    parser.add_argument("--resume", action="store_true", help="skip pages committed by a previous interrupted run")
+    args = parser.parse_args()
+    main(workers=args.workers, min_interval=args.min_interval, engine=args.engine, use_cache=not args.no_cache, resume=args.resume)
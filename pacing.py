@@ -0,0 +1,144 @@
+import random
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from tracing import span
+
+
+def domain_of(url):
+    return urlparse(url).netloc.lower()
+
+
+# --- Per-domain rate limit ---
+# Spaces out requests to the same domain by at least `min_interval` seconds,
+# no matter how many workers are asking. Each caller reserves the next free
+# slot under the lock and then sleeps outside of it.
+class DomainRateLimiter:
+    def __init__(self, min_interval=1.0, tracer=None):
+        self.min_interval = min_interval
+        self.tracer = tracer
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url):
+        domain = domain_of(url)
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(domain, now))
+            self._next_slot[domain] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            with span(self.tracer, "rate limit", "sleep", domain=domain):
+                time.sleep(delay)
+        return delay
+
+
+# --- Adaptive pacing ---
+# Token bucket per domain whose refill rate is divided by a backoff factor.
+# Every tracked request feeds its latency and outcome back in: errors raise
+# the backoff in proportion to the domain's recent error rate, responses much
+# slower than the domain's usual latency raise it, and healthy responses let
+# it decay back to 1. The error rate itself also slows the refill, so a site
+# that keeps failing stays slow even while some pages load quickly. Callers
+# then wait only for the next token instead of a fixed random sleep. With a
+# tracer, the time spent waiting shows up as "sleep" spans.
+class _DomainPace:
+    def __init__(self, burst):
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.backoff = 1.0
+        self.latency = None
+        self.baseline = None
+        self.error_rate = 0.0
+        self.requests = 0
+        self.errors = 0
+        self.waited = 0.0
+
+
+class AdaptivePacer:
+    def __init__(self, rate=0.5, burst=2, max_backoff=16.0, slow_factor=2.0, alpha=0.3, error_penalty=4.0, tracer=None):
+        self.rate = rate
+        self.burst = burst
+        self.max_backoff = max_backoff
+        self.error_penalty = error_penalty
+        self.slow_factor = slow_factor
+        self.alpha = alpha
+        self.tracer = tracer
+        self._domains = {}
+        self._lock = threading.Lock()
+
+    def _pace(self, domain):
+        if domain not in self._domains:
+            self._domains[domain] = _DomainPace(self.burst)
+        return self._domains[domain]
+
+    def _slowdown(self, pace):
+        # At error_penalty=4 a 50% error rate means a third of the normal rate
+        return min(self.max_backoff, pace.backoff * (1 + self.error_penalty * pace.error_rate))
+
+    def wait(self, url):
+        domain = domain_of(url)
+        with self._lock:
+            pace = self._pace(domain)
+            now = time.monotonic()
+            rate = self.rate / self._slowdown(pace)
+            pace.tokens = min(self.burst, pace.tokens + (now - pace.updated) * rate)
+            pace.updated = now
+            # Reserve a token now; a negative balance is this caller's place in line
+            pace.tokens -= 1
+            delay = -pace.tokens / rate if pace.tokens < 0 else 0.0
+            pace.waited += delay
+        if delay > 0:
+            with span(self.tracer, "pacing wait", "sleep", domain=domain):
+                time.sleep(delay)
+        return delay
+
+    def record(self, url, latency, ok=True):
+        with self._lock:
+            pace = self._pace(domain_of(url))
+            pace.requests += 1
+            pace.error_rate = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * pace.error_rate
+            if not ok:
+                pace.errors += 1
+                # An isolated failure barely moves it; a run of them doubles it
+                pace.backoff = min(self.max_backoff, pace.backoff * (1 + pace.error_rate))
+                return
+
+            pace.latency = latency if pace.latency is None else self.alpha * latency + (1 - self.alpha) * pace.latency
+            if pace.baseline is not None and latency > self.slow_factor * pace.baseline:
+                pace.backoff = min(self.max_backoff, pace.backoff * 1.5)
+            else:
+                pace.backoff = max(1.0, pace.backoff * 0.8)
+            # The baseline follows the domain's normal latency slowly so a
+            # single slow page does not redefine "normal"
+            pace.baseline = latency if pace.baseline is None else 0.1 * latency + 0.9 * pace.baseline
+
+    @contextmanager
+    def track(self, url, expected=()):
+        # Exceptions of the `expected` types (e.g. the timeout that marks the
+        # last results page) are part of normal flow and are not counted
+        self.wait(url)
+        start = time.monotonic()
+        try:
+            yield
+        except expected:
+            raise
+        except Exception:
+            self.record(url, time.monotonic() - start, ok=False)
+            raise
+        self.record(url, time.monotonic() - start, ok=True)
+
+    def pause(self, low=0.1, high=0.4):
+        # Short human-like gap between keystrokes; not a politeness delay
+        with span(self.tracer, "pause", "sleep"):
+            time.sleep(random.uniform(low, high))
+
+    def summary(self):
+        with self._lock:
+            return "; ".join(
+                f"{domain}: {pace.requests} req, {pace.errors} err ({pace.error_rate:.0%} recent), "
+                f"avg {pace.latency or 0:.2f}s, backoff x{self._slowdown(pace):.1f}, waited {pace.waited:.1f}s"
+                for domain, pace in self._domains.items()
+            )
@@ -0,0 +1,269 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = "cache"
+DEFAULT_TTL = 60 * 60  # seconds
+MAX_CACHE_BYTES = 500 * 1024 * 1024
+
+# Per-site freshness; anything not listed uses DEFAULT_TTL
+SITE_TTLS = {
+    "www.nigelfrank.com": 6 * 60 * 60,
+    "rsm.wd1.myworkdayjobs.com": 12 * 60 * 60,
+    "fa-eyau-saasfaprod1.fa.ocs.oraclecloud.com": 12 * 60 * 60,
+    "www.hso.com": 12 * 60 * 60,
+    "conspicuous.com": 12 * 60 * 60,
+}
+
+
+# --- Cached response ---
+# Just enough of the requests.Response surface for the scrapers' HTTP engines.
+class CachedResponse:
+    def __init__(self, url, status_code, text, from_cache):
+        self.url = url
+        self.status_code = status_code
+        self.text = text
+        self.from_cache = from_cache
+
+    @property
+    def ok(self):
+        # A 304 has no body of its own; it is only usable with a cached copy
+        return self.status_code < 400 and self.status_code != 304
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if not self.ok:
+            raise RuntimeError(f"HTTP {self.status_code} for {self.url}")
+
+
+# --- Page Cache ---
+# Bodies are stored once per content hash under cache/blobs; a small SQLite
+# index maps (url, request variant) to a body plus its validators and access
+# time. Fresh entries are served straight from disk, stale ones are
+# revalidated with If-None-Match / If-Modified-Since, and the least recently
+# used entries are evicted once the cache grows past max_bytes.
+class PageCache:
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES, site_ttls=None, default_ttl=DEFAULT_TTL):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.max_bytes = max_bytes
+        self.site_ttls = SITE_TTLS if site_ttls is None else site_ttls
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.blob_dir, exist_ok=True)
+        self._db = sqlite3.connect(os.path.join(cache_dir, "index.sqlite3"), check_same_thread=False)
+        self._db.execute(
+            """CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                variant TEXT NOT NULL,
+                blob TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                status INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )"""
+        )
+        self._db.commit()
+
+    # --- keys and storage ---
+    @staticmethod
+    def make_key(url, variant=""):
+        return hashlib.sha256(f"{variant}\n{url}".encode()).hexdigest()
+
+    def ttl_for(self, url):
+        return self.site_ttls.get(urlparse(url).netloc.lower(), self.default_ttl)
+
+    def _blob_path(self, blob):
+        return os.path.join(self.blob_dir, blob[:2], blob)
+
+    def _read_blob(self, blob):
+        try:
+            with open(self._blob_path(blob), encoding="utf-8") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_blob(self, text):
+        data = text.encode("utf-8")
+        blob = hashlib.sha256(data).hexdigest()
+        path = self._blob_path(blob)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        return blob, len(data)
+
+    def _lookup(self, key):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT blob, status, etag, last_modified, fetched_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+        if not row:
+            return None
+        return {"blob": row[0], "status": row[1], "etag": row[2], "last_modified": row[3], "fetched_at": row[4]}
+
+    def _touch(self, key, refreshed=False):
+        now = time.time()
+        with self._lock:
+            if refreshed:
+                self._db.execute("UPDATE entries SET accessed_at = ?, fetched_at = ? WHERE key = ?", (now, now, key))
+            else:
+                self._db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+            self._db.commit()
+
+    # --- public API ---
+    def get(self, url, variant="", allow_stale=False):
+        key = self.make_key(url, variant)
+        entry = self._lookup(key)
+        if not entry:
+            return None
+        if not allow_stale and time.time() - entry["fetched_at"] > self.ttl_for(url):
+            return None
+        text = self._read_blob(entry["blob"])
+        if text is None:
+            return None
+        self._touch(key)
+        return text
+
+    def put(self, url, text, variant="", status=200, etag=None, last_modified=None):
+        blob, size = self._write_blob(text)
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (self.make_key(url, variant), url, variant, blob, size, status, etag, last_modified, now, now),
+            )
+            self._db.commit()
+        self.evict()
+
+    def read_through(self, url, loader, variant=""):
+        # For browser-rendered pages: serve a fresh copy from disk, otherwise
+        # call loader() and store what it returns.
+        text = self.get(url, variant)
+        if text is not None:
+            self._count("hits")
+            return text
+        self._count("misses")
+        text = loader()
+        if text:
+            self.put(url, text, variant)
+        return text
+
+    def fetch(self, session, url, method="GET", variant="", limiter=None, **kwargs):
+        # HTTP read-through with conditional revalidation. The request method
+        # and body are part of the variant, so a POSTed search is cached per query.
+        # The rate limiter is only consulted when the network is actually used.
+        body = kwargs.get("json") or kwargs.get("data") or kwargs.get("params")
+        variant = f"{variant}|{method}|{json.dumps(body, sort_keys=True, default=str) if body else ''}"
+        key = self.make_key(url, variant)
+        entry = self._lookup(key)
+        cached_text = self._read_blob(entry["blob"]) if entry else None
+        if cached_text is None:
+            # An index row whose body was evicted is no better than no entry
+            entry = None
+
+        if entry and time.time() - entry["fetched_at"] <= self.ttl_for(url):
+            self._count("hits")
+            self._touch(key)
+            return CachedResponse(url, entry["status"], cached_text, from_cache=True)
+
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        if limiter:
+            limiter.wait(url)
+        response = session.request(method, url, headers=headers, **kwargs)
+        if response.status_code == 304:
+            if entry:
+                self._count("revalidated")
+                self._touch(key, refreshed=True)
+                return CachedResponse(url, entry["status"], cached_text, from_cache=True)
+            # Nothing on disk to revalidate against (e.g. the caller sent its
+            # own validators); ask again for the full body
+            for header in ("If-None-Match", "If-Modified-Since"):
+                headers.pop(header, None)
+            if limiter:
+                limiter.wait(url)
+            response = session.request(method, url, headers=headers, **kwargs)
+            if response.status_code == 304:
+                # Still no body; returned as a failed miss so callers never parse an empty 304
+                logger.warning(f"{url} answered 304 to an unconditional request")
+
+        self._count("misses")
+        if response.ok and response.status_code != 304:
+            self.put(
+                url,
+                response.text,
+                variant,
+                status=response.status_code,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return CachedResponse(url, response.status_code, response.text, from_cache=False)
+
+    def evict(self):
+        with self._lock:
+            total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = self._db.execute("SELECT key, blob, size FROM entries ORDER BY accessed_at").fetchall()
+            removed_blobs = set()
+            for key, blob, size in rows:
+                if total <= self.max_bytes:
+                    break
+                self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                total -= size
+                removed_blobs.add(blob)
+            # Content-addressed bodies may be shared; only drop unreferenced ones
+            for blob in removed_blobs:
+                still_used = self._db.execute("SELECT 1 FROM entries WHERE blob = ? LIMIT 1", (blob,)).fetchone()
+                if not still_used:
+                    try:
+                        os.remove(self._blob_path(blob))
+                    except OSError:
+                        pass
+            self._db.commit()
+        logger.info(f"Page cache evicted down to {total} bytes")
+
+    def _count(self, counter):
+        # fetch() runs on the API worker threads
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def stats(self):
+        return f"{self.hits} hits, {self.revalidated} revalidated, {self.misses} misses"
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def cached_get(cache, session, url, limiter=None, **kwargs):
+    # GET through the cache when one is configured, straight to the site otherwise
+    if cache:
+        return cache.fetch(session, url, limiter=limiter, **kwargs)
+    if limiter:
+        limiter.wait(url)
+    return session.get(url, **kwargs)
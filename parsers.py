@@ -0,0 +1,278 @@
+import json
+import re
+
+try:
+    from lxml import etree, html
+except ImportError:  # only needed when a parser runs; pip install lxml
+    etree = html = None
+
+# --- Offline HTML parsers ---
+# Browser-independent versions of the page reads the scrapers do through
+# Selenium. Each takes raw HTML (a saved fixture or driver.page_source) and
+# returns plain job records. XPath expressions are compiled once, on first
+# use, so a parse is one libxml2 tree build plus a handful of compiled lookups.
+
+
+def _xpath(expression):
+    compiled = []
+
+    def run(node):
+        if not compiled:
+            compiled.append(etree.XPath(expression))
+        return compiled[0](node)
+
+    return run
+
+
+def _document(page_html):
+    if html is None:
+        raise RuntimeError("lxml is required for the offline parsers (pip install lxml)")
+    return html.fromstring(page_html)
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+def _clean(text):
+    return " ".join(text.split()) if text else ""
+
+
+def _text(element):
+    return _clean(element.text_content()) if element is not None else ""
+
+
+def _first(elements):
+    return elements[0] if elements else None
+
+
+# --- Oracle HCM (faeya) search results, see jobslist.html ---
+FAEYA_RESULT_ITEMS = _xpath("//li[@data-qa='searchResultItem']")
+FAEYA_RESULT_LINK = _xpath(f".//a[{_has_class('job-list-item__link')}]/@href")
+FAEYA_RESULT_TITLE = _xpath(f".//span[{_has_class('job-tile__title')}]")
+FAEYA_RESULT_INFO = _xpath(f".//li[{_has_class('job-list-item__job-info-item')}]")
+FAEYA_INFO_LABEL = _xpath(f".//*[{_has_class('job-list-item__job-info-label')}]")
+FAEYA_INFO_VALUE = _xpath(f".//*[{_has_class('job-list-item__job-info-value')}]")
+FAEYA_RESULT_DESCRIPTION = _xpath(f".//p[{_has_class('job-list-item__description')}]")
+FAEYA_JOB_ID = re.compile(r"/job/([^/?]+)")
+
+
+def parse_faeya_results(page_html):
+    root = _document(page_html)
+    jobs = []
+    for item in FAEYA_RESULT_ITEMS(root):
+        url = _first(FAEYA_RESULT_LINK(item))
+        title = _text(_first(FAEYA_RESULT_TITLE(item)))
+        if not url or not title:
+            continue
+        info = {}
+        for field in FAEYA_RESULT_INFO(item):
+            label = _text(_first(FAEYA_INFO_LABEL(field)))
+            if label:
+                info[label] = _text(_first(FAEYA_INFO_VALUE(field)))
+        match = FAEYA_JOB_ID.search(url)
+        jobs.append(
+            {
+                "job_title": title,
+                "job_url": url,
+                "job_id": match.group(1) if match else "N/A",
+                "location": info.get("Locations", "N/A"),
+                "date_posted": info.get("Posting Dates", "N/A"),
+                "description": _text(_first(FAEYA_RESULT_DESCRIPTION(item))),
+            }
+        )
+    return jobs
+
+
+# --- Workday (rsm) posting and search bar, see jobpage.html / search.html ---
+# Every field sits under a data-automation-id, so one scan of the tree finds
+# them all instead of one full-document search per field
+WORKDAY_SECTIONS = _xpath("//*[@data-automation-id]")
+WORKDAY_VALUES = _xpath(".//dd")
+WORKDAY_PARAGRAPHS = _xpath(".//p")
+WORKDAY_FIELDS = {"time": "time_type", "postedOn": "posted_on", "requisitionId": "job_id"}
+WORKDAY_RESULT_COUNT = _xpath("//*[@data-uxi-number-job-results]/@data-uxi-number-job-results")
+
+
+def parse_rsm_posting(page_html):
+    # Same fields as scrape_rsm_detail: every location, and the first
+    # paragraph of the description with text in it
+    job = {
+        "title": None,
+        "location": "Unknown",
+        "description": "Not found",
+        "time_type": "Unknown",
+        "posted_on": "Unknown",
+        "job_id": "Unknown",
+    }
+    for section in WORKDAY_SECTIONS(_document(page_html)):
+        automation_id = section.get("data-automation-id")
+        if automation_id == "jobPostingHeader":
+            job["title"] = _text(section) or None
+        elif automation_id == "locations":
+            locations = [location for location in map(_text, WORKDAY_VALUES(section)) if location]
+            if locations:
+                job["location"] = ", ".join(locations)
+        elif automation_id in WORKDAY_FIELDS:
+            value = _text(_first(WORKDAY_VALUES(section)))
+            if value:
+                job[WORKDAY_FIELDS[automation_id]] = value
+        elif automation_id == "jobPostingDescription":
+            job["description"] = next((text for text in map(_text, WORKDAY_PARAGRAPHS(section)) if text), "Not found")
+    return job
+
+
+def parse_rsm_result_count(page_html):
+    count = _first(WORKDAY_RESULT_COUNT(_document(page_html)))
+    return int(count) if count and count.isdigit() else None
+
+
+# --- HSO vacancies list, same fields as HSO_CARD_SPEC ---
+HSO_CARDS = _xpath(f"//article[{_has_class('card')} and {_has_class('card--text')}]")
+HSO_CARD_TITLE = _xpath(f".//h3[{_has_class('h4')}]")
+HSO_CARD_LINK = _xpath(f".//a[{_has_class('btn--line')} and {_has_class('btn--full')}]/@href")
+HSO_CARD_LOCATIONS = _xpath(f".//div[{_has_class('text-tags__row--cyan')}]//span")
+HSO_CARD_DESCRIPTION = _xpath(f".//p[{_has_class('line-clamp-5')}]")
+
+
+def parse_hso_cards(page_html):
+    jobs = []
+    for card in HSO_CARDS(_document(page_html)):
+        title = _text(_first(HSO_CARD_TITLE(card)))
+        url = _first(HSO_CARD_LINK(card))
+        if not title or not url:
+            continue
+        jobs.append(
+            {
+                "title": title,
+                "location": ", ".join(location for location in map(_text, HSO_CARD_LOCATIONS(card)) if location),
+                "job_id": "N/A",
+                "level": "N/A",
+                "job_url": url,
+                "description": _text(_first(HSO_CARD_DESCRIPTION(card))),
+            }
+        )
+    return jobs
+
+
+# --- conspicuous.com (WP Job Manager) listing and job pages, see example.py ---
+CONSPICUOUS_ITEMS = _xpath(f"//*[{_has_class('job-item')}]")
+CONSPICUOUS_TITLE = _xpath(".//h3")
+CONSPICUOUS_LOCATION = _xpath(f".//*[{_has_class('job-location')}]")
+CONSPICUOUS_DATE = _xpath(f".//*[{_has_class('job-date')}]")
+# The card's link may wrap the whole card, like LISTING_SPEC's closest() fallback
+CONSPICUOUS_LINK = _xpath(".//a/@href | ancestor::a/@href")
+CONSPICUOUS_DESCRIPTION = _xpath(f"//*[{_has_class('job-description')}]")
+
+
+def parse_conspicuous_listing(page_html):
+    jobs = []
+    for item in CONSPICUOUS_ITEMS(_document(page_html)):
+        title = _text(_first(CONSPICUOUS_TITLE(item)))
+        url = _first(CONSPICUOUS_LINK(item))
+        if not title or not url:
+            continue
+        jobs.append(
+            {
+                "title": title,
+                "location": _text(_first(CONSPICUOUS_LOCATION(item))) or None,
+                "date_posted": _text(_first(CONSPICUOUS_DATE(item))) or None,
+                "url": url,
+            }
+        )
+    return jobs
+
+
+def parse_conspicuous_description(page_html):
+    return _text(_first(CONSPICUOUS_DESCRIPTION(_document(page_html)))) or "N/A"
+
+
+# --- NigelFrank (Next.js) listing payload ---
+# The listings are JSON, either embedded in the page as __NEXT_DATA__ or
+# served from /_next/data/<buildId>/...; a regex finds the script without
+# building a tree, and the record mapping is shared with nigelfrank.py.
+NIGELFRANK_BASE_URL = "https://www.nigelfrank.com"
+NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__" type="application/json"[^>]*>(.*?)</script>', re.S)
+
+
+def parse_next_data(page_html):
+    # The whole __NEXT_DATA__ object (buildId, props, ...) or None
+    match = NEXT_DATA_RE.search(page_html)
+    return json.loads(match.group(1)) if match else None
+
+
+def _pick(job, *keys):
+    for key in keys:
+        value = job.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _json_text(value):
+    if isinstance(value, dict):
+        return ", ".join(str(v) for v in value.values() if v not in (None, ""))
+    if isinstance(value, list):
+        return ", ".join(_json_text(v) for v in value if v not in (None, ""))
+    return str(value).strip() if value is not None else None
+
+
+def _html_text(fragment):
+    # Same result as BeautifulSoup(...).get_text(strip=True)
+    return "".join(text.strip() for text in _document(fragment).itertext() if text.strip())
+
+
+def _looks_like_job(item):
+    return isinstance(item, dict) and "title" in item and any(k in item for k in ("id", "jobId", "slug", "url"))
+
+
+def find_job_list(payload):
+    # The listings live somewhere under pageProps; the exact key has moved between
+    # site releases, so look for the first list of job-shaped objects.
+    if isinstance(payload, list):
+        if payload and all(_looks_like_job(item) for item in payload):
+            return payload
+        items = payload
+    elif isinstance(payload, dict):
+        items = payload.values()
+    else:
+        return None
+    for item in items:
+        found = find_job_list(item)
+        if found is not None:
+            return found
+    return None
+
+
+def job_record_from_json(job, base_url=NIGELFRANK_BASE_URL):
+    job_id = _json_text(_pick(job, "jobId", "id", "reference"))
+    job_url = _pick(job, "url", "jobUrl", "href")
+    if not job_url and job_id:
+        job_url = f"{base_url}/job/{job_id}/{_pick(job, 'slug') or ''}".rstrip("/")
+    elif job_url and job_url.startswith("/"):
+        job_url = base_url + job_url
+
+    salary = _pick(job, "salary", "salaryText")
+    if salary is None and _pick(job, "salaryFrom", "salaryTo") is not None:
+        salary = f"{job.get('salaryFrom') or ''} to {job.get('salaryTo') or ''} {job.get('salaryCurrency') or ''}".strip()
+
+    description = _pick(job, "description", "jobDescription", "summary")
+    if description:
+        description = _html_text(str(description))
+
+    return {
+        "title": _json_text(_pick(job, "title", "jobTitle")),
+        "job_id": job_id,
+        "job_url": job_url,
+        "location": _json_text(_pick(job, "location", "locations")),
+        "salary": _json_text(salary),
+        "role_type": _json_text(_pick(job, "jobType", "roleType", "type")),
+        "level": _json_text(_pick(job, "product", "technology", "level")),
+        "description": description or "",
+    }
+
+
+def parse_nigelfrank_page(page_html, base_url=NIGELFRANK_BASE_URL):
+    next_data = parse_next_data(page_html)
+    job_list = find_job_list(next_data.get("props", {}).get("pageProps", {})) if next_data else None
+    return [job_record_from_json(job, base_url) for job in job_list or []]
@@ -0,0 +1,179 @@
+import logging
+import os
+import queue
+import threading
+
+import pandas as pd
+
+from job_sink import ParquetSink
+from tracing import span
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+QUEUE_SIZE = 50  # items buffered between two stages before the upstream stage blocks
+BATCH_SIZE = 25  # records per flush to the output files
+POLL_INTERVAL = 0.2  # seconds a blocked stage waits before checking whether the run was stopped
+
+_DONE = object()
+
+
+# --- Batch Writer ---
+# Record sink for the streaming scrapers: each batch is appended to the run's
+# CSV (header written with the first batch) and to the Parquet sink, so the
+# output fills in while the crawl runs and a crash keeps every flushed batch.
+# finalize(record) is applied to every written row once more on close(), for
+# fields that kept changing after the row was flushed (e.g. keyword tags from
+# searches that ran later); only rows it changes are rewritten.
+class BatchWriter:
+    def __init__(self, site, csv_path, columns, parquet=True, prepare=None, finalize=None, tracer=None):
+        self.site = site
+        self.csv_path = csv_path
+        self.columns = columns
+        self.prepare = prepare
+        self.finalize = finalize
+        self.tracer = tracer
+        self.parquet = ParquetSink() if parquet else None
+        self.rows = 0
+        self.batches = 0
+
+    def write_batch(self, records):
+        if not records:
+            return
+        with span(self.tracer, "write batch", "write", rows=len(records)):
+            self._write(records)
+
+    def _write(self, records):
+        if self.prepare:
+            # Last chance to fill in fields that are only final at write time
+            records = [self.prepare(record) for record in records]
+        os.makedirs(os.path.dirname(self.csv_path) or ".", exist_ok=True)
+        pd.DataFrame(records, columns=self.columns).to_csv(
+            self.csv_path, mode="a", header=not os.path.exists(self.csv_path), index=False
+        )
+        if self.parquet:
+            self.parquet.write(self.site, records)
+        self.rows += len(records)
+        self.batches += 1
+        logger.info(f"Flushed {len(records)} {self.site} record(s) to {self.csv_path} ({self.rows} so far)")
+
+    def _finalize(self):
+        if not self.finalize or not os.path.exists(self.csv_path):
+            return
+        frame = pd.read_csv(self.csv_path, dtype=str, keep_default_na=False)
+        written = frame.to_dict("records")
+        final = [self.finalize(record) for record in written]
+        changed = [after for before, after in zip(written, final) if after != before]
+        if not changed:
+            return
+        tmp_path = f"{self.csv_path}.tmp"
+        pd.DataFrame(final, columns=self.columns).to_csv(tmp_path, index=False)
+        os.replace(tmp_path, self.csv_path)
+        if self.parquet:
+            # Compaction keeps the latest row per job, so the corrected rows win
+            self.parquet.write(self.site, changed)
+        logger.info(f"Rewrote {len(changed)} {self.site} record(s) in {self.csv_path} with their final fields")
+
+    def close(self):
+        with span(self.tracer, "finalize rows", "write"):
+            self._finalize()
+        # Batches land as small Parquet parts; merge them once the run is over
+        if self.parquet:
+            with span(self.tracer, "compact parquet", "write"):
+                self.parquet.compact(self.site, min_files=2)
+
+
+# --- Streaming Pipeline ---
+# listing producer -> detail fetchers -> record sink, joined by bounded
+# queues. A stage that runs ahead blocks on put() until the next one catches
+# up, so at most a few queues' worth of listings and records are in memory.
+# produce() is a generator of listings; fetch(listing) returns a record or
+# None (None also for listings that should be skipped). The sink runs on the
+# calling thread and flushes every batch_size records. If the sink fails, the
+# other stages are stopped and joined (closing the listing generator, so any
+# browser it leased goes back) before the error is raised.
+def run_pipeline(produce, fetch, writer, workers=1, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE):
+    listings = queue.Queue(maxsize=queue_size)
+    records = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors = []
+
+    def put(q, item):
+        # Blocks like put(), but gives up once the pipeline is stopping
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def get(q):
+        while not stop.is_set():
+            try:
+                return q.get(timeout=POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return _DONE
+
+    def producer():
+        generator = produce()
+        try:
+            for listing in generator:
+                if not put(listings, listing):
+                    break
+        except Exception as e:
+            logger.error(f"Listing stage failed: {e}")
+            errors.append(e)
+        finally:
+            # Runs the generator's own cleanup now, e.g. returning its leased browser
+            if hasattr(generator, "close"):
+                generator.close()
+            for _ in range(workers):
+                put(listings, _DONE)
+
+    def fetcher():
+        while True:
+            listing = get(listings)
+            if listing is _DONE:
+                put(records, _DONE)
+                return
+            try:
+                record = fetch(listing)
+            except Exception as e:
+                logger.error(f"Detail stage failed for {listing}: {e}")
+                continue
+            if record:
+                put(records, record)
+
+    threads = [threading.Thread(target=producer, name="listing-producer", daemon=True)]
+    threads += [threading.Thread(target=fetcher, name=f"detail-fetcher-{i}", daemon=True) for i in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    batch = []
+    finished = 0
+    try:
+        while finished < workers:
+            record = records.get()
+            if record is _DONE:
+                finished += 1
+                continue
+            batch.append(record)
+            if len(batch) >= batch_size:
+                writer.write_batch(batch)
+                batch = []
+        writer.write_batch(batch)
+    except BaseException:
+        stop.set()
+        for thread in threads:
+            thread.join()
+        raise
+    finally:
+        writer.close()
+
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+    return writer.rows
@@ -0,0 +1,177 @@
+import json
+import logging
+import threading
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# --- Configuration ---
+REPORT_BYTES = True  # read Chrome's network log after each page to report bytes loaded and saved
+
+# Third-party trackers none of the scrapers need
+ANALYTICS_PATTERNS = [
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*doubleclick.net*",
+    "*facebook.net*",
+    "*hotjar.com*",
+    "*clarity.ms*",
+    "*linkedin.com/px*",
+    "*snap.licdn.com*",
+    "*bat.bing.com*",
+    "*cookielaw.org*",
+    "*onetrust.com*",
+]
+
+# Network.setBlockedURLs only understands URL wildcards, so resource types
+# are blocked through the file extensions that carry them. Each extension is
+# anchored to the end of the URL or to a query string, so /icons.svg is not
+# caught by .ico and a path merely containing ".css" is left alone.
+RESOURCE_TYPE_EXTENSIONS = {
+    "Image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico", "avif"],
+    "Media": ["mp4", "webm", "mp3", "ogg", "m3u8"],
+    "Font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "Stylesheet": ["css"],
+}
+RESOURCE_TYPE_PATTERNS = {
+    resource_type: [pattern for ext in extensions for pattern in (f"*.{ext}", f"*.{ext}?*")]
+    for resource_type, extensions in RESOURCE_TYPE_EXTENSIONS.items()
+}
+
+BLOCK_PROFILES = {
+    "none": {"resource_types": [], "url_patterns": []},
+    # Keeps stylesheets so visibility/clickability checks behave as in a normal browser
+    "lean": {"resource_types": ["Image", "Media", "Font"], "url_patterns": ANALYTICS_PATTERNS},
+    # For pages that are only read through the DOM, never clicked by coordinates;
+    # navigation on them goes through driver.get or a script click
+    "text": {"resource_types": ["Image", "Media", "Font", "Stylesheet"], "url_patterns": ANALYTICS_PATTERNS},
+}
+
+# Per-site profile; anything not listed loads every resource
+SITE_PROFILES = {
+    "www.hso.com": "lean",
+    "rsm.wd1.myworkdayjobs.com": "lean",
+    "fa-eyau-saasfaprod1.fa.ocs.oraclecloud.com": "lean",
+    "conspicuous.com": "text",
+}
+
+# Fallback size per blocked request when no request of that type has been
+# seen loading yet (roughly the median transfer size per type on the web)
+TYPICAL_BYTES = {
+    "Image": 20_000,
+    "Media": 500_000,
+    "Font": 30_000,
+    "Stylesheet": 15_000,
+    "Script": 25_000,
+    "Other": 5_000,
+}
+
+
+def profile_for(url):
+    return SITE_PROFILES.get(urlparse(url).netloc.lower(), "none")
+
+
+# --- Resource Blocker ---
+# Applies a block profile to Chrome: ChromeOptions prefs before launch, then
+# Network.setBlockedURLs over DevTools on each browser (and tab) it attaches
+# to. With REPORT_BYTES it reads the performance log after a page to add up
+# the bytes that did load, count the requests that were blocked, and estimate
+# the bytes saved from the average size of loaded requests of the same type.
+class ResourceBlocker:
+    def __init__(self, profile="none", report=REPORT_BYTES):
+        self.profile = profile
+        self.resource_types = BLOCK_PROFILES[profile]["resource_types"]
+        self.url_patterns = list(BLOCK_PROFILES[profile]["url_patterns"])
+        for resource_type in self.resource_types:
+            self.url_patterns.extend(RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+        self.report = report
+        self.pages = 0
+        self.loaded_bytes = 0
+        self.saved_bytes = 0
+        self.blocked_requests = 0
+        self._type_bytes = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_site(cls, url, report=REPORT_BYTES):
+        return cls(profile_for(url), report=report)
+
+    def configure(self, options):
+        # Called on ChromeOptions before the browser starts
+        if "Image" in self.resource_types:
+            # Also catches images served without a file extension
+            options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        if self.report:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        return options
+
+    def attach(self, driver):
+        # Blocked URLs are per tab: call again after switching to a new window
+        if not self.url_patterns:
+            return driver
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": self.url_patterns})
+        except Exception as e:
+            logger.warning(f"Could not apply resource block profile '{self.profile}': {e}")
+        return driver
+
+    def _read_network_log(self, driver):
+        types = {}
+        loaded = {}
+        blocked = []
+        for entry in driver.get_log("performance"):
+            try:
+                message = json.loads(entry["message"])["message"]
+            except (KeyError, ValueError):
+                continue
+            method = message.get("method")
+            params = message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                types[params["requestId"]] = params.get("type", "Other")
+            elif method == "Network.loadingFinished":
+                loaded[params["requestId"]] = params.get("encodedDataLength", 0)
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                blocked.append(params.get("type") or types.get(params["requestId"], "Other"))
+        return types, loaded, blocked
+
+    def page_report(self, driver, url=""):
+        # Drains the network log since the previous report on this browser
+        if not self.report:
+            return None
+        try:
+            types, loaded, blocked = self._read_network_log(driver)
+        except Exception as e:
+            logger.debug(f"No network log available for byte report: {e}")
+            return None
+
+        with self._lock:
+            for request_id, size in loaded.items():
+                total, count = self._type_bytes.get(types.get(request_id, "Other"), (0, 0))
+                self._type_bytes[types.get(request_id, "Other")] = (total + size, count + 1)
+            saved = 0
+            for resource_type in blocked:
+                total, count = self._type_bytes.get(resource_type, (0, 0))
+                saved += total // count if count else TYPICAL_BYTES.get(resource_type, TYPICAL_BYTES["Other"])
+
+            page_bytes = sum(loaded.values())
+            self.pages += 1
+            self.loaded_bytes += page_bytes
+            self.saved_bytes += saved
+            self.blocked_requests += len(blocked)
+
+        logger.info(
+            f"Resources [{self.profile}] {url}: {page_bytes / 1024:.0f} KiB loaded, "
+            f"{len(blocked)} request(s) blocked, ~{saved / 1024:.0f} KiB saved"
+        )
+        return {"loaded_bytes": page_bytes, "blocked_requests": len(blocked), "saved_bytes": saved}
+
+    def summary(self):
+        with self._lock:
+            if not self.pages:
+                return f"profile '{self.profile}', no pages measured"
+            return (
+                f"profile '{self.profile}', {self.pages} page(s): {self.loaded_bytes / 1024:.0f} KiB loaded, "
+                f"{self.blocked_requests} request(s) blocked, ~{self.saved_bytes / 1024:.0f} KiB saved "
+                f"(~{self.saved_bytes / self.pages / 1024:.0f} KiB per page)"
+            )
@@ -3,13 +3,11 @@ import sys
 import gc
 import os
 import re
-import time
-import json
-import hashlib
-import logging
-import random
 import pandas as pd
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -17,42 +15,237 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
 from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException
-import undetected_chromedriver as uc
+from card_extract import extract_cards, extract_cards_async
+from context_pool import shared_context_pool
+from driver_factory import create_chrome
+from driver_metrics import DriverMetrics
+from driver_pool import DriverPool
+from fingerprint_store import FingerprintStore
+from frontier import JobFrontier, canonical_job_url
+from http_client import create_session
+from job_sink import ParquetSink
+from page_cache import PageCache, cached_get
+from pacing import AdaptivePacer, DomainRateLimiter
+from pipeline import QUEUE_SIZE, BatchWriter, run_pipeline
+from resource_block import ResourceBlocker
+from scrape_log import setup_site_logging
+from tracing import Tracer
 
 
 # --- Configuration ---
 RUN_HEADLESS = True
 SEARCH_KEYWORDS = ["Microsoft Dynamics", "Power Platform"]
+ENGINE = "api"  # "api" uses Workday's JSON endpoints, "selenium" drives the careers UI
+SITE_URL = "https://rsm.wd1.myworkdayjobs.com/en-US/RSMCareers"
+API_URL = "https://rsm.wd1.myworkdayjobs.com/wday/cxs/rsm/RSMCareers"
+API_PAGE_SIZE = 20
+API_WORKERS = 8
+API_MIN_INTERVAL = 0.2  # seconds between API calls to myworkdayjobs.com
+DETAIL_WORKERS = 3  # browsers used for the Selenium detail-page phase
+DETAIL_ENGINE = "selenium"  # "contexts" loads detail pages in browser contexts of one shared Chromium (needs playwright)
+CONTEXT_WORKERS = 8  # detail workers when DETAIL_ENGINE = "contexts"
+PACER_RATE = 1.0  # Selenium page loads per second across all browsers, before any backoff
+USE_PAGE_CACHE = True  # serve recently fetched job details from the on-disk cache
+RSM_CSV_COLUMNS = ["title", "job_id", "level", "job_url", "keyword", "location", "description"]
+JOB_LOG_SAMPLE = 1.0  # share of jobs whose log lines are kept; 0.1 keeps one job in ten
 
 
 # --- Setup logging ---
-if not os.path.exists("log"):
-    os.makedirs("log")
-log_file = os.path.join("log", "rsm_scrape.log")
-
-
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
-
+# JSON lines in log/rsm.jsonl, written by a background thread (see scrape_log.py)
+logger = setup_site_logging("rsm", job_sample=JOB_LOG_SAMPLE)
+
+
+# --- Resource blocking ---
+# Shared by every browser this module starts, so the byte report covers the run
+resource_blocker = ResourceBlocker.for_site(SITE_URL)
+
+
+# --- Tracing ---
+# One timeline per process, so an API run that falls back to Selenium shows
+# both engines; saved under log/ when each engine finishes
+tracer = Tracer("rsm")
+
+
+# --- WebDriver metrics ---
+# Every browser this module starts reports its command round trips here
+driver_metrics = DriverMetrics("rsm")
+
+
+# --- Card Spec ---
+# Extracted in one execute_script call per page, see card_extract.py
+RSM_CARD_SELECTOR = "section[data-automation-id='jobResults'] > ul[role='list'] > li.css-1q2dra3"
+RSM_CARD_SPEC = {
+    "title": {"selector": "a[data-automation-id='jobTitle']"},
+    "job_url": {"selector": "h3 > a", "attr": "href"},
+    "location": {"selector": "[data-automation-id='locations'] dd"},
+    "job_id": {"selector": "ul[data-automation-id='subtitle'] > li", "all": True, "index": 0},
+    "level": {"selector": "ul[data-automation-id='subtitle'] > li", "all": True, "index": 1},
+}
+RSM_DETAIL_SELECTOR = "div[aria-label='Job Posting Description']"
+RSM_DETAIL_READY = "div[aria-label='Job Posting Description'][tabindex='0']"
+RSM_DETAIL_SPEC = {
+    "locations": {"selector": "div[data-automation-id='locations'] dd", "all": True},
+    "description": {"selector": "div[data-automation-id='jobPostingDescription'] p"},
+}
+
+
+def log_and_print(message, job=None):
+    # job=<job url> marks a per-job line; JOB_LOG_SAMPLE keeps or drops all of a job's lines together
+    logger.info(message, extra={"per_job": True, "job_key": canonical_job_url(job)} if job else None)
+
+
+# Listing-level fingerprint shared by both engines: the job_url without the
+# ?q=<keyword> suffix is the key, the card fields are what gets hashed.
+def listing_fingerprint(job_data):
+    job_key = job_data["job_url"].split("?")[0]
+    listing = {"title": job_data["title"], "job_id": job_data["job_id"], "level": job_data["level"], "job_url": job_key}
+    return job_key, listing
+
+
+def save_results(all_data):
+    if all_data:
+        os.makedirs("data", exist_ok=True)
+        filename = f"data/rsm_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        pd.DataFrame(all_data).to_csv(filename, index=False)
+        log_and_print(f"📁 Data saved to {filename}")
+        ParquetSink().write("rsm", all_data)
+    else:
+        log_and_print("⚠️ No data scraped.")
+
+
+# --- Workday API Engine ---
+# The careers UI is rendered from two JSON endpoints: a paged job search
+# (POST .../jobs) and a per-posting detail (GET .../job/<location>/<slug>).
+# Talking to them directly skips the click/back/sleep cycle per card.
+def search_rsm_postings(session, keyword, limiter):
+    postings = []
+    offset = 0
+    total = None
+    while True:
+        limiter.wait(API_URL)
+        with tracer.span(f"search offset {offset}", "http", keyword=keyword):
+            response = session.post(
+                f"{API_URL}/jobs",
+                json={"appliedFacets": {}, "limit": API_PAGE_SIZE, "offset": offset, "searchText": keyword},
+                timeout=30,
+            )
+        response.raise_for_status()
+        payload = response.json()
+        page_postings = payload.get("jobPostings", [])
+        postings.extend(page_postings)
+        log_and_print(f"📄 Offset {offset}: {len(page_postings)} postings for keyword '{keyword}'")
+
+        # Workday reports the total only on the first page; later pages say 0
+        if total is None:
+            total = payload.get("total") or 0
+        offset += API_PAGE_SIZE
+        if len(page_postings) < API_PAGE_SIZE or (total and offset >= total):
+            break
+    return postings
+
+
+def fetch_rsm_detail(session, posting, keyword, limiter, store, cache=None):
+    bullet_fields = posting.get("bulletFields") or []
+    job_data = {
+        "title": posting.get("title", "").strip(),
+        "job_id": bullet_fields[0].strip() if len(bullet_fields) > 0 else "Unknown",
+        "level": bullet_fields[1].strip() if len(bullet_fields) > 1 else "Unknown",
+        "job_url": f"{SITE_URL}{posting['externalPath']}?q={quote(keyword)}",
+        "keyword": keyword,
+    }
+
+    job_key, listing = listing_fingerprint(job_data)
+    cached = store.cached_detail("rsm", job_key, listing)
+    if cached:
+        log_and_print(f"♻️ Unchanged job, reusing stored detail: {job_data['title']}", job=job_data["job_url"])
+        return {**job_data, **cached}
+
+    location = "Unknown"
+    description = "Not found"
+    try:
+        with tracer.span("job detail", "http"):
+            response = cached_get(cache, session, f"{API_URL}{posting['externalPath']}", limiter=limiter, timeout=30)
+        response.raise_for_status()
+        info = response.json().get("jobPostingInfo", {})
+
+        location_list = [info.get("location")] + list(info.get("additionalLocations") or [])
+        location_list = [loc.strip() for loc in location_list if loc and loc.strip()]
+        if location_list:
+            location = ", ".join(location_list)
+
+        # Match the Selenium engine, which keeps only the first paragraph
+        with tracer.span("parse description", "extract"):
+            soup = BeautifulSoup(info.get("jobDescription") or "", "lxml")
+            first_paragraph = soup.find("p")
+            if first_paragraph and first_paragraph.get_text(strip=True):
+                description = first_paragraph.get_text(" ", strip=True)
+        store.record("rsm", job_key, listing, {"location": location, "description": description})
+    except Exception as e:
+        log_and_print(f"⚠️ Could not fetch job detail for {job_data['title']}: {e}")
 
-def log_and_print(message):
-    print(message)
-    logging.info(message)
+    job_data["location"] = location
+    job_data["description"] = description
+    log_and_print(f"✅ Scraped job: {job_data['title']} | {location} | {job_data['job_id']} | {job_data['level']} | {job_data['job_url']} | {keyword}", job=job_data["job_url"])
+    return job_data
 
 
-def hash_job(job):
-    return hashlib.md5(json.dumps(job, sort_keys=True).encode()).hexdigest()
+def scrape_rsm_jobs_api():
+    start_time = datetime.now()
+    log_and_print(f"\n🚀 Scraping (API engine) started at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+
+    session = create_session(pool_size=API_WORKERS)
+    session.headers.update({"Accept": "application/json"})
+    limiter = DomainRateLimiter(API_MIN_INTERVAL, tracer=tracer)
+    store = FingerprintStore()
+    cache = PageCache() if USE_PAGE_CACHE else None
+    rows = None
+    try:
+        with tracer.span("rsm api run", "run"):
+            # Searches are cheap, so every keyword is searched first and each
+            # posting is fetched once, tagged with all the keywords that found it
+            frontier = JobFrontier()
+            unique_postings = []
+            for keyword in SEARCH_KEYWORDS:
+                log_and_print(f"🔎 Starting search for keyword: '{keyword}'")
+                postings = search_rsm_postings(session, keyword, limiter)
+                log_and_print(f"🔢 Found {len(postings)} postings for keyword '{keyword}'")
+                for posting in postings:
+                    if frontier.admit(canonical_job_url(f"{SITE_URL}{posting['externalPath']}"), keyword):
+                        unique_postings.append((posting, keyword))
+            log_and_print(f"🔁 Keyword frontier: {frontier.stats()}")
+            if not unique_postings:
+                # Most likely a changed endpoint rather than an empty board; let Selenium try
+                raise RuntimeError("no postings found for any keyword")
+
+            # executor.map keeps the search order in the output
+            with ThreadPoolExecutor(max_workers=API_WORKERS) as executor:
+                jobs = executor.map(lambda item: fetch_rsm_detail(session, item[0], item[1], limiter, store, cache), unique_postings)
+                all_data = [frontier.tag(job, canonical_job_url(job["job_url"])) for job in jobs]
+
+            with tracer.span("save results", "write"):
+                save_results(all_data)
+            store.save()
+            rows = len(all_data)
 
+    except Exception as e:
+        log_and_print(f"❌ API engine failed: {e}")
+        log_and_print(traceback.format_exc())
 
-# --- Scraper Logic ---
-def scrape_rsm_jobs():
-    start_time = datetime.now()
-    log_and_print(f"\n🚀 Scraping started at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
+    finally:
+        session.close()
+        if cache:
+            log_and_print(f"🗄️ Page cache: {cache.stats()}")
+            cache.close()
+        log_and_print(f"🧭 Phases: {tracer.summary()}")
+        log_and_print(f"🗺️ Trace saved to {tracer.export()}")
+        end_time = datetime.now()
+        duration = (end_time - start_time).total_seconds()
+        log_and_print(f"✅ Scraping finished at {end_time.strftime('%Y-%m-%d %H:%M:%S')} (Duration: {duration:.2f} seconds)")
+    return rows
 
 
+# --- Selenium Engine ---
+def create_driver():
     options = webdriver.ChromeOptions()
     if RUN_HEADLESS:
         options.add_argument("--headless=new")
@@ -65,212 +258,328 @@ def scrape_rsm_jobs():
     options.add_argument(
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.188 Safari/537.36"
     )
-
-
-    driver = None
-    try:
-        driver = uc.Chrome(options=options)
+    resource_blocker.configure(options)
+    with tracer.span("uc.Chrome", "browser start"):
+        driver = create_chrome(options, "rsm")
+    return driver_metrics.instrument(resource_blocker.attach(driver))
+
+
+# Phase two: open a harvested job_url directly. Selectors are scoped to the
+# posting container rather than the list/detail split-view XPath, since the
+# page is loaded standalone here.
+def scrape_rsm_detail(driver, job_data, pacer):
+    title = job_data["title"]
+    with tracer.span(title, "job"):
+        try:
+            log_and_print(f"🌐 Opening job detail page: {title}", job=job_data["job_url"])
+            with pacer.track(job_data["job_url"]):
+                with tracer.span("driver.get", "navigate"):
+                    driver.get(job_data["job_url"])
+
+                # Wait for job detail content to load
+                with tracer.span("job description", "wait"):
+                    WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.CSS_SELECTOR, RSM_DETAIL_READY)))
+            resource_blocker.page_report(driver, job_data["job_url"])
+
+            # Confirm we are on the right job page by logging header or job ID
+            try:
+                job_header_el = driver.find_element(By.CSS_SELECTOR, "h2[data-automation-id='jobPostingHeader']")
+                job_header = job_header_el.text.strip()
+                log_and_print(f"📄 Opened job detail page for: {job_header}", job=job_data["job_url"])
+
+            except Exception as e:
+                log_and_print(f"⚠️ Could not confirm job detail page: {e}")
+
+            with tracer.span("extract_cards", "extract"):
+                detail = extract_cards(driver, RSM_DETAIL_SELECTOR, RSM_DETAIL_SPEC)
+            return rsm_detail_record(job_data, detail)
+
+        except Exception as e:
+            log_and_print(f"⚠️ Error extracting job detail for {title}: {e}")
+            return None
+
+
+# Shared by both detail engines: turns the extracted detail card into the record
+def rsm_detail_record(job_data, detail):
+    detail = detail[0] if detail else {"locations": [], "description": None}
+
+    # Location extraction
+    location_list = detail["locations"]
+    if location_list:
+        location = ", ".join(location_list)
+        log_and_print(f"📍 Location(s) found: {location}", job=job_data["job_url"])
+    else:
+        location = "Unknown"
+        log_and_print("⚠️ No location text found.")
+
+    # Description extraction
+    description = detail["description"]
+    if description:
+        log_and_print(f"📝 Description found: {description[:100]}...", job=job_data["job_url"])  # Only show first 100 chars
+    else:
+        description = "Not found"
+        log_and_print("⚠️ Could not extract job description.")
+
+    return {**job_data, "location": location, "description": description}
+
+
+# --- Browser-context detail engine ---
+# Same page, loaded in a throwaway browser context of the shared Chromium
+# (see context_pool.py) instead of on a leased WebDriver. The coroutine runs
+# on the pool's event loop; pacing and spans stay on the calling worker thread.
+async def load_rsm_detail(contexts, job_url):
+    async with contexts.page(job_url) as page:
+        await page.goto(job_url, wait_until="domcontentloaded")
+        await page.wait_for_selector(RSM_DETAIL_READY, timeout=15000)
+        return await extract_cards_async(page, RSM_DETAIL_SELECTOR, RSM_DETAIL_SPEC)
+
+
+def scrape_rsm_detail_in_context(contexts, job_data, pacer):
+    title = job_data["title"]
+    with tracer.span(title, "job"):
+        try:
+            log_and_print(f"🌐 Opening job detail page in a browser context: {title}", job=job_data["job_url"])
+            with pacer.track(job_data["job_url"]):
+                with tracer.span("context page", "navigate"):
+                    detail = contexts.run(load_rsm_detail(contexts, job_data["job_url"]))
+            return rsm_detail_record(job_data, detail)
+
+        except Exception as e:
+            log_and_print(f"⚠️ Error extracting job detail for {title}: {e}")
+            return None
+
+
+# --- Listing stage ---
+# Phase one: walks every keyword's result pages on a browser leased from the
+# pool and yields each card as soon as it is read. When the generator
+# finishes, the search browser goes back to the pool for detail pages.
+# Jobs already admitted by an earlier keyword are not queued again.
+def harvest_rsm_listings(pool, pacer, frontier):
+    with pool.lease() as driver:
         wait = WebDriverWait(driver, 15)
 
-
-        all_data = []
-
-        driver.get("https://rsm.wd1.myworkdayjobs.com/en-US/RSMCareers")
-        time.sleep(random.uniform(2, 4))
-
         for keyword in SEARCH_KEYWORDS:
-            driver.get("https://rsm.wd1.myworkdayjobs.com/en-US/RSMCareers")
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-automation-id='keywordSearchSection']")))
-            time.sleep(random.uniform(2, 4))
-
-
-            try:
-                log_and_print(f"🔎 Starting search for keyword: '{keyword}'")
+            with tracer.span(keyword, "keyword"):
+                try:
+                    with pacer.track(SITE_URL):
+                        with tracer.span("driver.get", "navigate"):
+                            driver.get(SITE_URL)
+                        with tracer.span("search form", "wait"):
+                            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[data-automation-id='keywordSearchSection']")))
+                except TimeoutException:
+                    log_and_print(f"❌ Search page did not load for keyword: {keyword}")
+                    continue
 
-                # Locate and click into the search input
-                search_input = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[data-automation-id='keywordSearchInput']")))
-                log_and_print("✅ Search input located.")
 
-                # Simulate human-like interaction
-                ActionChains(driver).move_to_element(search_input).click().perform()
-                time.sleep(random.uniform(0.5, 1.5))
+                try:
+                    log_and_print(f"🔎 Starting search for keyword: '{keyword}'")
 
-                search_input.send_keys(Keys.CONTROL + "a")
-                search_input.send_keys(Keys.BACKSPACE)
-                time.sleep(random.uniform(1, 2))
+                    # Locate and click into the search input
+                    search_input = wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "input[data-automation-id='keywordSearchInput']")))
+                    log_and_print("✅ Search input located.")
 
-                search_input.send_keys(keyword)
-                time.sleep(random.uniform(0.5, 1.5))
-                search_input.send_keys(Keys.RETURN)
+                    # Simulate human-like interaction
+                    ActionChains(driver).move_to_element(search_input).click().perform()
+                    pacer.pause()
 
-                log_and_print("🔘 Search input submitted.")
-                time.sleep(random.uniform(3, 5))
+                    search_input.send_keys(Keys.CONTROL + "a")
+                    search_input.send_keys(Keys.BACKSPACE)
+                    pacer.pause()
 
-                # Confirm search results loaded
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "p[data-automation-id='jobFoundText']")))
-                log_and_print("🔍 Search results loaded.")
+                    search_input.send_keys(keyword)
+                    pacer.pause()
 
-            except TimeoutException:
-                log_and_print(f"❌ Failed to load results for keyword: {keyword}")
-                continue
+                    # Submitting is a page load: paced, timed, and finished as soon as results appear
+                    with pacer.track(SITE_URL):
+                        with tracer.span("submit search", "navigate"):
+                            search_input.send_keys(Keys.RETURN)
+                        log_and_print("🔘 Search input submitted.")
+                        with tracer.span("search results", "wait"):
+                            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "p[data-automation-id='jobFoundText']")))
+                    log_and_print("🔍 Search results loaded.")
 
+                except TimeoutException:
+                    log_and_print(f"❌ Failed to load results for keyword: {keyword}")
+                    continue
 
-            page = 1
 
-            while True:
-                log_and_print(f"📄 Processing page {page} for keyword '{keyword}'")
+                page = 1
 
-                try:
-                    wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, "section[data-automation-id='jobResults'] > ul[role='list'] > li.css-1q2dra3")))
-                    job_cards = driver.find_elements(By.CSS_SELECTOR, "section[data-automation-id='jobResults'] > ul[role='list'] > li.css-1q2dra3")
-                    log_and_print(f"🔢 Found {len(job_cards)} job cards on page {page}")
-                except TimeoutException:
-                    log_and_print("⚠️ No job cards found.")
-                    break
-
-                # Get details for each job card on the job list page
-                for card in job_cards:
-                    try:
-                        title_el = card.find_element(By.CSS_SELECTOR, "a[data-automation-id='jobTitle']")
-                        title = title_el.text.strip()
-                        url_el = card.find_element(By.CSS_SELECTOR, "h3 > a")
-                        job_url = url_el.get_attribute("href").strip()
-
-                        # --- Locationn ---
-                        try:
-                            location_el = card.find_element(By.CSS_SELECTOR, "[data-automation-id='locations'] dd")
-                            locationn = location_el.text.strip()
-                        except NoSuchElementException:
-                            location = "Unknown"
+                while True:
+                    with tracer.span(f"page {page}", "page", keyword=keyword):
+                        log_and_print(f"📄 Processing page {page} for keyword '{keyword}'")
 
-                        # --- Job ID & Level ---
                         try:
-                            subtitle_items = card.find_elements(By.CSS_SELECTOR, "ul[data-automation-id='subtitle'] > li")
-                            job_id = subtitle_items[0].text.strip() if len(subtitle_items) > 0 else "Unknown"
-                            level = subtitle_items[1].text.strip() if len(subtitle_items) > 1 else "Unknown"
-                        except Exception:
-                            job_id, level = "Unknown", "Unknown"
-                            
-
-                        job_data = {
-                            "title": title,
-                            # "locationn": locationn,
-                            "job_id": job_id,
-                            "level": level,
-                            "job_url": job_url,
-                            "keyword": keyword,
-                        }
-                        # all_data.append(job_data)
-                        log_and_print(f"✅ Scraped job: {title} | {locationn} | {job_id} | {level} | {job_url} | {keyword}")
-
-
-                        # Click job to go to detail page
-                        log_and_print(f"🖱️ Clicking job link: {title}")
-                        driver.execute_script("arguments[0].scrollIntoView(true);", url_el)
-                        url_el.click()
-
-                        # Wait for job detail content to load (adjust selector as needed)
-                        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "div[aria-label='Job Posting Description'][tabindex='0']")))
-
-                        # Confirm we are on the right job page by logging header or job ID
+                            with tracer.span("job cards", "wait"):
+                                wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, RSM_CARD_SELECTOR)))
+                            job_cards = driver.find_elements(By.CSS_SELECTOR, RSM_CARD_SELECTOR)
+                            log_and_print(f"🔢 Found {len(job_cards)} job cards on page {page}")
+                            resource_blocker.page_report(driver, f"{keyword} page {page}")
+                        except TimeoutException:
+                            log_and_print("⚠️ No job cards found.")
+                            break
+
+                        # Phase one: harvest listing fields and hrefs for every card on the
+                        # page in a single script call, without leaving the list
+                        with tracer.span("extract_cards", "extract"):
+                            cards = extract_cards(driver, RSM_CARD_SELECTOR, RSM_CARD_SPEC)
+                        for fields in cards:
+                            try:
+                                if not fields["title"] or not fields["job_url"]:
+                                    raise ValueError("card is missing its title or link")
+                                title = fields["title"]
+                                job_url = fields["job_url"]
+                                if not frontier.admit(canonical_job_url(job_url), keyword):
+                                    log_and_print(f"🔁 Already queued under another keyword: {title}", job=job_url)
+                                    continue
+
+                                # --- Locationn ---
+                                locationn = fields["location"] or "Unknown"
+
+                                # --- Job ID & Level ---
+                                job_id = fields["job_id"] or "Unknown"
+                                level = fields["level"] or "Unknown"
+
+                                job_data = {
+                                    "title": title,
+                                    # "locationn": locationn,
+                                    "job_id": job_id,
+                                    "level": level,
+                                    "job_url": job_url,
+                                    "keyword": keyword,
+                                }
+                                yield job_data
+                                log_and_print(f"🔗 Collected job: {title} | {locationn} | {job_id} | {level} | {job_url} | {keyword}", job=job_url)
+
+                            except Exception as e:
+                                log_and_print(f"⚠️ Error extracting job card: {e}")
+                                continue
+
+                        first_card = job_cards[0]
+
+                        # Try clicking next and waiting for the first card to go stale (indicating page change)
                         try:
-                            job_header_el = driver.find_element(By.CSS_SELECTOR, "h2[data-automation-id='jobPostingHeader']")
-                            job_header = job_header_el.text.strip()
-                            log_and_print(f"📄 Opened job detail page for: {job_header}")
-
-                        except Exception as e:
-                            log_and_print(f"⚠️ Could not confirm job detail page: {e}")
-
-                        # Location extraction
-                        try:
-                            # Narrow the scope to ONLY inside the main job posting container
-                            job_detail_section = driver.find_element(By.XPATH, '//*[@id="mainContent"]/div/div[2]/div/div/section/div/div[2]/div/div/div/div[1]/div/div[1]/div')
-                            location_elements = job_detail_section.find_elements(By.CSS_SELECTOR, "div[data-automation-id='locations'] dd")
-
-                            # Strip and clean only non-empty values
-                            location_list = [el.text.strip() for el in location_elements if el.text.strip()]
-                            
-                            if location_list:
-                                location = ", ".join(location_list)
-                                log_and_print(f"📍 Location(s) found: {location}")
+                            next_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label='next']")
+                            if next_button.is_enabled() and "disabled" not in next_button.get_attribute("class"):
+                                with pacer.track(SITE_URL):
+                                    with tracer.span("next page", "navigate"):
+                                        next_button.click()
+                                    with tracer.span("page change", "wait"):
+                                        wait.until(EC.staleness_of(first_card))  # Ensures new content is loaded
+                                page += 1
                             else:
-                                location = "Unknown"
-                                log_and_print("⚠️ No location text found.")
-                        except Exception as e:
-                            location = "Unknown"
-                            log_and_print(f"⚠️ Error getting locations: {e}")
-
-
-                        # Description extraction
-                        try:
-                            description_el = driver.find_element(By.XPATH, '//*[@id="mainContent"]/div/div[2]/div/div/section/div/div[2]/div/div/div/div[2]/div/div/p[1]')
-                            description = description_el.text.strip()
-                            log_and_print(f"📝 Description found: {description[:100]}...")  # Only show first 100 chars
-                        except Exception as e:
-                            description = "Not found"
-                            log_and_print(f"⚠️ Could not extract job description: {e}")
-
-
-                        job_data["location"] = location
-                        job_data["description"] = description
-
-                        all_data.append(job_data)
-                        # log_and_print(f"✅ Scraped full job data: {job_data}")
-
-
-
+                                log_and_print("⛔ Reached last page or pagination not available.")
+                                break
+                        except NoSuchElementException:
+                            log_and_print("ℹ️ No pagination button found, assuming single page.")
+                            break
 
-                        # Go back to job list
-                        driver.back()
-                        wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, "section[data-automation-id='jobResults'] ul[role='list'] > li.css-1q2dra3")))
-                        time.sleep(2) 
 
-                    except Exception as e:
-                        log_and_print(f"⚠️ Error extracting job card: {e}")
-                        continue
+# --- Scraper Logic ---
+def scrape_rsm_jobs():
+    start_time = datetime.now()
+    log_and_print(f"\n🚀 Scraping started at {start_time.strftime('%Y-%m-%d %H:%M:%S')}")
 
-                first_card = job_cards[0]
 
-                # Try clicking next and waiting for the first card to go stale (indicating page change)
-                try:
-                    next_button = driver.find_element(By.CSS_SELECTOR, "button[aria-label='next']")
-                    if next_button.is_enabled() and "disabled" not in next_button.get_attribute("class"):
-                        next_button.click()
-                        wait.until(EC.staleness_of(first_card))  # Ensures new content is loaded
-                        page += 1
-                        time.sleep(2)
+    # Browser contexts are cheap, so that engine runs more detail workers and
+    # the WebDriver pool keeps only the search browser
+    contexts = shared_context_pool() if DETAIL_ENGINE == "contexts" else None
+    workers = CONTEXT_WORKERS if contexts else DETAIL_WORKERS
+    pacer = AdaptivePacer(rate=PACER_RATE, burst=workers, tracer=tracer)
+    rows = 0
+    try:
+        with tracer.span("rsm selenium run", "run"):
+            store = FingerprintStore()
+            frontier = JobFrontier()
+
+            # --- Phase two: fetch detail pages directly ---
+            # Listings stream into a small pool of detail browsers while the search
+            # is still paging, and finished records are flushed in batches.
+            # Jobs whose listing fingerprint is unchanged reuse the stored detail.
+            with DriverPool(create_driver, size=1 if contexts else DETAIL_WORKERS + 1) as pool:
+                pool.warm()
+                # With a single browser the listing stage must finish before any
+                # detail page can load, so it cannot be allowed to block on a full queue
+                queue_size = QUEUE_SIZE if contexts or pool.started > 1 else 0
+                if contexts:
+                    log_and_print(f"\n🔍 Streaming job detail pages with {workers} browser context(s)...")
+                else:
+                    log_and_print(f"\n🔍 Streaming job detail pages with {max(pool.started - 1, 1)} browser(s)...")
+
+                def visit(job_data):
+                    job_key, listing = listing_fingerprint(job_data)
+                    cached = store.cached_detail("rsm", job_key, listing)
+                    if cached:
+                        log_and_print(f"♻️ Unchanged job, reusing stored detail: {job_data['title']}", job=job_data["job_url"])
+                        return {**job_data, **cached}
+
+                    if contexts:
+                        job = scrape_rsm_detail_in_context(contexts, job_data, pacer)
                     else:
-                        log_and_print("⛔ Reached last page or pagination not available.")
-                        break
-                except NoSuchElementException:
-                    log_and_print("ℹ️ No pagination button found, assuming single page.")
-                    break
-
-        # ==========================
-        # # Save to CSV
-        if all_data:
-            os.makedirs("data", exist_ok=True)
-            filename = f"data/rsm_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            pd.DataFrame(all_data).to_csv(filename, index=False)
-            log_and_print(f"📁 Data saved to {filename}")
-        else:
-            log_and_print("⚠️ No data scraped.")
+                        with pool.lease() as detail_driver:
+                            job = scrape_rsm_detail(detail_driver, job_data, pacer)
+                    if job:
+                        store.record("rsm", job_key, listing, {"location": job["location"], "description": job["description"]})
+                    return job
+
+                # Rows stream out tagged with the keywords seen so far; close() rewrites them with every keyword that matched
+                def tag_keywords(job):
+                    return frontier.tag(job, canonical_job_url(job["job_url"]))
+
+                filename = f"data/rsm_jobs_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+                writer = BatchWriter(
+                    "rsm", filename, RSM_CSV_COLUMNS,
+                    prepare=tag_keywords,
+                    finalize=tag_keywords,
+                    tracer=tracer,
+                )
+                rows = run_pipeline(
+                    lambda: harvest_rsm_listings(pool, pacer, frontier), visit, writer, workers=workers, queue_size=queue_size
+                )
+
+            if rows:
+                log_and_print(f"📁 Data saved to {filename}")
+            else:
+                log_and_print("⚠️ No data scraped.")
+            log_and_print(f"🔁 Keyword frontier: {frontier.stats()}")
+            store.save()
 
 
     except Exception as e:
         log_and_print(f"❌ Fatal error during scraping: {e}")
         log_and_print(traceback.format_exc())
+        raise
 
 
     finally:
-        if driver:
-            driver.quit()
-            gc.collect()  # Helps clean up remaining references
+        gc.collect()  # Helps clean up remaining references
+        log_and_print(f"⏱️ Pacing: {pacer.summary()}")
+        log_and_print(f"🧱 Resources: {resource_blocker.summary()}")
+        if contexts:
+            log_and_print(f"🪟 Browser contexts: {contexts.summary()}")
+        log_and_print(f"🧭 Phases: {tracer.summary()}")
+        log_and_print(f"🛰️ WebDriver: {driver_metrics.summary(rows)}")
+        if driver_metrics.commands:
+            log_and_print(f"🛰️ Command latency:\n{driver_metrics.histogram()}")
+        regression = driver_metrics.check_baseline(rows)
+        if regression:
+            log_and_print(f"⚠️ {regression}")
+        log_and_print(f"🗺️ Trace saved to {tracer.export()}")
         end_time = datetime.now()
         duration = (end_time - start_time).total_seconds()
         log_and_print(f"✅ Scraping finished at {end_time.strftime('%Y-%m-%d %H:%M:%S')} (Duration: {duration:.2f} seconds)")
+    return rows
 
 
 # --- Main Execution Block ---
+def main():
+    # Selenium stays as the fallback if the API engine cannot complete
+    if ENGINE == "api":
+        rows = scrape_rsm_jobs_api()
+        if rows is not None:
+            return rows
+    return scrape_rsm_jobs()
+
+
 if __name__ == "__main__":
-    scrape_rsm_jobs()
+    main()
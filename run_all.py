@@ -0,0 +1,112 @@
+import argparse
+import glob
+import importlib
+import json
+import logging
+import os
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from driver_pool import set_browser_limit
+
+# --- Configuration ---
+MAX_BROWSERS = 4  # global cap on Chrome sessions across every site
+
+# name, domain, module, entry point, output files
+SITES = [
+    ("hso", "www.hso.com", "hso", "scrape_hso_jobs", "data/hso_jobs_*.csv"),
+    ("rsm", "rsm.wd1.myworkdayjobs.com", "rsm", "main", "data/rsm_jobs_*.csv"),
+    ("faeya", "fa-eyau-saasfaprod1.fa.ocs.oraclecloud.com", "faeya", "main", "data/faeya_jobs_*.csv"),
+    ("nigelfrank", "www.nigelfrank.com", "nigelfrank", "main", "nigelfrank.csv"),
+    ("conspicuous", "conspicuous.com", "example", "main", "data/job_results.csv"),
+]
+
+# --- Logging ---
+os.makedirs("log", exist_ok=True)
+logger = logging.getLogger("run_all")
+logger.setLevel(logging.INFO)
+file_handler = logging.FileHandler("log/run_all.log", mode="a", encoding="utf-8")
+file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+logger.addHandler(file_handler)
+
+
+# --- Site runner ---
+# Sites are independent, so each one runs on its own thread. Every entry in
+# SITES is on its own domain, so the sites share nothing but the browser cap;
+# each scraper keeps its own per-domain rate limits. Entry points raise on a
+# fatal error and return the number of rows this run scraped.
+def run_site(site, entry):
+    name, domain, module_name, entry_point, outputs = site
+    result = {"site": name, "domain": domain, "status": "ok", "error": None, "rows": None, "outputs": []}
+
+    started = time.time()
+    result["started_at"] = datetime.fromtimestamp(started).isoformat(timespec="seconds")
+    logger.info(f"Starting {name}")
+    try:
+        if isinstance(entry, Exception):
+            raise entry
+        result["rows"] = entry()
+    except Exception as e:
+        result["status"] = "failed"
+        result["error"] = f"{type(e).__name__}: {e}"
+        logger.error(f"{name} failed: {e}\n{traceback.format_exc()}")
+    finished = time.time()
+
+    result["finished_at"] = datetime.fromtimestamp(finished).isoformat(timespec="seconds")
+    result["duration_seconds"] = round(finished - started, 2)
+    # Output files can be append-only across runs, so they are listed, not counted
+    result["outputs"] = [path for path in glob.glob(outputs) if os.path.getmtime(path) >= started]
+    logger.info(f"Finished {name} in {result['duration_seconds']}s ({result['status']})")
+    return result
+
+
+def run_all(site_names=None, max_browsers=MAX_BROWSERS):
+    sites = [site for site in SITES if not site_names or site[0] in site_names]
+    set_browser_limit(max_browsers)
+
+    start_time = datetime.now()
+    print(f"\n🚀 Running {len(sites)} site(s) concurrently (max {max_browsers} browsers)")
+    logger.info(f"Run started for {', '.join(site[0] for site in sites)}")
+
+    # Import every scraper up front, on this thread, so module-level setup
+    # (logging, output folders) happens once and in a fixed order
+    entries = []
+    for site in sites:
+        try:
+            entries.append(getattr(importlib.import_module(site[2]), site[3]))
+        except Exception as e:
+            entries.append(e)
+
+    with ThreadPoolExecutor(max_workers=max(len(sites), 1)) as executor:
+        results = list(executor.map(lambda job: run_site(*job), zip(sites, entries)))
+
+    end_time = datetime.now()
+    report = {
+        "started_at": start_time.isoformat(timespec="seconds"),
+        "finished_at": end_time.isoformat(timespec="seconds"),
+        "wall_seconds": round((end_time - start_time).total_seconds(), 2),
+        "sum_of_site_seconds": round(sum(r["duration_seconds"] for r in results), 2),
+        "max_browsers": max_browsers,
+        "sites": results,
+    }
+
+    report_file = os.path.join("log", f"run_report_{start_time.strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n📊 Run report")
+    for r in results:
+        print(f"  {r['site']:<12} {r['status']:<7} {r['duration_seconds']:>9.2f}s  {r['rows'] or 0} row(s)" + (f"  {r['error']}" if r["error"] else ""))
+    print(f"  {'total':<12} {'':<7} {report['wall_seconds']:>9.2f}s wall (sequential would be ~{report['sum_of_site_seconds']:.2f}s)")
+    print(f"📁 Report saved to {report_file}")
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run every job-board scraper concurrently")
+    parser.add_argument("--sites", nargs="*", choices=[site[0] for site in SITES], help="subset of sites to run (default: all)")
+    parser.add_argument("--max-browsers", type=int, default=MAX_BROWSERS, help="global cap on concurrent Chrome sessions")
+    args = parser.parse_args()
+    run_all(site_names=args.sites, max_browsers=args.max_browsers)
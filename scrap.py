@@ -6,6 +6,7 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from driver_factory import create_chrome
 
 # Setup logging
 os.makedirs("log", exist_ok=True)
@@ -33,7 +34,7 @@ def setup_driver(headless=True):
         "--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
         "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
     )
-    driver = uc.Chrome(options=options)
+    driver = create_chrome(options, "conspicuous")
     if not headless:
         driver.maximize_window()
     return driver
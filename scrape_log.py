@@ -0,0 +1,118 @@
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import zlib
+from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+# --- Configuration ---
+LOG_DIR = "log"
+MAX_BYTES = 5 * 1024 * 1024  # rotate a site's log file at this size
+BACKUP_COUNT = 5  # rotated files kept per site
+JOB_SAMPLE_RATE = 1.0  # share of per-job messages kept; lower it on big runs
+SHARED_LOG = "scrapers"  # file for the helper modules' own loggers
+
+# Extra fields a caller can attach with logger.info(..., extra={...})
+_RECORD_FIELDS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_listeners = {}
+
+
+# --- JSON lines ---
+# One object per line: timestamp, level, site, thread, message, plus any
+# extra fields the call passed, so the logs can be filtered with jq or
+# loaded straight into pandas.
+class JsonFormatter(logging.Formatter):
+    def __init__(self, site):
+        super().__init__()
+        self.site = site
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "site": self.site,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        entry.update({key: value for key, value in vars(record).items() if key not in _RECORD_FIELDS})
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+# Per-job messages are tagged with per_job=True; this keeps `rate` of them.
+# The decision is a hash of the record's job_key, so every line about a kept
+# job survives together and a dropped job leaves no stray lines behind.
+# It runs on the caller's side of the queue, so a dropped message costs no I/O.
+class JobSampleFilter(logging.Filter):
+    def __init__(self, rate=JOB_SAMPLE_RATE):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if not getattr(record, "per_job", False) or self.rate >= 1:
+            return True
+        job_key = getattr(record, "job_key", None)
+        if job_key is None:
+            return random.random() < self.rate
+        return zlib.crc32(str(job_key).encode("utf-8")) / 2**32 < self.rate
+
+
+def _start_listener(name, handlers):
+    # Records are handed to a queue on the scraping thread; a background
+    # listener thread formats and writes them, so file and console I/O never
+    # block the scrape loop. Pending records are flushed at exit.
+    records = queue.SimpleQueue()
+    listener = QueueListener(records, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    _listeners[name] = listener
+    return QueueHandler(records)
+
+
+def _file_handler(name):
+    os.makedirs(LOG_DIR, exist_ok=True)
+    handler = RotatingFileHandler(
+        os.path.join(LOG_DIR, f"{name}.jsonl"), maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT, encoding="utf-8"
+    )
+    handler.setFormatter(JsonFormatter(name))
+    return handler
+
+
+def setup_site_logging(site, level=logging.INFO, job_sample=JOB_SAMPLE_RATE, console=True):
+    # Safe to call more than once; every call for a site returns its logger
+    logger = logging.getLogger(f"scraper.{site}")
+    if site in _listeners:
+        return logger
+
+    handlers = [_file_handler(site)]
+    if console:
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter("%(message)s"))
+        handlers.append(stream)
+    queue_handler = _start_listener(site, handlers)
+    queue_handler.addFilter(JobSampleFilter(job_sample))
+
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+    logger.propagate = False
+    _setup_shared_logging()
+    return logger
+
+
+def _setup_shared_logging():
+    # Helper modules (pipeline, driver_pool, job_sink, ...) log through their
+    # own module loggers; those go to one shared file instead of whichever
+    # site's basicConfig happened to run first
+    if SHARED_LOG in _listeners:
+        return
+    root = logging.getLogger()
+    root.addHandler(_start_listener(SHARED_LOG, [_file_handler(SHARED_LOG)]))
+    if root.level > logging.INFO:
+        root.setLevel(logging.INFO)
@@ -0,0 +1,117 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# --- Configuration ---
+TRACE_DIR = "log"
+MAX_EVENTS = 200_000  # timeline events kept per run; phase totals keep counting past it
+
+
+# --- Tracing spans ---
+# Nested timing spans for one scraper run. Structural spans (run, keyword,
+# page, job) give the shape of the timeline; leaf spans name the phase the
+# time went to (browser start, navigate, wait, sleep, extract, write). Each
+# thread keeps its own span stack, so pipeline stages nest independently.
+#
+# summary() totals *self* time per phase, i.e. a span's duration minus its
+# children, so nothing is counted twice on one thread. Shares are of the
+# run's wall time; with several threads busy at once they can add up to more
+# than 100%. A structural phase's self time is whatever its thread did
+# outside any leaf span (logging, bookkeeping, waiting on a queue).
+# export() writes the timeline as Chrome trace-event JSON for
+# chrome://tracing or https://ui.perfetto.dev.
+class Tracer:
+    def __init__(self, name):
+        self.name = name
+        self.events = []
+        self.dropped = 0
+        self._phases = {}
+        self._origin = time.perf_counter()
+        self._started = datetime.now()
+        self._threads = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name, phase=None, **args):
+        phase = phase or name
+        stack = self._stack()
+        # Each open span keeps a running total of its children's time
+        frame = [0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][0] += duration
+            self._record(name, phase, start, duration, duration - frame[0], args)
+
+    def _record(self, name, phase, start, duration, self_time, args):
+        thread = threading.current_thread()
+        with self._lock:
+            total = self._phases.setdefault(phase, [0.0, 0])
+            total[0] += self_time
+            total[1] += 1
+            if len(self.events) >= MAX_EVENTS:
+                self.dropped += 1
+                return
+            self._threads[thread.ident] = thread.name
+            event = {
+                "name": name,
+                "cat": phase,
+                "ph": "X",
+                "ts": round((start - self._origin) * 1e6, 1),
+                "dur": round(duration * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": thread.ident,
+            }
+            if args:
+                event["args"] = {key: str(value) for key, value in args.items()}
+            self.events.append(event)
+
+    def phases(self):
+        # (phase, self seconds, span count), largest first
+        with self._lock:
+            return sorted(((phase, t[0], t[1]) for phase, t in self._phases.items()), key=lambda p: -p[1])
+
+    def summary(self):
+        phases = self.phases()
+        if not phases:
+            return "no spans recorded"
+        wall = time.perf_counter() - self._origin
+        return f"wall {wall:.2f}s; " + "; ".join(
+            f"{phase} {seconds:.2f}s ({seconds / wall:.0%}, {count}x)" for phase, seconds, count in phases
+        )
+
+    def export(self, path=None):
+        path = path or os.path.join(TRACE_DIR, f"trace_{self.name}_{self._started.strftime('%Y%m%d_%H%M%S')}.json")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with self._lock:
+            names = [
+                {"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid, "args": {"name": thread_name}}
+                for tid, thread_name in self._threads.items()
+            ]
+            trace = {
+                "traceEvents": names + self.events,
+                "displayTimeUnit": "ms",
+                "otherData": {"site": self.name, "started_at": self._started.isoformat(timespec="seconds"), "dropped_events": self.dropped},
+            }
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(trace, f)
+        return path
+
+
+def span(tracer, name, phase=None, **args):
+    # For helpers that take an optional tracer
+    return tracer.span(name, phase, **args) if tracer else nullcontext()